@@ -28,8 +28,12 @@ from phone_agent.agent_ios import IOSAgentConfig, IOSPhoneAgent
 from phone_agent.config.apps import list_supported_apps
 from phone_agent.config.apps_harmonyos import list_supported_apps as list_harmonyos_apps
 from phone_agent.config.apps_ios import list_supported_apps as list_ios_apps
+from phone_agent.config.timing import TIMING_CONFIG
 from phone_agent.device_factory import DeviceType, get_device_factory, set_device_type
-from phone_agent.model import ModelConfig
+from phone_agent.events import JsonlTimingSink, get_timing_sink, set_timing_sink
+from phone_agent.history import RollingHistoryPolicy
+from phone_agent.model import ModelConfig, ScreenshotEncodingConfig
+from phone_agent.recorder import TrajectoryRecorder
 from phone_agent.xctest import XCTestConnection
 from phone_agent.xctest import list_devices as list_ios_devices
 
@@ -423,6 +427,62 @@ Examples:
         help="API key for model authentication",
     )
 
+    parser.add_argument(
+        "--screenshot-format",
+        type=str,
+        choices=["png", "jpeg", "webp"],
+        help="Re-encode screenshots in this format before sending to the model",
+    )
+
+    parser.add_argument(
+        "--screenshot-max-edge",
+        type=int,
+        metavar="PIXELS",
+        help="Downscale screenshots so the long edge fits (coordinates are unaffected)",
+    )
+
+    parser.add_argument(
+        "--screenshot-quality",
+        type=int,
+        default=85,
+        help="Quality for JPEG/WebP screenshots (1-100, default: 85)",
+    )
+
+    parser.add_argument(
+        "--settle",
+        action="store_true",
+        help="Wait until the screen stops changing after actions instead of fixed delays",
+    )
+
+    parser.add_argument(
+        "--prompt-cache-key",
+        type=str,
+        default=os.getenv("PHONE_AGENT_PROMPT_CACHE_KEY"),
+        help="Cache key sent with each request, for servers that route or cache by key",
+    )
+
+    parser.add_argument(
+        "--history-turns",
+        type=int,
+        metavar="N",
+        help="Send only the last N turns verbatim; older turns keep just their actions",
+    )
+
+    parser.add_argument(
+        "--record",
+        type=str,
+        metavar="DIR",
+        default=os.getenv("PHONE_AGENT_RECORD_DIR"),
+        help="Record every step (screenshot, model output, action, timings) to DIR",
+    )
+
+    parser.add_argument(
+        "--timing-log",
+        type=str,
+        metavar="PATH",
+        help="Append one JSON line of phase timings per step to PATH",
+    )
+
     parser.add_argument(
         "--max-steps",
         type=int,
@@ -477,6 +537,13 @@ Examples:
         help="WebDriverAgent URL for iOS (default: http://localhost:8100)",
     )
 
+    parser.add_argument(
+        "--wda-mjpeg-url",
+        type=str,
+        default=os.getenv("PHONE_AGENT_WDA_MJPEG_URL"),
+        help="WDA MJPEG stream URL for iOS screenshots, e.g. http://localhost:9100",
+    )
+
     parser.add_argument(
         "--pair",
         action="store_true",
@@ -744,27 +811,51 @@ def main():
     if not check_model_api(args.base_url, args.model, args.apikey):
         sys.exit(1)
 
+    if args.settle:
+        TIMING_CONFIG.settle.enabled = True
+
     # Create configurations and agent based on device type
+    screenshot_encoding = None
+    if args.screenshot_format or args.screenshot_max_edge:
+        screenshot_encoding = ScreenshotEncodingConfig(
+            image_format=args.screenshot_format or "png",
+            quality=args.screenshot_quality,
+            max_long_edge=args.screenshot_max_edge,
+        )
+
     model_config = ModelConfig(
         base_url=args.base_url,
         model_name=args.model,
         api_key=args.apikey,
         lang=args.lang,
+        screenshot_encoding=screenshot_encoding,
+        prompt_cache_key=args.prompt_cache_key,
     )
 
+    history_policy = None
+    if args.history_turns is not None:
+        history_policy = RollingHistoryPolicy(keep_turns=args.history_turns)
+
+    recorder = TrajectoryRecorder(args.record) if args.record else None
+    if args.timing_log:
+        set_timing_sink(JsonlTimingSink(args.timing_log))
+
     if device_type == DeviceType.IOS:
         # Create iOS agent
         agent_config = IOSAgentConfig(
             max_steps=args.max_steps,
             wda_url=args.wda_url,
+            mjpeg_url=args.wda_mjpeg_url,
             device_id=args.device_id,
             verbose=not args.quiet,
             lang=args.lang,
+            history_policy=history_policy,
         )
 
         agent = IOSPhoneAgent(
             model_config=model_config,
             agent_config=agent_config,
+            recorder=recorder,
         )
     else:
         # Create Android/HarmonyOS agent
@@ -773,11 +864,13 @@ def main():
             device_id=args.device_id,
             verbose=not args.quiet,
             lang=args.lang,
+            history_policy=history_policy,
         )
 
         agent = PhoneAgent(
             model_config=model_config,
             agent_config=agent_config,
+            recorder=recorder,
         )
 
     # Print header
@@ -797,6 +890,9 @@ def main():
     if device_type == DeviceType.IOS:
         print(f"WDA URL: {args.wda_url}")
 
+    if recorder:
+        print(f"Recording: {args.record}")
+
     # Show device info
     if device_type == DeviceType.IOS:
         devices = list_ios_devices()
@@ -818,35 +914,49 @@ def main():
     print("=" * 50)
 
     # Run with provided task or enter interactive mode
-    if args.task:
-        print(f"\nTask: {args.task}\n")
-        result = agent.run(args.task)
-        print(f"\nResult: {result}")
-    else:
-        # Interactive mode
-        print("\nEntering interactive mode. Type 'quit' to exit.\n")
+    try:
+        if args.task:
+            print(f"\nTask: {args.task}\n")
+            result = agent.run(args.task)
+            print(f"\nResult: {result}")
+        else:
+            # Interactive mode
+            print("\nEntering interactive mode. Type 'quit' to exit.\n")
 
-        while True:
-            try:
-                task = input("Enter your task: ").strip()
+            while True:
+                try:
+                    task = input("Enter your task: ").strip()
 
-                if task.lower() in ("quit", "exit", "q"):
-                    print("Goodbye!")
-                    break
+                    if task.lower() in ("quit", "exit", "q"):
+                        print("Goodbye!")
+                        break
 
-                if not task:
-                    continue
+                    if not task:
+                        continue
 
-                print()
-                result = agent.run(task)
-                print(f"\nResult: {result}\n")
-                agent.reset()
+                    print()
+                    result = agent.run(task)
+                    print(f"\nResult: {result}\n")
+                    agent.reset()
 
-            except KeyboardInterrupt:
-                print("\n\nInterrupted. Goodbye!")
-                break
-            except Exception as e:
-                print(f"\nError: {e}\n")
+                except KeyboardInterrupt:
+                    print("\n\nInterrupted. Goodbye!")
+                    break
+                except Exception as e:
+                    print(f"\nError: {e}\n")
+    finally:
+        get_timing_sink().close()
+        settle_stats = agent.action_handler.settle_stats
+        if settle_stats.count:
+            print(
+                f"Settle: {settle_stats.stable_count}/{settle_stats.count} waits "
+                f"settled, {settle_stats.waited:.2f}s waited vs "
+                f"{settle_stats.fixed_delay:.2f}s fixed ({settle_stats.saved:+.2f}s)"
+            )
+        if recorder:
+            recorder.close()
+            if recorder.dropped:
+                print(f"Recording dropped {recorder.dropped} steps")
 
 
 if __name__ == "__main__":
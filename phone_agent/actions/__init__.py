@@ -1,5 +1,6 @@
 """Action handling module for Phone Agent."""
 
 from phone_agent.actions.handler import ActionHandler, ActionResult
+from phone_agent.actions.parser import Action, ActionSyntaxError
 
-__all__ = ["ActionHandler", "ActionResult"]
+__all__ = ["ActionHandler", "ActionResult", "Action", "ActionSyntaxError"]
@@ -1,14 +1,15 @@
 """Action handler for processing AI model outputs."""
 
-import ast
 import re
 import subprocess
 import time
 from dataclasses import dataclass
 from typing import Any, Callable
 
-from phone_agent.config.timing import TIMING_CONFIG
-from phone_agent.device_factory import get_device_factory
+from phone_agent.actions.parser import ActionSyntaxError, parse
+from phone_agent.config.timing import TIMING_CONFIG, TimingConfig
+from phone_agent.device_factory import DeviceFactory, get_device_factory
+from phone_agent.settle import SETTLED_ACTIONS, SettleStats, wait_for_settle
 
 
 @dataclass
@@ -30,6 +31,9 @@ class ActionHandler:
         confirmation_callback: Optional callback for sensitive action confirmation.
             Should return True to proceed, False to cancel.
         takeover_callback: Optional callback for takeover requests (login, captcha).
+        device_factory: Optional device factory. If None, uses the global one.
+        timing: Optional timing configuration for post-action waits. If None,
+            uses the global TIMING_CONFIG.
     """
 
     def __init__(
@@ -37,10 +41,22 @@ class ActionHandler:
         device_id: str | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        device_factory: DeviceFactory | None = None,
+        timing: TimingConfig | None = None,
     ):
         self.device_id = device_id
+        self._device_factory = device_factory
+        self.timing = timing or TIMING_CONFIG
         self.confirmation_callback = confirmation_callback or self._default_confirmation
         self.takeover_callback = takeover_callback or self._default_takeover
+        self.settle_stats = SettleStats()
+        self._frame_before: str | None = None  # Frame signature before the action
+        self.last_wait_time = 0.0  # Time the last execute() spent waiting on the UI
+
+    @property
+    def device_factory(self) -> DeviceFactory:
+        """The device factory actions are sent through."""
+        return self._device_factory or get_device_factory()
 
     def execute(
         self, action: dict[str, Any], screen_width: int, screen_height: int
@@ -57,6 +73,7 @@ class ActionHandler:
             ActionResult indicating success and whether to finish.
         """
         action_type = action.get("_metadata")
+        self.last_wait_time = 0.0
 
         if action_type == "finish":
             return ActionResult(
@@ -80,6 +97,11 @@ class ActionHandler:
                 message=f"Unknown action: {action_name}",
             )
 
+        # Sample the screen first, so settling can tell when it has reacted
+        self._frame_before = None
+        if self.timing.settle.enabled and action_name in SETTLED_ACTIONS:
+            self._frame_before = self._frame_signature()
+
         try:
             return handler_method(action, screen_width, screen_height)
         except Exception as e:
@@ -121,9 +143,10 @@ class ActionHandler:
         if not app_name:
             return ActionResult(False, False, "No app name specified")
 
-        device_factory = get_device_factory()
-        success = device_factory.launch_app(app_name, self.device_id)
+        device_factory = self.device_factory
+        success = device_factory.launch_app(app_name, self.device_id, delay=0)
         if success:
+            self._wait_after("launch", self.timing.device.default_launch_delay)
             return ActionResult(True, False)
         return ActionResult(False, False, f"App not found: {app_name}")
 
@@ -144,31 +167,32 @@ class ActionHandler:
                     message="User cancelled sensitive operation",
                 )
 
-        device_factory = get_device_factory()
-        device_factory.tap(x, y, self.device_id)
+        device_factory = self.device_factory
+        device_factory.tap(x, y, self.device_id, delay=0)
+        self._wait_after("tap", self.timing.device.default_tap_delay)
         return ActionResult(True, False)
 
     def _handle_type(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle text input action."""
         text = action.get("text", "")
 
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
 
         # Switch to ADB keyboard
         original_ime = device_factory.detect_and_set_adb_keyboard(self.device_id)
-        time.sleep(TIMING_CONFIG.action.keyboard_switch_delay)
+        self._wait_after("type", self.timing.action.keyboard_switch_delay)
 
         # Clear existing text and type new text
         device_factory.clear_text(self.device_id)
-        time.sleep(TIMING_CONFIG.action.text_clear_delay)
+        self._wait_after("type", self.timing.action.text_clear_delay)
 
         # Handle multiline text by splitting on newlines
         device_factory.type_text(text, self.device_id)
-        time.sleep(TIMING_CONFIG.action.text_input_delay)
+        self._wait_after("type", self.timing.action.text_input_delay)
 
         # Restore original keyboard
         device_factory.restore_keyboard(original_ime, self.device_id)
-        time.sleep(TIMING_CONFIG.action.keyboard_restore_delay)
+        self._wait_after("type", self.timing.action.keyboard_restore_delay)
 
         return ActionResult(True, False)
 
@@ -183,20 +207,25 @@ class ActionHandler:
         start_x, start_y = self._convert_relative_to_absolute(start, width, height)
         end_x, end_y = self._convert_relative_to_absolute(end, width, height)
 
-        device_factory = get_device_factory()
-        device_factory.swipe(start_x, start_y, end_x, end_y, device_id=self.device_id)
+        device_factory = self.device_factory
+        device_factory.swipe(
+            start_x, start_y, end_x, end_y, device_id=self.device_id, delay=0
+        )
+        self._wait_after("swipe", self.timing.device.default_swipe_delay)
         return ActionResult(True, False)
 
     def _handle_back(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle back button action."""
-        device_factory = get_device_factory()
-        device_factory.back(self.device_id)
+        device_factory = self.device_factory
+        device_factory.back(self.device_id, delay=0)
+        self._wait_after("back", self.timing.device.default_back_delay)
         return ActionResult(True, False)
 
     def _handle_home(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle home button action."""
-        device_factory = get_device_factory()
-        device_factory.home(self.device_id)
+        device_factory = self.device_factory
+        device_factory.home(self.device_id, delay=0)
+        self._wait_after("home", self.timing.device.default_home_delay)
         return ActionResult(True, False)
 
     def _handle_double_tap(self, action: dict, width: int, height: int) -> ActionResult:
@@ -206,8 +235,9 @@ class ActionHandler:
             return ActionResult(False, False, "No element coordinates")
 
         x, y = self._convert_relative_to_absolute(element, width, height)
-        device_factory = get_device_factory()
-        device_factory.double_tap(x, y, self.device_id)
+        device_factory = self.device_factory
+        device_factory.double_tap(x, y, self.device_id, delay=0)
+        self._wait_after("double_tap", self.timing.device.default_double_tap_delay)
         return ActionResult(True, False)
 
     def _handle_long_press(self, action: dict, width: int, height: int) -> ActionResult:
@@ -217,8 +247,9 @@ class ActionHandler:
             return ActionResult(False, False, "No element coordinates")
 
         x, y = self._convert_relative_to_absolute(element, width, height)
-        device_factory = get_device_factory()
-        device_factory.long_press(x, y, device_id=self.device_id)
+        device_factory = self.device_factory
+        device_factory.long_press(x, y, device_id=self.device_id, delay=0)
+        self._wait_after("long_press", self.timing.device.default_long_press_delay)
         return ActionResult(True, False)
 
     def _handle_wait(self, action: dict, width: int, height: int) -> ActionResult:
@@ -230,6 +261,7 @@ class ActionHandler:
             duration = 1.0
 
         time.sleep(duration)
+        self.last_wait_time += duration
         return ActionResult(True, False)
 
     def _handle_takeover(self, action: dict, width: int, height: int) -> ActionResult:
@@ -255,12 +287,46 @@ class ActionHandler:
         # This action signals that user input is needed
         return ActionResult(True, False, message="User interaction required")
 
+    def _wait_after(self, action: str, fixed_delay: float) -> None:
+        """
+        Wait for the UI to catch up after an action.
+
+        Sleeps the fixed delay, or polls frames until the screen settles when
+        adaptive settling is enabled.
+
+        Args:
+            action: Action key selecting the settle budget (e.g. "tap").
+            fixed_delay: Configured fixed delay for this action in seconds.
+        """
+        config = self.timing.settle
+        if not config.enabled:
+            time.sleep(fixed_delay)
+            self.last_wait_time += fixed_delay
+            return
+
+        waited, stable, self._frame_before = wait_for_settle(
+            self._frame_signature,
+            budget=getattr(config, f"{action}_budget"),
+            fallback_delay=fixed_delay,
+            config=config,
+            before=self._frame_before,
+        )
+        self.settle_stats.record(waited, fixed_delay, stable)
+        self.last_wait_time += waited
+
+    def _frame_signature(self) -> str | None:
+        """Get a signature of the current frame, or None if unavailable."""
+        try:
+            return self.device_factory.get_frame_signature(self.device_id)
+        except Exception:
+            return None
+
     def _send_keyevent(self, keycode: str) -> None:
         """Send a keyevent to the device."""
-        from phone_agent.device_factory import DeviceType, get_device_factory
+        from phone_agent.device_factory import DeviceType
         from phone_agent.hdc.connection import _run_hdc_command
 
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
 
         # Handle HDC devices with HarmonyOS-specific keyEvent command
         if device_factory.device_type == DeviceType.HDC:
@@ -310,12 +376,9 @@ class ActionHandler:
                     )
         else:
             # ADB devices use standard input keyevent command
-            cmd_prefix = ["adb", "-s", self.device_id] if self.device_id else ["adb"]
-            subprocess.run(
-                cmd_prefix + ["shell", "input", "keyevent", keycode],
-                capture_output=True,
-                text=True,
-            )
+            from phone_agent.adb.shell import run_shell
+
+            run_shell(["input", "keyevent", keycode], self.device_id)
 
     @staticmethod
     def _default_confirmation(message: str) -> bool:
@@ -342,48 +405,9 @@ def parse_action(response: str) -> dict[str, Any]:
     Raises:
         ValueError: If the response cannot be parsed.
     """
-    print(f"Parsing action: {response}")
     try:
-        response = response.strip()
-        if response.startswith('do(action="Type"') or response.startswith(
-            'do(action="Type_Name"'
-        ):
-            text = response.split("text=", 1)[1][1:-2]
-            action = {"_metadata": "do", "action": "Type", "text": text}
-            return action
-        elif response.startswith("do"):
-            # Use AST parsing instead of eval for safety
-            try:
-                # Escape special characters (newlines, tabs, etc.) for valid Python syntax
-                response = response.replace('\n', '\\n')
-                response = response.replace('\r', '\\r')
-                response = response.replace('\t', '\\t')
-
-                tree = ast.parse(response, mode="eval")
-                if not isinstance(tree.body, ast.Call):
-                    raise ValueError("Expected a function call")
-
-                call = tree.body
-                # Extract keyword arguments safely
-                action = {"_metadata": "do"}
-                for keyword in call.keywords:
-                    key = keyword.arg
-                    value = ast.literal_eval(keyword.value)
-                    action[key] = value
-
-                return action
-            except (SyntaxError, ValueError) as e:
-                raise ValueError(f"Failed to parse do() action: {e}")
-
-        elif response.startswith("finish"):
-            action = {
-                "_metadata": "finish",
-                "message": response.replace("finish(message=", "")[1:-2],
-            }
-        else:
-            raise ValueError(f"Failed to parse action: {response}")
-        return action
-    except Exception as e:
+        return parse(response).to_dict()
+    except ActionSyntaxError as e:
         raise ValueError(f"Failed to parse action: {e}")
 
 
@@ -4,6 +4,8 @@ import time
 from dataclasses import dataclass
 from typing import Any, Callable
 
+from phone_agent.config.timing import TIMING_CONFIG, TimingConfig
+from phone_agent.settle import SETTLED_ACTIONS, SettleStats, wait_for_settle
 from phone_agent.xctest import (
     back,
     double_tap,
@@ -13,7 +15,18 @@ from phone_agent.xctest import (
     swipe,
     tap,
 )
+from phone_agent.xctest.client import ReadTimeout
+from phone_agent.xctest.gestures import ActionChain
 from phone_agent.xctest.input import clear_text, hide_keyboard, type_text
+from phone_agent.xctest.screenshot import get_frame_signature
+
+# Fixed waits after each action, in seconds (the xctest function defaults)
+_ACTION_DELAY = 1.0
+_TYPE_STEP_DELAY = 0.5
+# Backspaces sent to clear the focused field before typing
+_CLEAR_BACKSPACES = 100
+# Pause on the device between clearing a field and typing into it (ms)
+_TYPE_PAUSE_MS = 200
 
 
 @dataclass
@@ -36,6 +49,10 @@ class IOSActionHandler:
         confirmation_callback: Optional callback for sensitive action confirmation.
             Should return True to proceed, False to cancel.
         takeover_callback: Optional callback for takeover requests (login, captcha).
+        mjpeg_url: Optional WDA MJPEG server URL. Adaptive settling compares
+            streamed frames; without it, the fixed delays are used.
+        timing: Optional timing configuration for post-action waits. If None,
+            uses the global TIMING_CONFIG.
     """
 
     def __init__(
@@ -44,11 +61,18 @@ class IOSActionHandler:
         session_id: str | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        mjpeg_url: str | None = None,
+        timing: TimingConfig | None = None,
     ):
         self.wda_url = wda_url
         self.session_id = session_id
+        self.mjpeg_url = mjpeg_url
+        self.timing = timing or TIMING_CONFIG
         self.confirmation_callback = confirmation_callback or self._default_confirmation
         self.takeover_callback = takeover_callback or self._default_takeover
+        self.settle_stats = SettleStats()
+        self._frame_before: str | None = None  # Frame signature before the action
+        self.last_wait_time = 0.0  # Time the last execute() spent waiting on the UI
 
     def execute(
         self, action: dict[str, Any], screen_width: int, screen_height: int
@@ -65,6 +89,7 @@ class IOSActionHandler:
             ActionResult indicating success and whether to finish.
         """
         action_type = action.get("_metadata")
+        self.last_wait_time = 0.0
 
         if action_type == "finish":
             return ActionResult(
@@ -88,6 +113,11 @@ class IOSActionHandler:
                 message=f"Unknown action: {action_name}",
             )
 
+        # Sample the screen first, so settling can tell when it has reacted
+        self._frame_before = None
+        if self.timing.settle.enabled and action_name in SETTLED_ACTIONS:
+            self._frame_before = self._frame_signature()
+
         try:
             return handler_method(action, screen_width, screen_height)
         except Exception as e:
@@ -130,9 +160,10 @@ class IOSActionHandler:
             return ActionResult(False, False, "No app name specified")
 
         success = launch_app(
-            app_name, wda_url=self.wda_url, session_id=self.session_id
+            app_name, wda_url=self.wda_url, session_id=self.session_id, delay=0
         )
         if success:
+            self._wait_after("launch", _ACTION_DELAY)
             return ActionResult(True, False)
         return ActionResult(False, False, f"App not found: {app_name}")
 
@@ -144,8 +175,6 @@ class IOSActionHandler:
 
         x, y = self._convert_relative_to_absolute(element, width, height)
 
-        print(f"Physically tap on ({x}, {y})")
-
         # Check for sensitive operation
         if "message" in action:
             if not self.confirmation_callback(action["message"]):
@@ -155,23 +184,33 @@ class IOSActionHandler:
                     message="User cancelled sensitive operation",
                 )
 
-        tap(x, y, wda_url=self.wda_url, session_id=self.session_id)
+        tap(x, y, wda_url=self.wda_url, session_id=self.session_id, delay=0)
+        self._wait_after("tap", _ACTION_DELAY)
         return ActionResult(True, False)
 
     def _handle_type(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle text input action."""
         text = action.get("text", "")
 
-        # Clear existing text and type new text
-        clear_text(wda_url=self.wda_url, session_id=self.session_id)
-        time.sleep(0.5)
-
-        type_text(text, wda_url=self.wda_url, session_id=self.session_id)
-        time.sleep(0.5)
-
-        # Hide keyboard after typing
+        # Clear, pause and type as one key chain, so WDA runs the whole edit
+        # on the device in a single request
+        chain = (
+            ActionChain()
+            .backspace(_CLEAR_BACKSPACES)
+            .pause(_TYPE_PAUSE_MS)
+            .type_text(text)
+        )
+        if not self._perform(chain):
+            # WDA builds without W3C key actions
+            clear_text(wda_url=self.wda_url, session_id=self.session_id)
+            self._wait_after("type", _TYPE_STEP_DELAY)
+            type_text(text, wda_url=self.wda_url, session_id=self.session_id)
+
+        # W3C key actions have no way to dismiss the keyboard (Return would
+        # submit the field), so this stays a request of its own; the settle
+        # wait below covers its animation
         hide_keyboard(wda_url=self.wda_url, session_id=self.session_id)
-        time.sleep(0.5)
+        self._wait_after("type", _TYPE_STEP_DELAY)
 
         return ActionResult(True, False)
 
@@ -186,8 +225,6 @@ class IOSActionHandler:
         start_x, start_y = self._convert_relative_to_absolute(start, width, height)
         end_x, end_y = self._convert_relative_to_absolute(end, width, height)
 
-        print(f"Physically scroll from ({start_x}, {start_y}) to ({end_x}, {end_y})")
-
         swipe(
             start_x,
             start_y,
@@ -195,17 +232,21 @@ class IOSActionHandler:
             end_y,
             wda_url=self.wda_url,
             session_id=self.session_id,
+            delay=0,
         )
+        self._wait_after("swipe", _ACTION_DELAY)
         return ActionResult(True, False)
 
     def _handle_back(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle back gesture (swipe from left edge)."""
-        back(wda_url=self.wda_url, session_id=self.session_id)
+        back(wda_url=self.wda_url, session_id=self.session_id, delay=0)
+        self._wait_after("back", _ACTION_DELAY)
         return ActionResult(True, False)
 
     def _handle_home(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle home button action."""
-        home(wda_url=self.wda_url, session_id=self.session_id)
+        home(wda_url=self.wda_url, session_id=self.session_id, delay=0)
+        self._wait_after("home", _ACTION_DELAY)
         return ActionResult(True, False)
 
     def _handle_double_tap(self, action: dict, width: int, height: int) -> ActionResult:
@@ -215,7 +256,8 @@ class IOSActionHandler:
             return ActionResult(False, False, "No element coordinates")
 
         x, y = self._convert_relative_to_absolute(element, width, height)
-        double_tap(x, y, wda_url=self.wda_url, session_id=self.session_id)
+        double_tap(x, y, wda_url=self.wda_url, session_id=self.session_id, delay=0)
+        self._wait_after("double_tap", _ACTION_DELAY)
         return ActionResult(True, False)
 
     def _handle_long_press(self, action: dict, width: int, height: int) -> ActionResult:
@@ -231,7 +273,9 @@ class IOSActionHandler:
             duration=3.0,
             wda_url=self.wda_url,
             session_id=self.session_id,
+            delay=0,
         )
+        self._wait_after("long_press", _ACTION_DELAY)
         return ActionResult(True, False)
 
     def _handle_wait(self, action: dict, width: int, height: int) -> ActionResult:
@@ -243,6 +287,7 @@ class IOSActionHandler:
             duration = 1.0
 
         time.sleep(duration)
+        self.last_wait_time += duration
         return ActionResult(True, False)
 
     def _handle_takeover(self, action: dict, width: int, height: int) -> ActionResult:
@@ -268,6 +313,51 @@ class IOSActionHandler:
         # This action signals that user input is needed
         return ActionResult(True, False, message="User interaction required")
 
+    def _perform(self, chain: ActionChain) -> bool:
+        """Send an action chain, returning False if WDA did not run it."""
+        try:
+            return chain.perform(self.wda_url, self.session_id)
+        except ReadTimeout:
+            # WDA has the chain and may still be running it; a fallback
+            # would repeat it, e.g. type the text twice
+            return True
+        except Exception:
+            return False
+
+    def _wait_after(self, action: str, fixed_delay: float) -> None:
+        """
+        Wait for the UI to catch up after an action.
+
+        Sleeps the fixed delay, or waits until consecutive MJPEG frames match
+        when adaptive settling is enabled.
+
+        Args:
+            action: Action key selecting the settle budget (e.g. "tap").
+            fixed_delay: Fixed delay for this action in seconds.
+        """
+        config = self.timing.settle
+        if not config.enabled:
+            time.sleep(fixed_delay)
+            self.last_wait_time += fixed_delay
+            return
+
+        waited, stable, self._frame_before = wait_for_settle(
+            self._frame_signature,
+            budget=getattr(config, f"{action}_budget"),
+            fallback_delay=fixed_delay,
+            config=config,
+            before=self._frame_before,
+        )
+        self.settle_stats.record(waited, fixed_delay, stable)
+        self.last_wait_time += waited
+
+    def _frame_signature(self) -> str | None:
+        """Get a signature of the current frame, or None if unavailable."""
+        try:
+            return get_frame_signature(self.mjpeg_url)
+        except Exception:
+            return None
+
     @staticmethod
     def _default_confirmation(message: str) -> bool:
         """Default confirmation callback using console input."""
@@ -0,0 +1,294 @@
+"""Tokenizer and parser for the do(...)/finish(...) action grammar.
+
+The model answers with a single Python-style call:
+
+    do(action="Tap", element=[500, 300])
+    do(action="Type", text="Hello World")
+    finish(message="Task completed.")
+
+Arguments are keyword-only literals: strings (single or double quoted, with
+backslash escapes and raw newlines allowed), numbers, True/False/None, and
+nested lists, tuples and dicts of those. Anything after the closing paren,
+such as a stray </answer> tag, is ignored.
+
+Free-text arguments (Type/Type_Name text, finish message) are taken as
+written: backslashes are kept rather than decoded, so "C:\temp" types a
+backslash and a "t". They are also sometimes emitted with unescaped quotes
+inside. When strict parsing of such a call fails, the text is recovered
+leniently: everything from the opening quote up to the closing `")` of the
+call.
+"""
+
+import re
+from typing import Any
+
+# One token per match, with any leading whitespace skipped
+_TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<punct>[()\[\]{},=:])
+    )""",
+    re.VERBOSE | re.DOTALL,
+)
+
+_ESCAPE_PATTERN = re.compile(
+    r"\\(u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|x[0-9a-fA-F]{2}|[0-7]{1,3}|.)", re.DOTALL
+)
+
+_SIMPLE_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "\\": "\\",
+    "'": "'",
+    '"': '"',
+    "\n": "",  # Line continuation
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "0": "\0",
+}
+
+_CONSTANTS = {"True": True, "False": False, "None": None}
+
+_CLOSERS = {"[": "]", "(": ")", "{": "}"}
+
+# Calls whose free-text argument is kept raw and may be recovered leniently
+_LENIENT_PREFIXES = (
+    ('do(action="Type_Name"', "text="),
+    ('do(action="Type"', "text="),
+    ("finish(", "message="),
+)
+_RAW_TEXT_PREFIXES = tuple(prefix for prefix, _ in _LENIENT_PREFIXES)
+
+
+class Action:
+    """
+    A parsed model action.
+
+    Attributes:
+        kind: "do" or "finish".
+        name: Action name for do(...) calls (e.g. "Tap"), None for finish.
+        params: Keyword arguments other than action=.
+    """
+
+    __slots__ = ("kind", "name", "params")
+
+    def __init__(self, kind: str, name: str | None, params: dict[str, Any]):
+        self.kind = kind
+        self.name = name
+        self.params = params
+
+    @property
+    def is_finish(self) -> bool:
+        """Whether this action ends the task."""
+        return self.kind == "finish"
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert to the action dictionary used by the action handlers.
+
+        Returns:
+            Dictionary with "_metadata", "action" (for do calls) and the
+            keyword arguments.
+        """
+        action = {"_metadata": self.kind}
+        if self.name is not None:
+            action["action"] = self.name
+        action.update(self.params)
+        return action
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Action):
+            return NotImplemented
+        return (
+            self.kind == other.kind
+            and self.name == other.name
+            and self.params == other.params
+        )
+
+    def __repr__(self) -> str:
+        return f"Action(kind={self.kind!r}, name={self.name!r}, params={self.params!r})"
+
+
+class ActionSyntaxError(ValueError):
+    """Raised when a response is not a valid action call."""
+
+
+def parse(response: str) -> Action:
+    """
+    Parse a model response into an Action.
+
+    Args:
+        response: Raw action string from the model.
+
+    Returns:
+        The parsed Action.
+
+    Raises:
+        ActionSyntaxError: If the response is not a valid action call.
+    """
+    response = response.strip()
+    try:
+        raw_strings = response.startswith(_RAW_TEXT_PREFIXES)
+        function, kwargs = _Parser(response, raw_strings).parse_call()
+    except ActionSyntaxError:
+        action = _parse_lenient(response)
+        if action is None:
+            raise
+        return action
+
+    if function == "do":
+        name = kwargs.pop("action", None)
+        if not isinstance(name, str):
+            raise ActionSyntaxError("do() call without an action name")
+        if name == "Type_Name":
+            # Type_Name is typed exactly like Type
+            name = "Type"
+        return Action("do", name, kwargs)
+
+    if function == "finish":
+        return Action("finish", None, kwargs)
+
+    raise ActionSyntaxError(f"Unknown function: {function}")
+
+
+def _parse_lenient(response: str) -> Action | None:
+    """Recover Type/Type_Name text or a finish message with stray quotes."""
+    for prefix, argument in _LENIENT_PREFIXES:
+        if not response.startswith(prefix):
+            continue
+        start = response.find(argument)
+        end = response.rfind('")')
+        if start < 0 or end < 0:
+            return None
+        start += len(argument) + 1  # Skip the opening quote
+        if start > end:
+            return None
+        text = response[start:end]
+        if prefix.startswith("finish"):
+            return Action("finish", None, {"message": text})
+        return Action("do", "Type", {"text": text})
+    return None
+
+
+class _Parser:
+    """Recursive-descent parser over the token stream of one call."""
+
+    __slots__ = ("_text", "_pos", "_raw_strings")
+
+    def __init__(self, text: str, raw_strings: bool = False):
+        self._text = text
+        self._pos = 0
+        # Keep backslashes in strings instead of decoding escapes
+        self._raw_strings = raw_strings
+
+    def parse_call(self) -> tuple[str, dict[str, Any]]:
+        """Parse `name(key=value, ...)` and return the name and arguments."""
+        kind, function = self._next()
+        if kind != "name":
+            raise ActionSyntaxError(f"Expected a function name, got {function!r}")
+        self._expect("(")
+
+        kwargs: dict[str, Any] = {}
+        kind, token = self._next()
+        while (kind, token) != ("punct", ")"):
+            if kind != "name":
+                raise ActionSyntaxError(f"Expected an argument name, got {token!r}")
+            self._expect("=")
+            kwargs[token] = self._value(self._next())
+
+            kind, token = self._next()
+            if kind == "punct" and token == ",":
+                kind, token = self._next()
+            elif kind != "punct" or token != ")":
+                raise ActionSyntaxError(f"Expected ',' or ')', got {token!r}")
+
+        return function, kwargs
+
+    def _value(self, token: tuple[str, str]) -> Any:
+        """Parse a literal starting at the given token."""
+        kind, text = token
+        if kind == "string":
+            if self._raw_strings:
+                return text[1:-1]
+            return _decode_string(text)
+        if kind == "number":
+            try:
+                return int(text)
+            except ValueError:
+                return float(text)
+        if kind == "name":
+            if text in _CONSTANTS:
+                return _CONSTANTS[text]
+            raise ActionSyntaxError(f"Unexpected name {text!r}")
+        if text in _CLOSERS:
+            return self._container(text)
+        raise ActionSyntaxError(f"Unexpected {text!r}")
+
+    def _container(self, opener: str) -> Any:
+        """Parse the rest of a list, tuple or dict after its opening bracket."""
+        closer = _CLOSERS[opener]
+        items: list[Any] = []
+        is_dict = opener == "{"
+
+        token = self._next()
+        while token != ("punct", closer):
+            key = self._value(token)
+            if is_dict:
+                self._expect(":")
+                items.append((key, self._value(self._next())))
+            else:
+                items.append(key)
+
+            token = self._next()
+            if token == ("punct", ","):
+                token = self._next()
+            elif token != ("punct", closer):
+                raise ActionSyntaxError(f"Expected ',' or {closer!r}, got {token[1]!r}")
+
+        if is_dict:
+            return dict(items)
+        if opener == "(":
+            return tuple(items)
+        return items
+
+    def _next(self) -> tuple[str, str]:
+        """Read the next token as (kind, text)."""
+        match = _TOKEN_PATTERN.match(self._text, self._pos)
+        if match is None:
+            rest = self._text[self._pos :].strip()
+            if not rest:
+                raise ActionSyntaxError("Unexpected end of action")
+            raise ActionSyntaxError(f"Unexpected character {rest[0]!r}")
+        self._pos = match.end()
+        kind = match.lastgroup
+        return kind, match.group(kind)
+
+    def _expect(self, punct: str) -> None:
+        kind, token = self._next()
+        if kind != "punct" or token != punct:
+            raise ActionSyntaxError(f"Expected {punct!r}, got {token!r}")
+
+
+def _decode_string(token: str) -> str:
+    """Strip the quotes from a string token and apply backslash escapes."""
+    body = token[1:-1]
+    if "\\" not in body:
+        return body
+    return _ESCAPE_PATTERN.sub(_decode_escape, body)
+
+
+def _decode_escape(match: re.Match) -> str:
+    escape = match.group(1)
+    if escape in _SIMPLE_ESCAPES:
+        return _SIMPLE_ESCAPES[escape]
+    if escape[0] in "uUx" and len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    if escape[0] in "01234567":
+        return chr(int(escape, 8))
+    # Unknown escapes keep their backslash, as in Python
+    return "\\" + escape
@@ -1,5 +1,6 @@
 """ADB utilities for Android device interaction."""
 
+from phone_agent.adb.app_cache import AppCache, get_app_cache
 from phone_agent.adb.connection import (
     ADBConnection,
     ConnectionType,
@@ -11,6 +12,7 @@ from phone_agent.adb.device import (
     back,
     double_tap,
     get_current_app,
+    get_current_package,
     home,
     launch_app,
     long_press,
@@ -23,11 +25,32 @@ from phone_agent.adb.input import (
     restore_keyboard,
     type_text,
 )
-from phone_agent.adb.screenshot import get_screenshot
+from phone_agent.adb.protocol import (
+    ADBClient,
+    ADBProtocolError,
+    get_adb_client,
+    set_adb_protocol,
+)
+from phone_agent.adb.screenshot import (
+    CaptureMode,
+    get_frame_signature,
+    get_screenshot,
+    set_capture_mode,
+)
+from phone_agent.adb.shell import (
+    ADBShellSession,
+    close_all_sessions,
+    get_shell_session,
+    run_shell,
+    set_persistent_shell,
+)
 
 __all__ = [
     # Screenshot
     "get_screenshot",
+    "get_frame_signature",
+    "CaptureMode",
+    "set_capture_mode",
     # Input
     "type_text",
     "clear_text",
@@ -35,6 +58,7 @@ __all__ = [
     "restore_keyboard",
     # Device control
     "get_current_app",
+    "get_current_package",
     "tap",
     "swipe",
     "back",
@@ -42,6 +66,20 @@ __all__ = [
     "double_tap",
     "long_press",
     "launch_app",
+    # Installed apps
+    "AppCache",
+    "get_app_cache",
+    # adb server protocol
+    "ADBClient",
+    "ADBProtocolError",
+    "get_adb_client",
+    "set_adb_protocol",
+    # Shell sessions
+    "ADBShellSession",
+    "get_shell_session",
+    "run_shell",
+    "close_all_sessions",
+    "set_persistent_shell",
     # Connection management
     "ADBConnection",
     "DeviceInfo",
@@ -0,0 +1,231 @@
+"""Per-device cache of installed packages and their launcher activities."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+from phone_agent.adb.shell import run_shell
+
+_LIST_PACKAGES = "pm list packages"
+_LAUNCHER_INTENT = [
+    "-a",
+    "android.intent.action.MAIN",
+    "-c",
+    "android.intent.category.LAUNCHER",
+]
+_QUERY_LAUNCHERS = [
+    "cmd",
+    "package",
+    "query-activities",
+    "--brief",
+    *_LAUNCHER_INTENT,
+]
+_RESOLVE_LAUNCHER = [
+    "cmd",
+    "package",
+    "resolve-activity",
+    "--brief",
+    *_LAUNCHER_INTENT,
+]
+
+# Component line of --brief output, e.g. "com.android.settings/.Settings"
+_COMPONENT_LINE = re.compile(r"^\s*([\w.]+)/([\w.$]+)\s*$", re.MULTILINE)
+
+_CACHE_VERSION = 1
+
+
+def _default_cache_dir() -> str:
+    return os.getenv("PHONE_AGENT_APP_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "phone_agent", "apps"
+    )
+
+
+class AppCache:
+    """
+    Installed packages and launcher activities of one device.
+
+    Built on first use from `pm list packages` and a single
+    `cmd package query-activities` call, and saved to a JSON file named
+    after the device serial. Later processes reuse the file as long as the
+    installed package list is unchanged, so they pay for one
+    `pm list packages` instead of a full rebuild. Packages missing from the
+    query are resolved one at a time with `cmd package resolve-activity`.
+
+    Args:
+        device_id: Optional ADB device ID.
+        cache_dir: Directory for the cache files. Defaults to
+            PHONE_AGENT_APP_CACHE_DIR or ~/.cache/phone_agent/apps.
+    """
+
+    def __init__(self, device_id: str | None = None, cache_dir: str | None = None):
+        self.device_id = device_id
+        self.cache_dir = cache_dir or _default_cache_dir()
+        self._lock = threading.RLock()
+        self._serial: str | None = None
+        self._packages: frozenset[str] | None = None
+        self._fingerprint = ""
+        # Launcher component by package; None when the package has none
+        self._components: dict[str, str | None] = {}
+
+    @property
+    def serial(self) -> str:
+        """Hardware serial of the device, which names the cache file."""
+        if self._serial is None:
+            output = run_shell("getprop ro.serialno", self.device_id).output.strip()
+            self._serial = output or self.device_id or "default"
+        return self._serial
+
+    @property
+    def path(self) -> str:
+        """Path of the cache file."""
+        name = re.sub(r"[^\w.-]", "_", self.serial)
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def packages(self) -> frozenset[str]:
+        """Get the installed packages."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._packages
+
+    def is_installed(self, package: str) -> bool:
+        """Check whether a package is installed."""
+        return package in self.packages()
+
+    def get_launch_component(self, package: str) -> str | None:
+        """
+        Get the launcher activity of a package.
+
+        Args:
+            package: Package name.
+
+        Returns:
+            Component name for `am start -n`, e.g. "com.android.settings/.Settings",
+            or None if the package is not installed or has no launcher activity.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if package not in self._packages:
+                return None
+            if package not in self._components:
+                self._components[package] = self._resolve(package)
+                self._save()
+            return self._components[package]
+
+    def invalidate(self, package: str | None = None) -> None:
+        """
+        Drop cached entries so they are read from the device again.
+
+        Args:
+            package: Package whose launcher activity changed, e.g. after a
+                failed launch. If None, the whole cache is rebuilt.
+        """
+        with self._lock:
+            if package is None:
+                self._components = {}
+                self._fingerprint = ""
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+            else:
+                self._components.pop(package, None)
+            # Re-list packages too: an install or uninstall is the likely cause
+            self._packages = None
+
+    def _ensure_loaded(self) -> None:
+        """List the installed packages and load or rebuild the components."""
+        if self._packages is not None:
+            return
+
+        output = run_shell(_LIST_PACKAGES, self.device_id).output
+        packages = frozenset(
+            line[len("package:") :].strip()
+            for line in output.splitlines()
+            if line.startswith("package:")
+        )
+        fingerprint = hashlib.sha1("\n".join(sorted(packages)).encode()).hexdigest()
+
+        if fingerprint == self._fingerprint:
+            # Same packages as last time; only the invalidated entries are gone
+            self._packages = packages
+            return
+
+        self._packages = packages
+        self._fingerprint = fingerprint
+        self._components = self._load(fingerprint)
+        if not self._components:
+            self._components = self._query_launchers(packages)
+            self._save()
+
+    def _query_launchers(self, packages: frozenset[str]) -> dict[str, str | None]:
+        """Resolve the launcher activities of all packages in one call."""
+        output = run_shell(_QUERY_LAUNCHERS, self.device_id, timeout=30).output
+        components: dict[str, str | None] = {}
+        for package, activity in _COMPONENT_LINE.findall(output):
+            if package in packages:
+                components.setdefault(package, f"{package}/{activity}")
+        return components
+
+    def _resolve(self, package: str) -> str | None:
+        """Resolve the launcher activity of one package."""
+        output = run_shell(_RESOLVE_LAUNCHER + [package], self.device_id).output
+        for found, activity in _COMPONENT_LINE.findall(output):
+            if found == package:
+                return f"{package}/{activity}"
+        return None
+
+    def _load(self, fingerprint: str) -> dict[str, str | None]:
+        """Read the cache file if it matches the installed packages."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (
+            data.get("version") != _CACHE_VERSION
+            or data.get("fingerprint") != fingerprint
+        ):
+            return {}
+        return dict(data.get("components", {}))
+
+    def _save(self) -> None:
+        """Write the cache file atomically."""
+        data = {
+            "version": _CACHE_VERSION,
+            "serial": self.serial,
+            "fingerprint": self._fingerprint,
+            "components": self._components,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=0)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Warning: could not save app cache: {e}")
+
+
+# App cache per device
+_caches: dict[str | None, AppCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_app_cache(device_id: str | None = None) -> AppCache:
+    """
+    Get the shared app cache for a device.
+
+    Args:
+        device_id: Optional ADB device ID.
+
+    Returns:
+        The device's AppCache.
+    """
+    with _caches_lock:
+        cache = _caches.get(device_id)
+        if cache is None:
+            cache = AppCache(device_id)
+            _caches[device_id] = cache
+        return cache
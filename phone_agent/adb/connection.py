@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from phone_agent.adb.protocol import ADBProtocolError, get_adb_client
 from phone_agent.config.timing import TIMING_CONFIG
 
 
@@ -125,16 +126,11 @@ class ADBConnection:
             List of DeviceInfo objects.
         """
         try:
-            result = subprocess.run(
-                [self.adb_path, "devices", "-l"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+            output = self._get_device_list_output()
 
             devices = []
-            for line in result.stdout.strip().split("\n")[1:]:  # Skip header
-                if not line.strip():
+            for line in output.strip().split("\n"):
+                if not line.strip() or line.startswith(("List of devices", "*")):
                     continue
 
                 parts = line.split()
@@ -172,6 +168,24 @@ class ADBConnection:
             print(f"Error listing devices: {e}")
             return []
 
+    def _get_device_list_output(self) -> str:
+        """Get `adb devices -l` output, from the adb server when reachable."""
+        client = get_adb_client()
+        if client is not None:
+            try:
+                return client.devices()
+            except (ConnectionRefusedError, ADBProtocolError):
+                # Server not running yet; the CLI starts it
+                pass
+
+        result = subprocess.run(
+            [self.adb_path, "devices", "-l"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        return result.stdout
+
     def get_device_info(self, device_id: str | None = None) -> DeviceInfo | None:
         """
         Get detailed information about a device.
@@ -1,13 +1,35 @@
 """Device control utilities for Android automation."""
 
 import os
-import subprocess
+import re
 import time
 from typing import List, Optional, Tuple
 
-from phone_agent.config.apps import APP_PACKAGES
+from phone_agent.adb.app_cache import get_app_cache
+from phone_agent.adb.shell import run_shell
+from phone_agent.config.apps import ANDROID_APPS
 from phone_agent.config.timing import TIMING_CONFIG
 
+# `dumpsys window displays` is much smaller than the full dump; older
+# releases only report focus in the full dump
+_FOCUS_QUERY = (
+    "dumpsys window displays | grep -E 'mCurrentFocus|mFocusedApp' || "
+    "dumpsys window | grep -E 'mCurrentFocus|mFocusedApp'"
+)
+_FOCUS_PATTERN = re.compile(r"(?:mCurrentFocus|mFocusedApp)=.*?\s([\w.]+)/")
+
+_HOME_QUERY = (
+    "cmd package resolve-activity --brief "
+    "-a android.intent.action.MAIN -c android.intent.category.HOME"
+)
+
+# Resolved component line, e.g. "com.miui.home/.launcher.Launcher"
+_HOME_COMPONENT = re.compile(r"^\s*([\w.]+)/[\w.$]+\s*$", re.MULTILINE)
+
+# Launcher package per device ID. Failed lookups are retried on the next
+# call, and the default device (None) is never cached since it may change.
+_home_packages: dict[str, str] = {}
+
 
 def get_current_app(device_id: str | None = None) -> str:
     """
@@ -17,25 +39,52 @@ def get_current_app(device_id: str | None = None) -> str:
         device_id: Optional ADB device ID for multi-device setups.
 
     Returns:
-        The app name if recognized, otherwise "System Home".
+        The app name if recognized, the package name for unknown apps, or
+        "System Home" for the launcher and when no app has focus.
     """
-    adb_prefix = _get_adb_prefix(device_id)
+    package = get_current_package(device_id)
+    if package is None or package == _get_home_package(device_id):
+        return "System Home"
+    return ANDROID_APPS.get_app_name(package) or package
 
-    result = subprocess.run(
-        adb_prefix + ["shell", "dumpsys", "window"], capture_output=True, text=True, encoding="utf-8"
-    )
-    output = result.stdout
+
+def get_current_package(device_id: str | None = None) -> str | None:
+    """
+    Get the package of the focused window.
+
+    Only the focus lines of the window manager dump are transferred; the
+    filtering happens on the device.
+
+    Args:
+        device_id: Optional ADB device ID for multi-device setups.
+
+    Returns:
+        The package name, or None if no app window has focus.
+    """
+    output = run_shell(_FOCUS_QUERY, device_id).output
     if not output:
         raise ValueError("No output from dumpsys window")
 
-    # Parse window focus info
-    for line in output.split("\n"):
-        if "mCurrentFocus" in line or "mFocusedApp" in line:
-            for app_name, package in APP_PACKAGES.items():
-                if package in line:
-                    return app_name
+    # Popups and system windows carry no package; the search moves on to the
+    # next focus line
+    match = _FOCUS_PATTERN.search(output)
+    return match.group(1) if match else None
 
-    return "System Home"
+
+def _get_home_package(device_id: str | None) -> str | None:
+    """Get the launcher package, resolved once per device."""
+    package = _home_packages.get(device_id) if device_id else None
+    if package is not None:
+        return package
+
+    output = run_shell(_HOME_QUERY, device_id).output
+    matches = _HOME_COMPONENT.findall(output)
+    if not matches:
+        return None
+    package = matches[-1]
+    if device_id:
+        _home_packages[device_id] = package
+    return package
 
 
 def tap(
@@ -53,11 +102,7 @@ def tap(
     if delay is None:
         delay = TIMING_CONFIG.device.default_tap_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
-
-    subprocess.run(
-        adb_prefix + ["shell", "input", "tap", str(x), str(y)], capture_output=True
-    )
+    run_shell(["input", "tap", str(x), str(y)], device_id)
     time.sleep(delay)
 
 
@@ -76,15 +121,9 @@ def double_tap(
     if delay is None:
         delay = TIMING_CONFIG.device.default_double_tap_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
-
-    subprocess.run(
-        adb_prefix + ["shell", "input", "tap", str(x), str(y)], capture_output=True
-    )
+    run_shell(["input", "tap", str(x), str(y)], device_id)
     time.sleep(TIMING_CONFIG.device.double_tap_interval)
-    subprocess.run(
-        adb_prefix + ["shell", "input", "tap", str(x), str(y)], capture_output=True
-    )
+    run_shell(["input", "tap", str(x), str(y)], device_id)
     time.sleep(delay)
 
 
@@ -108,12 +147,9 @@ def long_press(
     if delay is None:
         delay = TIMING_CONFIG.device.default_long_press_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
-
-    subprocess.run(
-        adb_prefix
-        + ["shell", "input", "swipe", str(x), str(y), str(x), str(y), str(duration_ms)],
-        capture_output=True,
+    run_shell(
+        ["input", "swipe", str(x), str(y), str(x), str(y), str(duration_ms)],
+        device_id,
     )
     time.sleep(delay)
 
@@ -142,18 +178,14 @@ def swipe(
     if delay is None:
         delay = TIMING_CONFIG.device.default_swipe_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
-
     if duration_ms is None:
         # Calculate duration based on distance
         dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
         duration_ms = int(dist_sq / 1000)
         duration_ms = max(1000, min(duration_ms, 2000))  # Clamp between 1000-2000ms
 
-    subprocess.run(
-        adb_prefix
-        + [
-            "shell",
+    run_shell(
+        [
             "input",
             "swipe",
             str(start_x),
@@ -162,7 +194,7 @@ def swipe(
             str(end_y),
             str(duration_ms),
         ],
-        capture_output=True,
+        device_id,
     )
     time.sleep(delay)
 
@@ -178,11 +210,7 @@ def back(device_id: str | None = None, delay: float | None = None) -> None:
     if delay is None:
         delay = TIMING_CONFIG.device.default_back_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
-
-    subprocess.run(
-        adb_prefix + ["shell", "input", "keyevent", "4"], capture_output=True
-    )
+    run_shell(["input", "keyevent", "4"], device_id)
     time.sleep(delay)
 
 
@@ -197,11 +225,7 @@ def home(device_id: str | None = None, delay: float | None = None) -> None:
     if delay is None:
         delay = TIMING_CONFIG.device.default_home_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
-
-    subprocess.run(
-        adb_prefix + ["shell", "input", "keyevent", "KEYCODE_HOME"], capture_output=True
-    )
+    run_shell(["input", "keyevent", "KEYCODE_HOME"], device_id)
     time.sleep(delay)
 
 
@@ -211,42 +235,71 @@ def launch_app(
     """
     Launch an app by name.
 
+    The launcher activity comes from the device's app cache and is started
+    directly with `am start -n`. If that fails, e.g. because an update moved
+    the activity, the entry is resolved again once before falling back to
+    `monkey`.
+
     Args:
-        app_name: The app name (must be in APP_PACKAGES).
+        app_name: The app name (must be in APP_PACKAGES), or the package
+            name of any installed app.
         device_id: Optional ADB device ID.
         delay: Delay in seconds after launching. If None, uses configured default.
 
     Returns:
-        True if app was launched, False if app not found.
+        True if app was launched, False if app not found or not installed.
     """
     if delay is None:
         delay = TIMING_CONFIG.device.default_launch_delay
 
-    if app_name not in APP_PACKAGES:
-        return False
+    package = ANDROID_APPS.get_package(app_name)
+    if package is None:
+        if "." not in app_name:
+            return False
+        package = app_name
+
+    cache = get_app_cache(device_id)
+    if not cache.is_installed(package):
+        # Re-list once in case the app was installed since the cache was built
+        cache.invalidate(package)
+        if not cache.is_installed(package):
+            return False
+
+    if not _start_activity(cache.get_launch_component(package), device_id):
+        cache.invalidate(package)
+        if not _start_activity(cache.get_launch_component(package), device_id):
+            run_shell(
+                [
+                    "monkey",
+                    "-p",
+                    package,
+                    "-c",
+                    "android.intent.category.LAUNCHER",
+                    "1",
+                ],
+                device_id,
+            )
+    time.sleep(delay)
+    return True
 
-    adb_prefix = _get_adb_prefix(device_id)
-    package = APP_PACKAGES[app_name]
 
-    subprocess.run(
-        adb_prefix
-        + [
-            "shell",
-            "monkey",
-            "-p",
-            package,
+def _start_activity(component: str | None, device_id: str | None) -> bool:
+    """Start a launcher activity the way the home screen does."""
+    if component is None:
+        return False
+    result = run_shell(
+        [
+            "am",
+            "start",
+            "-a",
+            "android.intent.action.MAIN",
             "-c",
             "android.intent.category.LAUNCHER",
-            "1",
+            "-f",
+            "0x10200000",  # NEW_TASK | RESET_TASK_IF_NEEDED
+            "-n",
+            component,
         ],
-        capture_output=True,
+        device_id,
     )
-    time.sleep(delay)
-    return True
-
-
-def _get_adb_prefix(device_id: str | None) -> list:
-    """Get ADB command prefix with optional device specifier."""
-    if device_id:
-        return ["adb", "-s", device_id]
-    return ["adb"]
+    return "Error" not in result.output
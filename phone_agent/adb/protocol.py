@@ -0,0 +1,272 @@
+"""Client for the adb server's smart-socket protocol."""
+
+import os
+import socket
+import struct
+import threading
+
+# Global flag to control whether the adb server is used directly instead of the CLI
+_USE_PROTOCOL = os.getenv("PHONE_AGENT_ADB_PROTOCOL", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
+_SYNC_DATA_MAX = 64 * 1024
+
+_client: "ADBClient | None" = None
+_client_lock = threading.Lock()
+
+
+class ADBProtocolError(Exception):
+    """Raised when the adb server rejects a request or replies unexpectedly."""
+
+
+class ADBClient:
+    """
+    Talks to the adb server over TCP instead of spawning the `adb` binary.
+
+    Requests are sent as a 4-digit hex length followed by the payload, and
+    answered with OKAY or FAIL. Once a device service (shell:, exec:, sync:)
+    is opened the server dedicates the socket to it and closes it when the
+    service ends, so each call uses its own short-lived connection.
+
+    Args:
+        host: adb server host.
+        port: adb server port. Defaults to ANDROID_ADB_SERVER_PORT or 5037.
+        timeout: Socket timeout in seconds, applied to each blocking operation.
+
+    Example:
+        >>> client = ADBClient()
+        >>> client.devices()
+        >>> png = client.exec_out("screencap -p", serial="emulator-5554")
+    """
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int | None = None, timeout: float = 10
+    ):
+        self.host = host
+        self.port = port or int(os.getenv("ANDROID_ADB_SERVER_PORT", "5037"))
+        self.timeout = timeout
+
+    def devices(self) -> str:
+        """
+        List devices in the `adb devices -l` format, without the header line.
+
+        Returns:
+            One line per device with serial, state and properties.
+        """
+        return self.host_command("host:devices-l")
+
+    def host_command(self, command: str) -> str:
+        """
+        Run a host service that replies with a length-prefixed payload.
+
+        Args:
+            command: Host service, e.g. "host:devices-l" or "host:version".
+
+        Returns:
+            Decoded reply payload.
+        """
+        with self._connect(self.timeout) as sock:
+            self._send_request(sock, command)
+            length = int(self._recv_exact(sock, 4), 16)
+            return self._recv_exact(sock, length).decode("utf-8", errors="replace")
+
+    def exec_out(
+        self, command: str, serial: str | None = None, timeout: float | None = None
+    ) -> bytes:
+        """
+        Run a command without a pty and return its raw binary output.
+
+        Equivalent to `adb exec-out <command>`.
+
+        Args:
+            command: Command line to run on the device.
+            serial: Optional device serial.
+            timeout: Optional socket timeout override in seconds.
+
+        Returns:
+            Raw command output.
+        """
+        with self._open_service(f"exec:{command}", serial, timeout) as sock:
+            return self._recv_all(sock)
+
+    def shell(
+        self, command: str, serial: str | None = None, timeout: float | None = None
+    ) -> str:
+        """
+        Run a shell command and return its combined output.
+
+        Equivalent to `adb shell <command>` with the v1 shell protocol, which
+        merges stdout and stderr and does not report the exit code.
+
+        Args:
+            command: Command line to run on the device.
+            serial: Optional device serial.
+            timeout: Optional socket timeout override in seconds.
+
+        Returns:
+            Decoded command output.
+        """
+        with self._open_service(f"shell:{command}", serial, timeout) as sock:
+            return self._recv_all(sock).decode("utf-8", errors="replace")
+
+    def pull(
+        self, remote_path: str, serial: str | None = None, timeout: float | None = None
+    ) -> bytes:
+        """
+        Read a file from the device with the sync protocol.
+
+        Args:
+            remote_path: Path of the file on the device.
+            serial: Optional device serial.
+            timeout: Optional socket timeout override in seconds.
+
+        Returns:
+            File contents.
+
+        Raises:
+            ADBProtocolError: If the device cannot read the file.
+        """
+        with self._open_service("sync:", serial, timeout) as sock:
+            path = remote_path.encode("utf-8")
+            sock.sendall(b"RECV" + struct.pack("<I", len(path)) + path)
+
+            chunks = []
+            while True:
+                tag, length = struct.unpack("<4sI", self._recv_exact(sock, 8))
+                if tag == b"DATA":
+                    chunks.append(self._recv_exact(sock, length))
+                elif tag == b"DONE":
+                    break
+                elif tag == b"FAIL":
+                    message = self._recv_exact(sock, length).decode(
+                        "utf-8", errors="replace"
+                    )
+                    raise ADBProtocolError(f"pull {remote_path} failed: {message}")
+                else:
+                    raise ADBProtocolError(f"Unexpected sync reply: {tag!r}")
+
+            sock.sendall(b"QUIT" + struct.pack("<I", 0))
+            return b"".join(chunks)
+
+    def push(
+        self,
+        data: bytes,
+        remote_path: str,
+        mode: int = 0o644,
+        serial: str | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Write a file to the device with the sync protocol.
+
+        Args:
+            data: File contents.
+            remote_path: Destination path on the device.
+            mode: Unix permission bits for the new file.
+            serial: Optional device serial.
+            timeout: Optional socket timeout override in seconds.
+
+        Raises:
+            ADBProtocolError: If the device cannot write the file.
+        """
+        with self._open_service("sync:", serial, timeout) as sock:
+            spec = f"{remote_path},{0o100000 | mode}".encode("utf-8")
+            sock.sendall(b"SEND" + struct.pack("<I", len(spec)) + spec)
+
+            view = memoryview(data)
+            for offset in range(0, len(data), _SYNC_DATA_MAX):
+                chunk = view[offset : offset + _SYNC_DATA_MAX]
+                sock.sendall(b"DATA" + struct.pack("<I", len(chunk)))
+                sock.sendall(chunk)
+            sock.sendall(b"DONE" + struct.pack("<I", 0))
+
+            tag, length = struct.unpack("<4sI", self._recv_exact(sock, 8))
+            if tag != b"OKAY":
+                message = self._recv_exact(sock, length).decode(
+                    "utf-8", errors="replace"
+                )
+                raise ADBProtocolError(f"push {remote_path} failed: {message}")
+            sock.sendall(b"QUIT" + struct.pack("<I", 0))
+
+    def _open_service(
+        self, service: str, serial: str | None, timeout: float | None
+    ) -> socket.socket:
+        """Switch a new connection to the device transport and open a service."""
+        sock = self._connect(timeout if timeout is not None else self.timeout)
+        try:
+            transport = f"host:transport:{serial}" if serial else "host:transport-any"
+            self._send_request(sock, transport)
+            self._send_request(sock, service)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def _connect(self, timeout: float) -> socket.socket:
+        """Open a connection to the adb server."""
+        sock = socket.create_connection((self.host, self.port), timeout=timeout)
+        # Requests are small writes answered by small reads; don't let Nagle stall them
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _send_request(self, sock: socket.socket, request: str) -> None:
+        """Send a length-prefixed request and wait for OKAY."""
+        payload = request.encode("utf-8")
+        sock.sendall(f"{len(payload):04x}".encode("ascii") + payload)
+
+        status = self._recv_exact(sock, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            length = int(self._recv_exact(sock, 4), 16)
+            message = self._recv_exact(sock, length).decode("utf-8", errors="replace")
+            raise ADBProtocolError(f"{request}: {message}")
+        raise ADBProtocolError(f"{request}: unexpected status {status!r}")
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        """Read exactly size bytes."""
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            n = sock.recv_into(view[received:])
+            if n == 0:
+                raise ADBProtocolError("Connection closed by adb server")
+            received += n
+        return bytes(buffer)
+
+    @staticmethod
+    def _recv_all(sock: socket.socket) -> bytes:
+        """Read until the server closes the connection."""
+        chunks = []
+        while True:
+            chunk = sock.recv(256 * 1024)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+
+def get_adb_client() -> ADBClient | None:
+    """
+    Get the shared adb server client.
+
+    Returns:
+        The shared ADBClient, or None if direct protocol access is disabled.
+    """
+    global _client
+    if not _USE_PROTOCOL:
+        return None
+    with _client_lock:
+        if _client is None:
+            _client = ADBClient()
+        return _client
+
+
+def set_adb_protocol(enabled: bool) -> None:
+    """Enable or disable talking to the adb server directly, globally."""
+    global _USE_PROTOCOL
+    _USE_PROTOCOL = enabled
@@ -2,15 +2,58 @@
 
 import base64
 import os
+import struct
 import subprocess
 import tempfile
+import time
 import uuid
-from dataclasses import dataclass
-from io import BytesIO
-from typing import Tuple
+from dataclasses import dataclass, field
+from enum import Enum
 
 from PIL import Image
 
+from phone_agent.adb.protocol import ADBProtocolError, get_adb_client
+from phone_agent.adb.shell import run_shell
+from phone_agent.imaging import (
+    PNG_SIGNATURE,
+    ScreenshotEncodingConfig,
+    create_blank_image,
+    encode_image,
+    prepare_image,
+)
+
+# screencap raw pixel formats: format id -> (PIL mode, PIL rawmode, bytes per pixel)
+RAW_PIXEL_FORMATS = {
+    1: ("RGBA", "RGBA", 4),  # RGBA_8888
+    2: ("RGBX", "RGBX", 4),  # RGBX_8888
+    3: ("RGB", "RGB", 3),  # RGB_888
+    4: ("RGB", "BGR;16", 2),  # RGB_565
+    5: ("RGBA", "BGRA", 4),  # BGRA_8888
+}
+
+# Header is width, height, format; Android 9+ appends a dataspace field
+RAW_HEADER_SIZES = (12, 16)
+
+
+class CaptureMode(Enum):
+    """How the screenshot is transferred from the device."""
+
+    EXEC_OUT = "exec-out"  # Stream PNG bytes from `adb exec-out screencap -p`
+    PULL = "pull"  # Write to /sdcard on the device, then `adb pull` it
+    RAW = "raw"  # Stream the uncompressed framebuffer and encode on the host
+
+
+# Global capture mode, can be overridden with PHONE_AGENT_ADB_CAPTURE_MODE
+_CAPTURE_MODE = CaptureMode(
+    os.getenv("PHONE_AGENT_ADB_CAPTURE_MODE", CaptureMode.EXEC_OUT.value).lower()
+)
+
+
+def set_capture_mode(mode: CaptureMode | str) -> None:
+    """Set the ADB screenshot capture mode globally."""
+    global _CAPTURE_MODE
+    _CAPTURE_MODE = CaptureMode(mode)
+
 
 @dataclass
 class Screenshot:
@@ -20,15 +63,25 @@ class Screenshot:
     width: int
     height: int
     is_sensitive: bool = False
+    timings: dict[str, float] = field(default_factory=dict)  # Per-phase, seconds
+    mime_type: str = "image/png"
 
 
-def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screenshot:
+def get_screenshot(
+    device_id: str | None = None,
+    timeout: int = 10,
+    mode: CaptureMode | str | None = None,
+    encoding: ScreenshotEncodingConfig | None = None,
+) -> Screenshot:
     """
     Capture a screenshot from the connected Android device.
 
     Args:
         device_id: Optional ADB device ID for multi-device setups.
         timeout: Timeout in seconds for screenshot operations.
+        mode: Capture mode. If None, uses the globally configured mode.
+        encoding: Encoding of the image sent to the model. If None, captures
+            are passed through as-is (raw mode uses ScreenshotEncodingConfig()).
 
     Returns:
         Screenshot object containing base64 data and dimensions.
@@ -37,52 +90,231 @@ def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screensho
         If the screenshot fails (e.g., on sensitive screens like payment pages),
         a black fallback image is returned with is_sensitive=True.
     """
+    mode = CaptureMode(mode) if mode is not None else _CAPTURE_MODE
+    start = time.perf_counter()
+
+    try:
+        if mode == CaptureMode.RAW:
+            screenshot = _capture_raw(
+                device_id, timeout, encoding or ScreenshotEncodingConfig()
+            )
+        elif mode == CaptureMode.PULL:
+            screenshot = _capture_pull(device_id, timeout, encoding)
+        else:
+            screenshot = _capture_exec_out(device_id, timeout, encoding)
+    except Exception as e:
+        print(f"Screenshot error: {e}")
+        screenshot = _create_fallback_screenshot(is_sensitive=False)
+
+    screenshot.timings["total"] = time.perf_counter() - start
+    return screenshot
+
+
+def get_frame_signature(device_id: str | None = None, timeout: int = 5) -> str | None:
+    """
+    Get a cheap signature of the current frame for change detection.
+
+    The raw framebuffer is hashed on the device, so only the digest is
+    transferred.
+
+    Args:
+        device_id: Optional ADB device ID.
+        timeout: Timeout in seconds.
+
+    Returns:
+        Hex digest of the frame, or None if it could not be computed.
+    """
+    output = run_shell("screencap | md5sum", device_id, timeout).output.split()
+    if output and len(output[0]) == 32:
+        return output[0]
+    return None
+
+
+def _capture_exec_out(
+    device_id: str | None, timeout: int, encoding: ScreenshotEncodingConfig | None
+) -> Screenshot:
+    """Read the PNG straight from screencap stdout, without temp files."""
+    timings = {}
+
+    start = time.perf_counter()
+    data, errors = _exec_out(device_id, "screencap -p", timeout)
+    timings["capture"] = time.perf_counter() - start
+
+    if not data.startswith(PNG_SIGNATURE):
+        # exec-out has no separate stderr channel, so errors may land in stdout
+        output = (data[:512] + errors).decode("utf-8", errors="replace")
+        is_sensitive = "Status: -1" in output or "Failed" in output
+        return _create_fallback_screenshot(is_sensitive=is_sensitive)
+
+    return _build_screenshot(data, timings, encoding)
+
+
+def _capture_raw(
+    device_id: str | None, timeout: int, encoding: ScreenshotEncodingConfig
+) -> Screenshot:
+    """
+    Stream the raw framebuffer and encode it once on the host.
+
+    This skips the PNG compression on the phone CPU, which dominates
+    `screencap -p` latency on most devices.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    data, errors = _exec_out(device_id, "screencap", timeout)
+    timings["capture"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    img = _wrap_raw_frame(data)
+    if img is None:
+        output = (data[:512] + errors).decode("utf-8", errors="replace")
+        is_sensitive = "Status: -1" in output or "Failed" in output
+        return _create_fallback_screenshot(is_sensitive=is_sensitive)
+    timings["decode"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    encoded = encode_image(img, encoding)
+    base64_data = base64.b64encode(encoded).decode("utf-8")
+    timings["encode"] = time.perf_counter() - start
+
+    return Screenshot(
+        base64_data=base64_data,
+        width=img.width,
+        height=img.height,
+        is_sensitive=False,
+        timings=timings,
+        mime_type=encoding.mime_type,
+    )
+
+
+def _exec_out(device_id: str | None, command: str, timeout: int) -> tuple[bytes, bytes]:
+    """
+    Run a binary-output command on the device.
+
+    Uses the adb server directly when available, otherwise `adb exec-out`.
+
+    Returns:
+        Tuple of (stdout, stderr). stderr is empty over the adb server.
+    """
+    client = get_adb_client()
+    if client is not None:
+        try:
+            return client.exec_out(command, serial=device_id, timeout=timeout), b""
+        except (ConnectionRefusedError, ADBProtocolError):
+            pass
+
+    result = subprocess.run(
+        _get_adb_prefix(device_id) + ["exec-out", *command.split()],
+        capture_output=True,
+        timeout=timeout,
+    )
+    return result.stdout, result.stderr
+
+
+def _wrap_raw_frame(data: bytes) -> Image.Image | None:
+    """
+    Wrap raw screencap output in a PIL image without copying the pixels.
+
+    Args:
+        data: Raw `screencap` output (header followed by pixel data).
+
+    Returns:
+        Image backed by the input buffer, or None if the data is not a frame.
+    """
+    if len(data) < RAW_HEADER_SIZES[0]:
+        return None
+
+    width, height, pixel_format = struct.unpack_from("<III", data)
+    if pixel_format not in RAW_PIXEL_FORMATS or width == 0 or height == 0:
+        return None
+
+    mode, rawmode, bytes_per_pixel = RAW_PIXEL_FORMATS[pixel_format]
+    header_size = len(data) - width * height * bytes_per_pixel
+    if header_size not in RAW_HEADER_SIZES:
+        return None
+
+    pixels = memoryview(data)[header_size:]
+    return Image.frombuffer(mode, (width, height), pixels, "raw", rawmode, 0, 1)
+
+
+def _capture_pull(
+    device_id: str | None, timeout: int, encoding: ScreenshotEncodingConfig | None
+) -> Screenshot:
+    """Capture to device storage, then pull the file to a local temp path."""
+    timings = {}
+
+    # Execute screenshot command
+    start = time.perf_counter()
+    result = run_shell(["screencap", "-p", "/sdcard/tmp.png"], device_id, timeout)
+    timings["capture"] = time.perf_counter() - start
+
+    # Check for screenshot failure (sensitive screen)
+    if "Status: -1" in result.output or "Failed" in result.output:
+        return _create_fallback_screenshot(is_sensitive=True)
+
+    start = time.perf_counter()
+    data = _pull_file(device_id, "/sdcard/tmp.png")
+    timings["transfer"] = time.perf_counter() - start
+
+    if data is None:
+        return _create_fallback_screenshot(is_sensitive=False)
+
+    return _build_screenshot(data, timings, encoding)
+
+
+def _pull_file(device_id: str | None, remote_path: str) -> bytes | None:
+    """
+    Read a file from the device.
+
+    Uses the adb server's sync service when available, otherwise `adb pull`
+    to a local temp path.
+
+    Returns:
+        File contents, or None if the file could not be pulled.
+    """
+    client = get_adb_client()
+    if client is not None:
+        try:
+            return client.pull(remote_path, serial=device_id, timeout=5)
+        except (ConnectionRefusedError, ADBProtocolError):
+            pass
+
     temp_path = os.path.join(tempfile.gettempdir(), f"screenshot_{uuid.uuid4()}.png")
-    adb_prefix = _get_adb_prefix(device_id)
+    subprocess.run(
+        _get_adb_prefix(device_id) + ["pull", remote_path, temp_path],
+        capture_output=True,
+        text=True,
+        timeout=5,
+    )
+
+    if not os.path.exists(temp_path):
+        return None
 
     try:
-        # Execute screenshot command
-        result = subprocess.run(
-            adb_prefix + ["shell", "screencap", "-p", "/sdcard/tmp.png"],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-
-        # Check for screenshot failure (sensitive screen)
-        output = result.stdout + result.stderr
-        if "Status: -1" in output or "Failed" in output:
-            return _create_fallback_screenshot(is_sensitive=True)
-
-        # Pull screenshot to local temp path
-        subprocess.run(
-            adb_prefix + ["pull", "/sdcard/tmp.png", temp_path],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-
-        if not os.path.exists(temp_path):
-            return _create_fallback_screenshot(is_sensitive=False)
-
-        # Read and encode image
-        img = Image.open(temp_path)
-        width, height = img.size
-
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
-
-        # Cleanup
+        with open(temp_path, "rb") as f:
+            return f.read()
+    finally:
         os.remove(temp_path)
 
-        return Screenshot(
-            base64_data=base64_data, width=width, height=height, is_sensitive=False
-        )
 
-    except Exception as e:
-        print(f"Screenshot error: {e}")
-        return _create_fallback_screenshot(is_sensitive=False)
+def _build_screenshot(
+    data: bytes,
+    timings: dict[str, float],
+    encoding: ScreenshotEncodingConfig | None,
+) -> Screenshot:
+    """Pass the captured PNG through, or transcode it if the encoding differs."""
+    start = time.perf_counter()
+    image = prepare_image(data, encoding)
+    timings["encode"] = time.perf_counter() - start
+
+    return Screenshot(
+        base64_data=image.base64_data,
+        width=image.width,
+        height=image.height,
+        is_sensitive=False,
+        timings=timings,
+        mime_type=image.mime_type,
+    )
 
 
 def _get_adb_prefix(device_id: str | None) -> list:
@@ -94,16 +326,12 @@ def _get_adb_prefix(device_id: str | None) -> list:
 
 def _create_fallback_screenshot(is_sensitive: bool) -> Screenshot:
     """Create a black fallback image when screenshot fails."""
-    default_width, default_height = 1080, 2400
-
-    black_img = Image.new("RGB", (default_width, default_height), color="black")
-    buffered = BytesIO()
-    black_img.save(buffered, format="PNG")
-    base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
+    image = create_blank_image(1080, 2400)
 
     return Screenshot(
-        base64_data=base64_data,
-        width=default_width,
-        height=default_height,
+        base64_data=image.base64_data,
+        width=image.width,
+        height=image.height,
         is_sensitive=is_sensitive,
+        mime_type=image.mime_type,
     )
@@ -0,0 +1,283 @@
+"""Persistent ADB shell sessions for low-latency command execution."""
+
+import atexit
+import os
+import queue
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from phone_agent.adb.protocol import ADBProtocolError, get_adb_client
+
+# Global flag to control whether commands share a long-lived shell per device
+_PERSISTENT_SHELL = os.getenv("PHONE_AGENT_ADB_PERSISTENT_SHELL", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
+# Printed with the exit code after commands sent to the adb server
+_EXIT_MARKER = "__PHONE_AGENT_EXIT__"
+
+_sessions: dict[str | None, "ADBShellSession"] = {}
+_sessions_lock = threading.Lock()
+
+
+@dataclass
+class ShellResult:
+    """Result of a shell command."""
+
+    output: str  # Combined stdout and stderr
+    exit_code: int
+
+
+class ADBShellSession:
+    """
+    A long-lived `adb shell` process that commands are multiplexed over.
+
+    Each command is followed by a unique sentinel line carrying its exit
+    code, which delimits the command output on the shared stream. Commands
+    run one at a time; the session restarts itself if the shell dies.
+
+    Args:
+        device_id: Optional ADB device ID.
+        adb_path: Path to ADB executable.
+
+    Example:
+        >>> session = ADBShellSession("emulator-5554")
+        >>> session.run(["input", "tap", "100", "200"])
+        >>> session.run("dumpsys window | grep mCurrentFocus").output
+    """
+
+    def __init__(self, device_id: str | None = None, adb_path: str = "adb"):
+        self.device_id = device_id
+        self.adb_path = adb_path
+        self._process: subprocess.Popen | None = None
+        self._lines: queue.Queue[bytes | None] = queue.Queue()
+        self._lock = threading.Lock()
+
+    def run(self, command: str | list[str], timeout: float = 10.0) -> ShellResult:
+        """
+        Run a command in the session.
+
+        Args:
+            command: Shell command string, or an argument list to be quoted.
+            timeout: Timeout in seconds for this command.
+
+        Returns:
+            ShellResult with the command output and exit code.
+
+        Raises:
+            subprocess.TimeoutExpired: If the command does not finish in time.
+            ConnectionError: If the shell cannot be (re)started.
+        """
+        if isinstance(command, list):
+            command = shlex.join(command)
+
+        with self._lock:
+            for attempt in range(2):
+                self._ensure_started()
+                result = self._run_locked(command, timeout)
+                if result is not None:
+                    return result
+                # Shell exited underneath us, reconnect and retry once
+                self._close_locked()
+
+        raise ConnectionError(
+            f"ADB shell session lost for {self.device_id or 'device'}"
+        )
+
+    def close(self) -> None:
+        """Terminate the shell process."""
+        with self._lock:
+            self._close_locked()
+
+    def _ensure_started(self) -> None:
+        """Start the shell process if it is not running."""
+        if self._process is not None and self._process.poll() is None:
+            return
+
+        cmd = [self.adb_path]
+        if self.device_id:
+            cmd.extend(["-s", self.device_id])
+        cmd.append("shell")
+
+        self._lines = queue.Queue()
+        self._process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        threading.Thread(
+            target=self._read_output,
+            args=(self._process, self._lines),
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _read_output(process: subprocess.Popen, lines: queue.Queue) -> None:
+        """Forward output lines to the queue; None marks end of stream."""
+        for line in iter(process.stdout.readline, b""):
+            lines.put(line)
+        lines.put(None)
+
+    def _run_locked(self, command: str, timeout: float) -> ShellResult | None:
+        """Send one command and collect its output up to the sentinel."""
+        sentinel = f"__PHONE_AGENT_{uuid.uuid4().hex}__"
+        # Subshell with stdin detached, so commands cannot consume the session
+        script = f"( {command} ) </dev/null 2>&1; printf '\\n{sentinel}%d\\n' $?\n"
+
+        try:
+            self._process.stdin.write(script.encode("utf-8"))
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return None
+
+        deadline = time.monotonic() + timeout
+        chunks = []
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = self._lines.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                # The stream cannot be resynchronized, start over next time
+                self._close_locked()
+                raise subprocess.TimeoutExpired(command, timeout)
+
+            if line is None:
+                return None
+
+            text = line.decode("utf-8", errors="replace")
+            if text.startswith(sentinel):
+                output = "".join(chunks)
+                # Drop the newline printed in front of the sentinel
+                if output.endswith("\n"):
+                    output = output[:-1]
+                return ShellResult(output=output, exit_code=int(text[len(sentinel) :]))
+            chunks.append(text)
+
+    def _close_locked(self) -> None:
+        """Terminate the shell process without taking the lock."""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._process.terminate()
+            self._process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+        self._process = None
+
+
+def get_shell_session(device_id: str | None = None) -> ADBShellSession:
+    """
+    Get the shared shell session for a device, creating it on first use.
+
+    Args:
+        device_id: Optional ADB device ID.
+
+    Returns:
+        The device's ADBShellSession.
+    """
+    with _sessions_lock:
+        session = _sessions.get(device_id)
+        if session is None:
+            session = ADBShellSession(device_id)
+            _sessions[device_id] = session
+        return session
+
+
+def close_all_sessions() -> None:
+    """Close every shared shell session."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def set_persistent_shell(enabled: bool) -> None:
+    """Enable or disable the shared shell sessions globally."""
+    global _PERSISTENT_SHELL
+    _PERSISTENT_SHELL = enabled
+    if not enabled:
+        close_all_sessions()
+
+
+def run_shell(
+    command: str | list[str], device_id: str | None = None, timeout: float = 10.0
+) -> ShellResult:
+    """
+    Run a shell command on the device.
+
+    Uses the device's persistent session when enabled. Otherwise, or if the
+    session cannot be established, the command is sent to the adb server's
+    shell service, falling back to a one-off `adb shell`.
+
+    Args:
+        command: Shell command string, or an argument list to be quoted.
+        device_id: Optional ADB device ID.
+        timeout: Timeout in seconds.
+
+    Returns:
+        ShellResult with the command output and exit code.
+    """
+    if _PERSISTENT_SHELL:
+        try:
+            return get_shell_session(device_id).run(command, timeout=timeout)
+        except ConnectionError:
+            pass
+
+    if isinstance(command, list):
+        command = shlex.join(command)
+
+    client = get_adb_client()
+    if client is not None:
+        try:
+            # The v1 shell service does not report the exit code, so the
+            # command prints it after its output
+            output = client.shell(
+                f"( {command} ) 2>&1; printf '\\n{_EXIT_MARKER}%d' $?",
+                serial=device_id,
+                timeout=timeout,
+            )
+            return _split_exit_code(output)
+        except (ConnectionRefusedError, ADBProtocolError):
+            pass
+
+    adb_prefix = ["adb", "-s", device_id] if device_id else ["adb"]
+    result = subprocess.run(
+        adb_prefix + ["shell", command],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        timeout=timeout,
+    )
+    return ShellResult(
+        output=result.stdout + result.stderr, exit_code=result.returncode
+    )
+
+
+def _split_exit_code(output: str) -> ShellResult:
+    """Separate the exit code printed after a command from its output."""
+    output, marker, code = output.rpartition(_EXIT_MARKER)
+    if not marker or not code.strip().isdigit():
+        # Cut off before the command finished
+        return ShellResult(output=output or code, exit_code=-1)
+    # Drop the newline printed in front of the marker
+    if output.endswith("\n"):
+        output = output[:-1]
+    if output.endswith("\r"):
+        output = output[:-1]
+    return ShellResult(output=output, exit_code=int(code))
+
+
+atexit.register(close_all_sessions)
@@ -1,16 +1,22 @@
 """Main PhoneAgent class for orchestrating phone automation."""
 
-import json
-import traceback
+import time
 from dataclasses import dataclass
-from typing import Any, Callable
+from functools import partial
+from typing import Callable
 
 from phone_agent.actions import ActionHandler
-from phone_agent.actions.handler import do, finish, parse_action
-from phone_agent.config import get_messages, get_system_prompt
-from phone_agent.device_factory import get_device_factory
+from phone_agent.actions.handler import do, finish
+from phone_agent.agent_base import AgentBase, StepResult
+from phone_agent.config import get_system_prompt
+from phone_agent.config.timing import TimingConfig
+from phone_agent.device_factory import DeviceFactory
+from phone_agent.events import TimingSink, get_timing_sink, observation_timings
+from phone_agent.history import HistoryPolicy, get_default_history_policy
 from phone_agent.model import ModelClient, ModelConfig
-from phone_agent.model.client import MessageBuilder
+from phone_agent.observation import observe
+from phone_agent.observer import AgentObserver
+from phone_agent.recorder import TrajectoryRecorder
 
 
 @dataclass
@@ -22,24 +28,23 @@ class AgentConfig:
     lang: str = "cn"
     system_prompt: str | None = None
     verbose: bool = True
+    # Which part of the conversation is sent each step; None reads the env
+    history_policy: HistoryPolicy | None = None
+    # Receives a timing record per step; None uses the global sink
+    timing_sink: TimingSink | None = None
+    # Post-action delays and settle settings; None uses the global TIMING_CONFIG
+    timing: TimingConfig | None = None
 
     def __post_init__(self):
         if self.system_prompt is None:
             self.system_prompt = get_system_prompt(self.lang)
+        if self.history_policy is None:
+            self.history_policy = get_default_history_policy()
+        if self.timing_sink is None:
+            self.timing_sink = get_timing_sink()
 
 
-@dataclass
-class StepResult:
-    """Result of a single agent step."""
-
-    success: bool
-    finished: bool
-    action: dict[str, Any] | None
-    thinking: str
-    message: str | None = None
-
-
-class PhoneAgent:
+class PhoneAgent(AgentBase):
     """
     AI-powered agent for automating Android phone interactions.
 
@@ -51,6 +56,12 @@ class PhoneAgent:
         agent_config: Configuration for the agent behavior.
         confirmation_callback: Optional callback for sensitive action confirmation.
         takeover_callback: Optional callback for takeover requests.
+        device_factory: Optional device factory. If None, uses the global one.
+        model_client: Optional model client. If None, one is created from model_config.
+        recorder: Optional trajectory recorder that every step is written to.
+        observer: Optional observer for progress output. If None, a
+            ConsoleObserver is used when verbose is set and nothing is shown
+            otherwise.
 
     Example:
         >>> from phone_agent import PhoneAgent
@@ -67,19 +78,24 @@ class PhoneAgent:
         agent_config: AgentConfig | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        device_factory: DeviceFactory | None = None,
+        model_client: ModelClient | None = None,
+        recorder: TrajectoryRecorder | None = None,
+        observer: AgentObserver | None = None,
     ):
         self.model_config = model_config or ModelConfig()
         self.agent_config = agent_config or AgentConfig()
 
-        self.model_client = ModelClient(self.model_config)
+        self.model_client = model_client or ModelClient(self.model_config)
         self.action_handler = ActionHandler(
             device_id=self.agent_config.device_id,
             confirmation_callback=confirmation_callback,
             takeover_callback=takeover_callback,
+            device_factory=device_factory,
+            timing=self.agent_config.timing,
         )
 
-        self._context: list[dict[str, Any]] = []
-        self._step_count = 0
+        self._init_state(recorder, observer)
 
     def run(self, task: str) -> str:
         """
@@ -128,126 +144,60 @@ class PhoneAgent:
 
         return self._execute_step(task, is_first)
 
-    def reset(self) -> None:
-        """Reset the agent state for a new task."""
-        self._context = []
-        self._step_count = 0
-
     def _execute_step(
         self, user_prompt: str | None = None, is_first: bool = False
     ) -> StepResult:
         """Execute a single step of the agent loop."""
-        self._step_count += 1
+        step_start = self._begin_step(is_first)
 
         # Capture current screen state
-        device_factory = get_device_factory()
-        screenshot = device_factory.get_screenshot(self.agent_config.device_id)
-        current_app = device_factory.get_current_app(self.agent_config.device_id)
-
-        # Build messages
-        if is_first:
-            self._context.append(
-                MessageBuilder.create_system_message(self.agent_config.system_prompt)
-            )
-
-            screen_info = MessageBuilder.build_screen_info(current_app)
-            text_content = f"{user_prompt}\n\n{screen_info}"
-
-            self._context.append(
-                MessageBuilder.create_user_message(
-                    text=text_content, image_base64=screenshot.base64_data
-                )
-            )
-        else:
-            screen_info = MessageBuilder.build_screen_info(current_app)
-            text_content = f"** Screen Info **\n\n{screen_info}"
-
-            self._context.append(
-                MessageBuilder.create_user_message(
-                    text=text_content, image_base64=screenshot.base64_data
-                )
-            )
+        device_factory = self.action_handler.device_factory
+        observation = observe(
+            partial(
+                device_factory.get_screenshot,
+                self.agent_config.device_id,
+                encoding=self.model_config.screenshot_encoding,
+            ),
+            partial(device_factory.get_current_app, self.agent_config.device_id),
+        )
+        screenshot = observation.screenshot
+        timings = observation_timings(observation)
 
         # Get model response
         try:
-            msgs = get_messages(self.agent_config.lang)
-            print("\n" + "=" * 50)
-            print(f"💭 {msgs['thinking']}:")
-            print("-" * 50)
-            response = self.model_client.request(self._context)
-        except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
-            return StepResult(
-                success=False,
-                finished=True,
-                action=None,
-                thinking="",
-                message=f"Model error: {e}",
+            messages, tokens_saved = self._build_request(
+                user_prompt, is_first, observation, timings
+            )
+            response = self.model_client.request(
+                messages,
+                device_id=self.agent_config.device_id,
+                observer=self.observer,
             )
+        except Exception as e:
+            return self._model_error(e, user_prompt, observation, timings, step_start)
 
-        # Parse action from response
-        try:
-            action = parse_action(response.action)
-        except ValueError:
-            if self.agent_config.verbose:
-                traceback.print_exc()
-            action = finish(message=response.action)
-
-        if self.agent_config.verbose:
-            # Print thinking process
-            print("-" * 50)
-            print(f"🎯 {msgs['action']}:")
-            print(json.dumps(action, ensure_ascii=False, indent=2))
-            print("=" * 50 + "\n")
-
-        # Remove image from context to save space
-        self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
+        action = self._parse_response(response, timings)
 
         # Execute action
+        action_start = time.perf_counter()
         try:
             result = self.action_handler.execute(
                 action, screenshot.width, screenshot.height
             )
         except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
+            self.observer.on_error(e)
             result = self.action_handler.execute(
                 finish(message=str(e)), screenshot.width, screenshot.height
             )
 
-        # Add assistant response to context
-        self._context.append(
-            MessageBuilder.create_assistant_message(
-                f"<think>{response.thinking}</think><answer>{response.action}</answer>"
-            )
-        )
-
-        # Check if finished
-        finished = action.get("_metadata") == "finish" or result.should_finish
-
-        if finished and self.agent_config.verbose:
-            msgs = get_messages(self.agent_config.lang)
-            print("\n" + "🎉 " + "=" * 48)
-            print(
-                f"✅ {msgs['task_completed']}: {result.message or action.get('message', msgs['done'])}"
-            )
-            print("=" * 50 + "\n")
-
-        return StepResult(
-            success=result.success,
-            finished=finished,
-            action=action,
-            thinking=response.thinking,
-            message=result.message or action.get("message"),
+        return self._complete_step(
+            user_prompt,
+            observation,
+            response,
+            action,
+            result,
+            tokens_saved,
+            timings,
+            step_start,
+            action_start,
         )
-
-    @property
-    def context(self) -> list[dict[str, Any]]:
-        """Get the current conversation context."""
-        return self._context.copy()
-
-    @property
-    def step_count(self) -> int:
-        """Get the current step count."""
-        return self._step_count
@@ -0,0 +1,213 @@
+"""Asyncio PhoneAgent for driving many devices from one event loop."""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from phone_agent.actions import ActionHandler
+from phone_agent.actions.handler import finish
+from phone_agent.agent import AgentConfig
+from phone_agent.agent_base import AgentBase, StepResult
+from phone_agent.device_factory import DeviceFactory
+from phone_agent.events import observation_timings
+from phone_agent.model import AsyncModelClient, ModelConfig
+from phone_agent.observation import observe_async
+from phone_agent.observer import AgentObserver
+from phone_agent.recorder import TrajectoryRecorder
+
+# Blocking device calls (captures, input, post-action delays) run here, so a
+# slow device never stalls the event loop
+_DEVICE_WORKERS = int(os.getenv("PHONE_AGENT_ASYNC_DEVICE_WORKERS", "64"))
+
+_device_executor: ThreadPoolExecutor | None = None
+_device_executor_lock = threading.Lock()
+
+
+class AsyncPhoneAgent(AgentBase):
+    """
+    Asyncio counterpart of PhoneAgent with the same step semantics.
+
+    Model requests stream through AsyncModelClient; device I/O runs on a
+    shared thread pool. Concurrent model requests are bounded by the
+    client's ModelScheduler, the process-wide one unless the client was
+    given its own.
+
+    Args:
+        model_config: Configuration for the AI model.
+        agent_config: Configuration for the agent behavior.
+        confirmation_callback: Optional callback for sensitive action confirmation.
+        takeover_callback: Optional callback for takeover requests.
+        device_factory: Optional device factory. If None, uses the global one.
+        model_client: Optional client to share between agents.
+        recorder: Optional trajectory recorder that every step is written to.
+            Recording does not block the event loop.
+        observer: Optional observer for progress output. If None, a
+            ConsoleObserver is used when verbose is set and nothing is shown
+            otherwise.
+
+    Example:
+        >>> model_config = ModelConfig(base_url="http://localhost:8000/v1")
+        >>> client = AsyncModelClient(
+        ...     model_config, scheduler=ModelScheduler(max_in_flight=8)
+        ... )
+        >>> agents = [
+        ...     AsyncPhoneAgent(
+        ...         model_config,
+        ...         AgentConfig(device_id=serial),
+        ...         model_client=client,
+        ...     )
+        ...     for serial in serials
+        ... ]
+        >>> await asyncio.gather(*(agent.run("Open Settings") for agent in agents))
+    """
+
+    def __init__(
+        self,
+        model_config: ModelConfig | None = None,
+        agent_config: AgentConfig | None = None,
+        confirmation_callback: Callable[[str], bool] | None = None,
+        takeover_callback: Callable[[str], None] | None = None,
+        device_factory: DeviceFactory | None = None,
+        model_client: AsyncModelClient | None = None,
+        recorder: TrajectoryRecorder | None = None,
+        observer: AgentObserver | None = None,
+    ):
+        self.model_config = model_config or ModelConfig()
+        self.agent_config = agent_config or AgentConfig()
+
+        self.model_client = model_client or AsyncModelClient(self.model_config)
+        self.action_handler = ActionHandler(
+            device_id=self.agent_config.device_id,
+            confirmation_callback=confirmation_callback,
+            takeover_callback=takeover_callback,
+            device_factory=device_factory,
+            timing=self.agent_config.timing,
+        )
+
+        self._init_state(recorder, observer)
+
+    async def run(self, task: str) -> str:
+        """
+        Run the agent to complete a task.
+
+        Args:
+            task: Natural language description of the task.
+
+        Returns:
+            Final message from the agent.
+        """
+        self._context = []
+        self._step_count = 0
+
+        # First step with user prompt
+        result = await self._execute_step(task, is_first=True)
+
+        if result.finished:
+            return result.message or "Task completed"
+
+        # Continue until finished or max steps reached
+        while self._step_count < self.agent_config.max_steps:
+            result = await self._execute_step(is_first=False)
+
+            if result.finished:
+                return result.message or "Task completed"
+
+        return "Max steps reached"
+
+    async def step(self, task: str | None = None) -> StepResult:
+        """
+        Execute a single step of the agent.
+
+        Args:
+            task: Task description (only needed for first step).
+
+        Returns:
+            StepResult with step details.
+        """
+        is_first = len(self._context) == 0
+
+        if is_first and not task:
+            raise ValueError("Task is required for the first step")
+
+        return await self._execute_step(task, is_first)
+
+    async def _execute_step(
+        self, user_prompt: str | None = None, is_first: bool = False
+    ) -> StepResult:
+        """Execute a single step of the agent loop."""
+        step_start = self._begin_step(is_first)
+
+        # Capture current screen state
+        device_factory = self.action_handler.device_factory
+        observation = await observe_async(
+            partial(
+                device_factory.get_screenshot,
+                self.agent_config.device_id,
+                encoding=self.model_config.screenshot_encoding,
+            ),
+            partial(device_factory.get_current_app, self.agent_config.device_id),
+            executor=_get_device_executor(),
+        )
+        screenshot = observation.screenshot
+        timings = observation_timings(observation)
+
+        # Get model response
+        try:
+            messages, tokens_saved = self._build_request(
+                user_prompt, is_first, observation, timings
+            )
+            response = await self.model_client.request(
+                messages, device_id=self.agent_config.device_id, observer=self.observer
+            )
+        except Exception as e:
+            return self._model_error(e, user_prompt, observation, timings, step_start)
+
+        action = self._parse_response(response, timings)
+
+        # Execute action
+        action_start = time.perf_counter()
+        try:
+            result = await self._run_blocking(
+                self.action_handler.execute, action, screenshot.width, screenshot.height
+            )
+        except Exception as e:
+            self.observer.on_error(e)
+            result = await self._run_blocking(
+                self.action_handler.execute,
+                finish(message=str(e)),
+                screenshot.width,
+                screenshot.height,
+            )
+
+        return self._complete_step(
+            user_prompt,
+            observation,
+            response,
+            action,
+            result,
+            tokens_saved,
+            timings,
+            step_start,
+            action_start,
+        )
+
+    @staticmethod
+    async def _run_blocking(func: Callable, *args) -> Any:
+        """Run a blocking device call on the device thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_device_executor(), func, *args)
+
+
+def _get_device_executor() -> ThreadPoolExecutor:
+    """Get the shared device I/O thread pool, creating it on first use."""
+    global _device_executor
+    with _device_executor_lock:
+        if _device_executor is None:
+            _device_executor = ThreadPoolExecutor(
+                max_workers=_DEVICE_WORKERS, thread_name_prefix="device-io"
+            )
+        return _device_executor
@@ -0,0 +1,281 @@
+"""Step bookkeeping shared by the Android, iOS and asyncio agents.
+
+The agents differ in how they reach the device and the model (sync or
+async, ADB/HDC or WebDriverAgent) but not in what a step does around those
+calls: building the request, parsing the action, timing each phase and
+reporting the step to the observer, timing sink and recorder. AgentBase
+holds that part so it exists once.
+"""
+
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from phone_agent.actions.handler import finish, parse_action
+from phone_agent.events import build_step_record, model_timings
+from phone_agent.history import compact_history
+from phone_agent.imaging import get_base64_size
+from phone_agent.model.client import MessageBuilder
+from phone_agent.observation import Observation
+from phone_agent.observer import AgentObserver, ConsoleObserver
+from phone_agent.recorder import TrajectoryRecorder
+
+
+@dataclass
+class StepResult:
+    """Result of a single agent step."""
+
+    success: bool
+    finished: bool
+    action: dict[str, Any] | None
+    thinking: str
+    message: str | None = None
+    screenshot_bytes: int | None = None  # Size of the image sent to the model
+    prompt_tokens_saved: int = 0  # Estimated tokens trimmed by the history policy
+    timings: dict[str, float] = field(default_factory=dict)  # Per phase, seconds
+
+
+class AgentBase:
+    """
+    Conversation state and step phases common to every agent.
+
+    Subclasses set agent_config, action_handler, recorder and observer, then
+    run a step as: _begin_step(), observe the device, _build_request(),
+    request the model, _parse_response(), execute the action and
+    _complete_step(). Only the device and model calls are their own.
+    """
+
+    agent_config: Any
+    action_handler: Any
+    recorder: TrajectoryRecorder | None
+    observer: AgentObserver
+
+    def _init_state(
+        self, recorder: TrajectoryRecorder | None, observer: AgentObserver | None
+    ) -> None:
+        """Set up the recorder, observer and an empty conversation."""
+        self.recorder = recorder
+        if observer is None:
+            observer = (
+                ConsoleObserver(self.agent_config.lang)
+                if self.agent_config.verbose
+                else AgentObserver()
+            )
+        self.observer = observer
+
+        self._context: list[dict[str, Any]] = []
+        self._step_count = 0
+        self._episode_id = ""
+
+    def reset(self) -> None:
+        """Reset the agent state for a new task."""
+        self._context = []
+        self._step_count = 0
+
+    @property
+    def context(self) -> list[dict[str, Any]]:
+        """Get the current conversation context."""
+        return self._context.copy()
+
+    @property
+    def step_count(self) -> int:
+        """Get the current step count."""
+        return self._step_count
+
+    def _begin_step(self, is_first: bool) -> float:
+        """Count the step, start a new episode on the first one, return its start."""
+        self._step_count += 1
+        if is_first:
+            self._episode_id = uuid.uuid4().hex[:12]
+        return time.perf_counter()
+
+    def _build_request(
+        self,
+        user_prompt: str | None,
+        is_first: bool,
+        observation: Observation,
+        timings: dict[str, float],
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Add the observation to the context and select the messages to send.
+
+        Args:
+            user_prompt: Task text, used on the first step.
+            is_first: Whether this step starts the conversation.
+            observation: Screenshot and current app of this step.
+            timings: Step timings; "build_messages" is added.
+
+        Returns:
+            Messages for the model and the prompt tokens the history policy saved.
+        """
+        build_start = time.perf_counter()
+        screen_info = MessageBuilder.build_screen_info(observation.current_app)
+        if is_first:
+            self._context.append(
+                MessageBuilder.create_system_message(self.agent_config.system_prompt)
+            )
+            text_content = f"{user_prompt}\n\n{screen_info}"
+        else:
+            text_content = f"** Screen Info **\n\n{screen_info}"
+
+        self._context.append(
+            MessageBuilder.create_user_message(
+                text=text_content,
+                image_base64=observation.screenshot.base64_data,
+                mime_type=observation.screenshot.mime_type,
+            )
+        )
+
+        self.observer.on_step_start(self._step_count)
+        messages, tokens_saved = compact_history(
+            self.agent_config.history_policy, self._context
+        )
+        timings["build_messages"] = time.perf_counter() - build_start
+        return messages, tokens_saved
+
+    def _model_error(
+        self,
+        error: Exception,
+        user_prompt: str | None,
+        observation: Observation,
+        timings: dict[str, float],
+        step_start: float,
+    ) -> StepResult:
+        """End the step after a failed model request."""
+        self.observer.on_error(error)
+        timings["total"] = time.perf_counter() - step_start
+        step_result = StepResult(
+            success=False,
+            finished=True,
+            action=None,
+            thinking="",
+            message=f"Model error: {error}",
+            screenshot_bytes=get_base64_size(observation.screenshot.base64_data),
+            timings=timings,
+        )
+        self._report_step(user_prompt, observation, None, None, step_result)
+        return step_result
+
+    def _parse_response(self, response: Any, timings: dict[str, float]) -> dict:
+        """
+        Parse the model's action and drop the screenshot from the context.
+
+        Unparseable output finishes the task with the raw text as message.
+
+        Args:
+            response: ModelResponse of this step.
+            timings: Step timings; the model phases and "parse" are added.
+
+        Returns:
+            The action dictionary to execute.
+        """
+        timings.update(model_timings(response))
+
+        parse_start = time.perf_counter()
+        try:
+            action = parse_action(response.action)
+        except ValueError as e:
+            self.observer.on_error(e)
+            action = finish(message=response.action)
+        timings["parse"] = time.perf_counter() - parse_start
+
+        self.observer.on_action(action)
+
+        # Remove image from context to save space
+        self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
+        return action
+
+    def _complete_step(
+        self,
+        user_prompt: str | None,
+        observation: Observation,
+        response: Any,
+        action: dict[str, Any],
+        result: Any,
+        tokens_saved: int,
+        timings: dict[str, float],
+        step_start: float,
+        action_start: float,
+    ) -> StepResult:
+        """
+        Record the executed action and build the step's result.
+
+        Args:
+            user_prompt: Task text of the first step.
+            observation: Screenshot and current app of this step.
+            response: ModelResponse of this step.
+            action: Executed action.
+            result: ActionResult of the action handler.
+            tokens_saved: Prompt tokens the history policy saved.
+            timings: Step timings; execution phases and "total" are added.
+            step_start: perf_counter() at the start of the step.
+            action_start: perf_counter() before the action was executed.
+
+        Returns:
+            The StepResult, already reported.
+        """
+        wait_time = self.action_handler.last_wait_time
+        timings["execute"] = time.perf_counter() - action_start - wait_time
+        timings["post_action_wait"] = wait_time
+
+        # Add assistant response to context
+        self._context.append(
+            MessageBuilder.create_assistant_message(
+                f"<think>{response.thinking}</think><answer>{response.action}</answer>"
+            )
+        )
+
+        # Check if finished
+        finished = action.get("_metadata") == "finish" or result.should_finish
+
+        if finished:
+            self.observer.on_task_finished(result.message or action.get("message"))
+
+        timings["total"] = time.perf_counter() - step_start
+        step_result = StepResult(
+            success=result.success,
+            finished=finished,
+            action=action,
+            thinking=response.thinking,
+            message=result.message or action.get("message"),
+            screenshot_bytes=get_base64_size(observation.screenshot.base64_data),
+            prompt_tokens_saved=tokens_saved,
+            timings=timings,
+        )
+        self._report_step(user_prompt, observation, response, action, step_result)
+        return step_result
+
+    def _report_step(
+        self,
+        user_prompt: str | None,
+        observation: Observation,
+        response: Any,
+        action: dict[str, Any] | None,
+        step_result: StepResult,
+    ) -> None:
+        """Emit the step's timing record and queue it on the recorder, if any."""
+        self.agent_config.timing_sink.emit(
+            build_step_record(
+                device_id=self.agent_config.device_id,
+                step=self._step_count,
+                action=action,
+                success=step_result.success,
+                finished=step_result.finished,
+                timings=step_result.timings,
+            )
+        )
+        if self.recorder is None:
+            return
+        self.recorder.record_agent_step(
+            episode=self._episode_id,
+            step=self._step_count,
+            device_id=self.agent_config.device_id,
+            task=user_prompt if self._step_count == 1 else None,
+            screenshot=observation.screenshot,
+            current_app=observation.current_app,
+            response=response,
+            action=action,
+            result=step_result,
+            timings=step_result.timings,
+        )
@@ -1,15 +1,22 @@
 """iOS PhoneAgent class for orchestrating iOS phone automation."""
 
-import json
-import traceback
+import os
+import time
 from dataclasses import dataclass
-from typing import Any, Callable
+from functools import partial
+from typing import Callable
 
-from phone_agent.actions.handler import do, finish, parse_action
+from phone_agent.actions.handler import do, finish
 from phone_agent.actions.handler_ios import IOSActionHandler
-from phone_agent.config import get_messages, get_system_prompt
+from phone_agent.agent_base import AgentBase, StepResult
+from phone_agent.config import get_system_prompt
+from phone_agent.config.timing import TimingConfig
+from phone_agent.events import TimingSink, get_timing_sink, observation_timings
+from phone_agent.history import HistoryPolicy, get_default_history_policy
 from phone_agent.model import ModelClient, ModelConfig
-from phone_agent.model.client import MessageBuilder
+from phone_agent.observation import observe
+from phone_agent.observer import AgentObserver
+from phone_agent.recorder import TrajectoryRecorder
 from phone_agent.xctest import XCTestConnection, get_current_app, get_screenshot
 
 
@@ -19,29 +26,33 @@ class IOSAgentConfig:
 
     max_steps: int = 100
     wda_url: str = "http://localhost:8100"
+    # WDA MJPEG server URL (e.g. http://localhost:9100); None reads the env.
+    # When set, screenshots and settle detection use the streamed frames.
+    mjpeg_url: str | None = None
     session_id: str | None = None
     device_id: str | None = None  # iOS device UDID
     lang: str = "cn"
     system_prompt: str | None = None
     verbose: bool = True
+    # Which part of the conversation is sent each step; None reads the env
+    history_policy: HistoryPolicy | None = None
+    # Receives a timing record per step; None uses the global sink
+    timing_sink: TimingSink | None = None
+    # Post-action delays and settle settings; None uses the global TIMING_CONFIG
+    timing: TimingConfig | None = None
 
     def __post_init__(self):
+        if self.mjpeg_url is None:
+            self.mjpeg_url = os.getenv("PHONE_AGENT_WDA_MJPEG_URL") or None
         if self.system_prompt is None:
             self.system_prompt = get_system_prompt(self.lang)
+        if self.history_policy is None:
+            self.history_policy = get_default_history_policy()
+        if self.timing_sink is None:
+            self.timing_sink = get_timing_sink()
 
 
-@dataclass
-class StepResult:
-    """Result of a single agent step."""
-
-    success: bool
-    finished: bool
-    action: dict[str, Any] | None
-    thinking: str
-    message: str | None = None
-
-
-class IOSPhoneAgent:
+class IOSPhoneAgent(AgentBase):
     """
     AI-powered agent for automating iOS phone interactions.
 
@@ -53,6 +64,10 @@ class IOSPhoneAgent:
         agent_config: Configuration for the iOS agent behavior.
         confirmation_callback: Optional callback for sensitive action confirmation.
         takeover_callback: Optional callback for takeover requests.
+        recorder: Optional trajectory recorder that every step is written to.
+        observer: Optional observer for progress output. If None, a
+            ConsoleObserver is used when verbose is set and nothing is shown
+            otherwise.
 
     Example:
         >>> from phone_agent.agent_ios import IOSPhoneAgent, IOSAgentConfig
@@ -70,12 +85,16 @@ class IOSPhoneAgent:
         agent_config: IOSAgentConfig | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        recorder: TrajectoryRecorder | None = None,
+        observer: AgentObserver | None = None,
     ):
         self.model_config = model_config or ModelConfig()
         self.agent_config = agent_config or IOSAgentConfig()
 
         self.model_client = ModelClient(self.model_config)
 
+        self._init_state(recorder, observer)
+
         # Initialize WDA connection and create session if needed
         self.wda_connection = XCTestConnection(wda_url=self.agent_config.wda_url)
 
@@ -84,21 +103,21 @@ class IOSPhoneAgent:
             success, session_id = self.wda_connection.start_wda_session()
             if success and session_id != "session_started":
                 self.agent_config.session_id = session_id
-                if self.agent_config.verbose:
-                    print(f"✅ Created WDA session: {session_id}")
-            elif self.agent_config.verbose:
-                print(f"⚠️  Using default WDA session (no explicit session ID)")
+                self.observer.on_notice(f"✅ Created WDA session: {session_id}")
+            else:
+                self.observer.on_notice(
+                    "⚠️  Using default WDA session (no explicit session ID)"
+                )
 
         self.action_handler = IOSActionHandler(
             wda_url=self.agent_config.wda_url,
             session_id=self.agent_config.session_id,
             confirmation_callback=confirmation_callback,
             takeover_callback=takeover_callback,
+            mjpeg_url=self.agent_config.mjpeg_url,
+            timing=self.agent_config.timing,
         )
 
-        self._context: list[dict[str, Any]] = []
-        self._step_count = 0
-
     def run(self, task: str) -> str:
         """
         Run the agent to complete a task.
@@ -146,132 +165,66 @@ class IOSPhoneAgent:
 
         return self._execute_step(task, is_first)
 
-    def reset(self) -> None:
-        """Reset the agent state for a new task."""
-        self._context = []
-        self._step_count = 0
-
     def _execute_step(
         self, user_prompt: str | None = None, is_first: bool = False
     ) -> StepResult:
         """Execute a single step of the agent loop."""
-        self._step_count += 1
+        step_start = self._begin_step(is_first)
 
         # Capture current screen state
-        screenshot = get_screenshot(
-            wda_url=self.agent_config.wda_url,
-            session_id=self.agent_config.session_id,
-            device_id=self.agent_config.device_id,
+        observation = observe(
+            partial(
+                get_screenshot,
+                wda_url=self.agent_config.wda_url,
+                session_id=self.agent_config.session_id,
+                device_id=self.agent_config.device_id,
+                encoding=self.model_config.screenshot_encoding,
+                mjpeg_url=self.agent_config.mjpeg_url,
+            ),
+            partial(
+                get_current_app,
+                wda_url=self.agent_config.wda_url,
+                session_id=self.agent_config.session_id,
+            ),
         )
-        current_app = get_current_app(
-            wda_url=self.agent_config.wda_url, session_id=self.agent_config.session_id
-        )
-
-        # Build messages
-        if is_first:
-            self._context.append(
-                MessageBuilder.create_system_message(self.agent_config.system_prompt)
-            )
-
-            screen_info = MessageBuilder.build_screen_info(current_app)
-            text_content = f"{user_prompt}\n\n{screen_info}"
-
-            self._context.append(
-                MessageBuilder.create_user_message(
-                    text=text_content, image_base64=screenshot.base64_data
-                )
-            )
-        else:
-            screen_info = MessageBuilder.build_screen_info(current_app)
-            text_content = f"** Screen Info **\n\n{screen_info}"
-
-            self._context.append(
-                MessageBuilder.create_user_message(
-                    text=text_content, image_base64=screenshot.base64_data
-                )
-            )
+        screenshot = observation.screenshot
+        timings = observation_timings(observation)
 
         # Get model response
         try:
-            response = self.model_client.request(self._context)
-        except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
-            return StepResult(
-                success=False,
-                finished=True,
-                action=None,
-                thinking="",
-                message=f"Model error: {e}",
+            messages, tokens_saved = self._build_request(
+                user_prompt, is_first, observation, timings
             )
+            response = self.model_client.request(
+                messages,
+                device_id=self.agent_config.device_id,
+                observer=self.observer,
+            )
+        except Exception as e:
+            return self._model_error(e, user_prompt, observation, timings, step_start)
 
-        # Parse action from response
-        try:
-            action = parse_action(response.action)
-        except ValueError:
-            if self.agent_config.verbose:
-                traceback.print_exc()
-            action = finish(message=response.action)
-
-        if self.agent_config.verbose:
-            # Print thinking process
-            msgs = get_messages(self.agent_config.lang)
-            print("\n" + "=" * 50)
-            print(f"💭 {msgs['thinking']}:")
-            print("-" * 50)
-            print(response.thinking)
-            print("-" * 50)
-            print(f"🎯 {msgs['action']}:")
-            print(json.dumps(action, ensure_ascii=False, indent=2))
-            print("=" * 50 + "\n")
-
-        # Remove image from context to save space
-        self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
+        action = self._parse_response(response, timings)
 
         # Execute action
+        action_start = time.perf_counter()
         try:
             result = self.action_handler.execute(
                 action, screenshot.width, screenshot.height
             )
         except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
+            self.observer.on_error(e)
             result = self.action_handler.execute(
                 finish(message=str(e)), screenshot.width, screenshot.height
             )
 
-        # Add assistant response to context
-        self._context.append(
-            MessageBuilder.create_assistant_message(
-                f"<think>{response.thinking}</think><answer>{response.action}</answer>"
-            )
-        )
-
-        # Check if finished
-        finished = action.get("_metadata") == "finish" or result.should_finish
-
-        if finished and self.agent_config.verbose:
-            msgs = get_messages(self.agent_config.lang)
-            print("\n" + "🎉 " + "=" * 48)
-            print(
-                f"✅ {msgs['task_completed']}: {result.message or action.get('message', msgs['done'])}"
-            )
-            print("=" * 50 + "\n")
-
-        return StepResult(
-            success=result.success,
-            finished=finished,
-            action=action,
-            thinking=response.thinking,
-            message=result.message or action.get("message"),
+        return self._complete_step(
+            user_prompt,
+            observation,
+            response,
+            action,
+            result,
+            tokens_saved,
+            timings,
+            step_start,
+            action_start,
         )
-
-    @property
-    def context(self) -> list[dict[str, Any]]:
-        """Get the current conversation context."""
-        return self._context.copy()
-
-    @property
-    def step_count(self) -> int:
-        """Get the current step count."""
-        return self._step_count
@@ -1,15 +1,19 @@
 """Configuration module for Phone Agent."""
 
-from phone_agent.config.apps import APP_PACKAGES
-from phone_agent.config.apps_ios import APP_PACKAGES_IOS
+from phone_agent.config.app_registry import AppRegistry
+from phone_agent.config.apps import ANDROID_APPS, APP_PACKAGES
+from phone_agent.config.apps_ios import APP_PACKAGES_IOS, IOS_APPS
 from phone_agent.config.i18n import get_message, get_messages
 from phone_agent.config.prompts_en import SYSTEM_PROMPT as SYSTEM_PROMPT_EN
+from phone_agent.config.prompts_en import build_system_prompt as _build_prompt_en
 from phone_agent.config.prompts_zh import SYSTEM_PROMPT as SYSTEM_PROMPT_ZH
+from phone_agent.config.prompts_zh import build_system_prompt as _build_prompt_zh
 from phone_agent.config.timing import (
     TIMING_CONFIG,
     ActionTimingConfig,
     ConnectionTimingConfig,
     DeviceTimingConfig,
+    SettleTimingConfig,
     TimingConfig,
     get_timing_config,
     update_timing_config,
@@ -18,7 +22,10 @@ from phone_agent.config.timing import (
 
 def get_system_prompt(lang: str = "cn") -> str:
     """
-    Get system prompt by language.
+    Get system prompt by language, dated today.
+
+    The static instructions come first so every task shares one cacheable
+    prefix; only the trailing date line changes.
 
     Args:
         lang: Language code, 'cn' for Chinese, 'en' for English.
@@ -27,8 +34,8 @@ def get_system_prompt(lang: str = "cn") -> str:
         System prompt string.
     """
     if lang == "en":
-        return SYSTEM_PROMPT_EN
-    return SYSTEM_PROMPT_ZH
+        return _build_prompt_en()
+    return _build_prompt_zh()
 
 
 # Default to Chinese for backward compatibility
@@ -37,6 +44,9 @@ SYSTEM_PROMPT = SYSTEM_PROMPT_ZH
 __all__ = [
     "APP_PACKAGES",
     "APP_PACKAGES_IOS",
+    "AppRegistry",
+    "ANDROID_APPS",
+    "IOS_APPS",
     "SYSTEM_PROMPT",
     "SYSTEM_PROMPT_ZH",
     "SYSTEM_PROMPT_EN",
@@ -48,6 +58,7 @@ __all__ = [
     "ActionTimingConfig",
     "DeviceTimingConfig",
     "ConnectionTimingConfig",
+    "SettleTimingConfig",
     "get_timing_config",
     "update_timing_config",
 ]
@@ -0,0 +1,82 @@
+"""Two-way index between app names and package names."""
+
+from types import MappingProxyType
+from typing import Iterator, Mapping
+
+
+class AppRegistry:
+    """
+    Immutable lookups between app names and packages (or bundle IDs).
+
+    Several names may map to one package, e.g. "WeChat" and "wechat". The
+    first name listed for a package is its canonical name, which is what
+    package lookups return.
+
+    The indexes are built once from the mapping. Changes to the mapping
+    afterwards are not seen; build a new registry instead.
+
+    Args:
+        packages: Mapping of app name to package name.
+
+    Example:
+        >>> registry = AppRegistry(
+        ...     {"WeChat": "com.tencent.mm", "wechat": "com.tencent.mm"}
+        ... )
+        >>> registry.get_app_name("com.tencent.mm")
+        'WeChat'
+    """
+
+    def __init__(self, packages: Mapping[str, str]):
+        names: dict[str, str] = {}
+        for name, package in packages.items():
+            names.setdefault(package, name)
+
+        self._packages = MappingProxyType(dict(packages))
+        self._names = MappingProxyType(names)
+
+    @property
+    def packages(self) -> Mapping[str, str]:
+        """Read-only mapping of app name to package."""
+        return self._packages
+
+    def __len__(self) -> int:
+        return len(self._packages)
+
+    def __contains__(self, app_name: object) -> bool:
+        return app_name in self._packages
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._packages)
+
+    def get_package(self, app_name: str) -> str | None:
+        """
+        Get the package for an app name or alias.
+
+        Args:
+            app_name: The display name of the app.
+
+        Returns:
+            The package name, or None if not found.
+        """
+        return self._packages.get(app_name)
+
+    def get_app_name(self, package: str) -> str | None:
+        """
+        Get the canonical app name for a package.
+
+        Args:
+            package: The package name.
+
+        Returns:
+            The display name of the app, or None if not found.
+        """
+        return self._names.get(package)
+
+    def list_apps(self) -> list[str]:
+        """
+        Get a list of all app names, including aliases.
+
+        Returns:
+            List of app names.
+        """
+        return list(self._packages)
@@ -1,5 +1,7 @@
 """App name to package name mapping for supported applications."""
 
+from phone_agent.config.app_registry import AppRegistry
+
 APP_PACKAGES: dict[str, str] = {
     # Social & Messaging
     "微信": "com.tencent.mm",
@@ -187,6 +189,9 @@ APP_PACKAGES: dict[str, str] = {
     "WhatsApp": "com.whatsapp",
 }
 
+# Indexes over APP_PACKAGES; the first name listed for a package is canonical
+ANDROID_APPS = AppRegistry(APP_PACKAGES)
+
 
 def get_package_name(app_name: str) -> str | None:
     """
@@ -198,7 +203,7 @@ def get_package_name(app_name: str) -> str | None:
     Returns:
         The Android package name, or None if not found.
     """
-    return APP_PACKAGES.get(app_name)
+    return ANDROID_APPS.get_package(app_name)
 
 
 def get_app_name(package_name: str) -> str | None:
@@ -211,10 +216,7 @@ def get_app_name(package_name: str) -> str | None:
     Returns:
         The display name of the app, or None if not found.
     """
-    for name, package in APP_PACKAGES.items():
-        if package == package_name:
-            return name
-    return None
+    return ANDROID_APPS.get_app_name(package_name)
 
 
 def list_supported_apps() -> list[str]:
@@ -224,4 +226,4 @@ def list_supported_apps() -> list[str]:
     Returns:
         List of app names.
     """
-    return list(APP_PACKAGES.keys())
\ No newline at end of file
+    return ANDROID_APPS.list_apps()
\ No newline at end of file
@@ -4,6 +4,8 @@ Maps user-friendly app names to HarmonyOS bundle names.
 These bundle names are used with the 'hdc shell aa start -b <bundle>' command.
 """
 
+from phone_agent.config.app_registry import AppRegistry
+
 # Custom ability names for apps that don't use the default "EntryAbility"
 # Maps bundle_name -> ability_name
 # Generated by: python test/find_abilities.py
@@ -227,6 +229,10 @@ APP_PACKAGES: dict[str, str] = {
 }
 
 
+# Indexes over APP_PACKAGES; the first name listed for a bundle is canonical
+HARMONYOS_APPS = AppRegistry(APP_PACKAGES)
+
+
 def get_package_name(app_name: str) -> str | None:
     """
     Get the package name for an app.
@@ -237,7 +243,7 @@ def get_package_name(app_name: str) -> str | None:
     Returns:
         The HarmonyOS bundle name, or None if not found.
     """
-    return APP_PACKAGES.get(app_name)
+    return HARMONYOS_APPS.get_package(app_name)
 
 
 def get_app_name(package_name: str) -> str | None:
@@ -250,10 +256,7 @@ def get_app_name(package_name: str) -> str | None:
     Returns:
         The display name of the app, or None if not found.
     """
-    for name, package in APP_PACKAGES.items():
-        if package == package_name:
-            return name
-    return None
+    return HARMONYOS_APPS.get_app_name(package_name)
 
 
 def list_supported_apps() -> list[str]:
@@ -263,4 +266,4 @@ def list_supported_apps() -> list[str]:
     Returns:
         List of app names.
     """
-    return list(APP_PACKAGES.keys())
+    return HARMONYOS_APPS.list_apps()
@@ -4,6 +4,8 @@ Based on iOS app bundle ID conventions and common iOS applications.
 Bundle IDs are in the format: com.company.appName
 """
 
+from phone_agent.config.app_registry import AppRegistry
+
 APP_PACKAGES_IOS: dict[str, str] = {
     # Tencent Apps (腾讯系)
     "微信": "com.tencent.xin",
@@ -201,6 +203,10 @@ APP_PACKAGES_IOS: dict[str, str] = {
 }
 
 
+# Indexes over APP_PACKAGES_IOS; the first name listed for a bundle is canonical
+IOS_APPS = AppRegistry(APP_PACKAGES_IOS)
+
+
 def get_bundle_id(app_name: str) -> str | None:
     """
     Get the iOS bundle ID for an app.
@@ -211,7 +217,7 @@ def get_bundle_id(app_name: str) -> str | None:
     Returns:
         The iOS bundle ID, or None if not found.
     """
-    return APP_PACKAGES_IOS.get(app_name)
+    return IOS_APPS.get_package(app_name)
 
 
 def get_app_name(bundle_id: str) -> str | None:
@@ -224,10 +230,7 @@ def get_app_name(bundle_id: str) -> str | None:
     Returns:
         The display name of the app, or None if not found.
     """
-    for name, bid in APP_PACKAGES_IOS.items():
-        if bid == bundle_id:
-            return name
-    return None
+    return IOS_APPS.get_app_name(bundle_id)
 
 
 def list_supported_apps() -> list[str]:
@@ -237,7 +240,7 @@ def list_supported_apps() -> list[str]:
     Returns:
         List of app names.
     """
-    return list(APP_PACKAGES_IOS.keys())
+    return IOS_APPS.list_apps()
 
 
 def check_app_installed(app_name: str, wda_url: str = "http://localhost:8100") -> bool:
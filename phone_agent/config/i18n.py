@@ -22,6 +22,9 @@ MESSAGES_ZH = {
     "performance_metrics": "性能指标",
     "time_to_first_token": "首 Token 延迟 (TTFT)",
     "time_to_thinking_end": "思考完成延迟",
+    "time_to_action_end": "动作完成延迟",
+    "after_action_end": "动作完成后读取",
+    "stopped_early": "已提前结束",
     "total_inference_time": "总推理时间",
 }
 
@@ -47,6 +50,9 @@ MESSAGES_EN = {
     "performance_metrics": "Performance Metrics",
     "time_to_first_token": "Time to First Token (TTFT)",
     "time_to_thinking_end": "Time to Thinking End",
+    "time_to_action_end": "Time to Action End",
+    "after_action_end": "Read After Action End",
+    "stopped_early": "stopped early",
     "total_inference_time": "Total Inference Time",
 }
 
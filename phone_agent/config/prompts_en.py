@@ -2,14 +2,9 @@
 
 from datetime import datetime
 
-today = datetime.today()
-formatted_date = today.strftime("%Y-%m-%d, %A")
-
-SYSTEM_PROMPT = (
-    "The current date: "
-    + formatted_date
-    + """
-# Setup
+# Static instructions, byte-identical across tasks and devices so servers
+# with prefix caching can reuse them; the date goes after them
+SYSTEM_PROMPT_STATIC = """# Setup
 You are a professional Android operation agent assistant that can fulfill the user's high-level instructions. Given a screenshot of the Android interface at each step, you first analyze the situation, then plan the best course of action using Python-style pseudo-code.
 
 # More details about the code
@@ -76,4 +71,25 @@ REMEMBER:
 - Only ONE LINE of action in <answer> part per response: Each step must contain exactly one line of executable code.
 - Generate execution code strictly according to format requirements.
 """
-)
+
+
+def get_date_line(today: datetime | None = None) -> str:
+    """
+    Get the line telling the model today's date.
+
+    Args:
+        today: Date to use. If None, uses the current date.
+
+    Returns:
+        Date line without a trailing newline.
+    """
+    today = today or datetime.today()
+    return "The current date: " + today.strftime("%Y-%m-%d, %A")
+
+
+def build_system_prompt() -> str:
+    """Build the system prompt: static instructions, then today's date."""
+    return SYSTEM_PROMPT_STATIC + get_date_line()
+
+
+SYSTEM_PROMPT = build_system_prompt()
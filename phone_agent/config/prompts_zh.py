@@ -2,16 +2,11 @@
 
 from datetime import datetime
 
-today = datetime.today()
-weekday_names = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
-weekday = weekday_names[today.weekday()]
-formatted_date = today.strftime("%Y年%m月%d日") + " " + weekday
+WEEKDAY_NAMES = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
 
-SYSTEM_PROMPT = (
-    "今天的日期是: "
-    + formatted_date
-    + """
-你是一个智能体分析专家，可以根据操作历史和当前状态图执行一系列操作来完成任务。
+# Static instructions, byte-identical across tasks and devices so servers
+# with prefix caching can reuse them; the date goes after them
+SYSTEM_PROMPT_STATIC = """你是一个智能体分析专家，可以根据操作历史和当前状态图执行一系列操作来完成任务。
 你必须严格按照要求输出以下格式：
 <think>{think}</think>
 <answer>{action}</answer>
@@ -74,4 +69,26 @@ SYSTEM_PROMPT = (
 17. 如果没有合适的搜索结果，可能是因为搜索页面不对，请返回到搜索页面的上一级尝试重新搜索，如果尝试三次返回上一级搜索后仍然没有符合要求的结果，执行 finish(message="原因")。
 18. 在结束任务前请一定要仔细检查任务是否完整准确的完成，如果出现错选、漏选、多选的情况，请返回之前的步骤进行纠正。
 """
-)
+
+
+def get_date_line(today: datetime | None = None) -> str:
+    """
+    Get the line telling the model today's date.
+
+    Args:
+        today: Date to use. If None, uses the current date.
+
+    Returns:
+        Date line without a trailing newline.
+    """
+    today = today or datetime.today()
+    weekday = WEEKDAY_NAMES[today.weekday()]
+    return "今天的日期是: " + today.strftime("%Y年%m月%d日") + " " + weekday
+
+
+def build_system_prompt() -> str:
+    """Build the system prompt: static instructions, then today's date."""
+    return SYSTEM_PROMPT_STATIC + get_date_line()
+
+
+SYSTEM_PROMPT = build_system_prompt()
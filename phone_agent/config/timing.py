@@ -96,6 +96,69 @@ class ConnectionTimingConfig:
         )
 
 
+@dataclass
+class SettleTimingConfig:
+    """Configuration for waiting until the screen settles after an action."""
+
+    # When enabled, fixed post-action delays are replaced by polling frame
+    # signatures until consecutive frames match or the action's budget runs out
+    enabled: bool = False
+    initial_delay: float = 0.1  # Wait before the first frame is sampled
+    poll_interval: float = 0.1  # Wait between frame samples
+    stable_frames: int = 2  # Consecutive identical frames that count as settled
+
+    # Maximum wait per action type (in seconds)
+    tap_budget: float = 1.5
+    double_tap_budget: float = 1.5
+    long_press_budget: float = 1.5
+    swipe_budget: float = 2.0
+    back_budget: float = 1.5
+    home_budget: float = 1.5
+    launch_budget: float = 3.0
+    type_budget: float = 1.0  # Applies to each keyboard / text step
+
+    def __post_init__(self):
+        """Load values from environment variables if present."""
+        self.enabled = os.getenv("PHONE_AGENT_SETTLE", str(self.enabled)).lower() in (
+            "true",
+            "1",
+            "yes",
+        )
+        self.initial_delay = float(
+            os.getenv("PHONE_AGENT_SETTLE_INITIAL_DELAY", self.initial_delay)
+        )
+        self.poll_interval = float(
+            os.getenv("PHONE_AGENT_SETTLE_POLL_INTERVAL", self.poll_interval)
+        )
+        self.stable_frames = int(
+            os.getenv("PHONE_AGENT_SETTLE_STABLE_FRAMES", self.stable_frames)
+        )
+        self.tap_budget = float(
+            os.getenv("PHONE_AGENT_SETTLE_TAP_BUDGET", self.tap_budget)
+        )
+        self.double_tap_budget = float(
+            os.getenv("PHONE_AGENT_SETTLE_DOUBLE_TAP_BUDGET", self.double_tap_budget)
+        )
+        self.long_press_budget = float(
+            os.getenv("PHONE_AGENT_SETTLE_LONG_PRESS_BUDGET", self.long_press_budget)
+        )
+        self.swipe_budget = float(
+            os.getenv("PHONE_AGENT_SETTLE_SWIPE_BUDGET", self.swipe_budget)
+        )
+        self.back_budget = float(
+            os.getenv("PHONE_AGENT_SETTLE_BACK_BUDGET", self.back_budget)
+        )
+        self.home_budget = float(
+            os.getenv("PHONE_AGENT_SETTLE_HOME_BUDGET", self.home_budget)
+        )
+        self.launch_budget = float(
+            os.getenv("PHONE_AGENT_SETTLE_LAUNCH_BUDGET", self.launch_budget)
+        )
+        self.type_budget = float(
+            os.getenv("PHONE_AGENT_SETTLE_TYPE_BUDGET", self.type_budget)
+        )
+
+
 @dataclass
 class TimingConfig:
     """Master timing configuration combining all timing settings."""
@@ -103,12 +166,14 @@ class TimingConfig:
     action: ActionTimingConfig
     device: DeviceTimingConfig
     connection: ConnectionTimingConfig
+    settle: SettleTimingConfig
 
     def __init__(self):
         """Initialize all timing configurations."""
         self.action = ActionTimingConfig()
         self.device = DeviceTimingConfig()
         self.connection = ConnectionTimingConfig()
+        self.settle = SettleTimingConfig()
 
 
 # Global timing configuration instance
@@ -130,6 +195,7 @@ def update_timing_config(
     action: ActionTimingConfig | None = None,
     device: DeviceTimingConfig | None = None,
     connection: ConnectionTimingConfig | None = None,
+    settle: SettleTimingConfig | None = None,
 ) -> None:
     """
     Update the global timing configuration.
@@ -138,6 +204,7 @@ def update_timing_config(
         action: New action timing configuration.
         device: New device timing configuration.
         connection: New connection timing configuration.
+        settle: New screen settle configuration.
 
     Example:
         >>> from phone_agent.config.timing import update_timing_config, ActionTimingConfig
@@ -154,12 +221,15 @@ def update_timing_config(
         TIMING_CONFIG.device = device
     if connection is not None:
         TIMING_CONFIG.connection = connection
+    if settle is not None:
+        TIMING_CONFIG.settle = settle
 
 
 __all__ = [
     "ActionTimingConfig",
     "DeviceTimingConfig",
     "ConnectionTimingConfig",
+    "SettleTimingConfig",
     "TimingConfig",
     "TIMING_CONFIG",
     "get_timing_config",
@@ -3,6 +3,8 @@
 from enum import Enum
 from typing import Any
 
+from phone_agent.imaging import ScreenshotEncodingConfig
+
 
 class DeviceType(Enum):
     """Type of device connection tool."""
@@ -45,9 +47,18 @@ class DeviceFactory:
                 raise ValueError(f"Unknown device type: {self.device_type}")
         return self._module
 
-    def get_screenshot(self, device_id: str | None = None, timeout: int = 10):
+    def get_screenshot(
+        self,
+        device_id: str | None = None,
+        timeout: int = 10,
+        encoding: ScreenshotEncodingConfig | None = None,
+    ):
         """Get screenshot from device."""
-        return self.module.get_screenshot(device_id, timeout)
+        return self.module.get_screenshot(device_id, timeout, encoding=encoding)
+
+    def get_frame_signature(self, device_id: str | None = None) -> str | None:
+        """Get a cheap signature of the current frame."""
+        return self.module.get_frame_signature(device_id)
 
     def get_current_app(self, device_id: str | None = None) -> str:
         """Get current app name."""
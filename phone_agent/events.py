@@ -0,0 +1,199 @@
+"""Sinks for the per-step timing records emitted by the agents."""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable
+
+# Phases of a step, in the order they happen. Not every step has all of them:
+# a failed model request ends after the model phases.
+STEP_PHASES = (
+    "screenshot",  # Screenshot capture, including encode
+    "screenshot_encode",  # Part of screenshot spent encoding the image
+    "current_app",  # Current-app query (runs alongside the screenshot)
+    "observe",  # Wall time of the concurrent screenshot and app queries
+    "build_messages",  # Building the user message and applying the history policy
+    "queue_wait",  # Waiting for a model scheduler slot
+    "model_ttft",  # Time to first token
+    "model_total",  # Total inference time
+    "parse",  # Parsing the action
+    "execute",  # Running the action, excluding post_action_wait
+    "post_action_wait",  # Fixed delays or settle polling after the action
+    "total",  # Whole step
+)
+
+
+class TimingSink:
+    """
+    Receives one timing record per agent step.
+
+    A record is a JSON-serializable dict with the step's device_id, step
+    number, action name and outcome, and a "timings" dict mapping the
+    STEP_PHASES that were measured to seconds. The default sink drops them.
+    """
+
+    def emit(self, record: dict[str, Any]) -> None:
+        """
+        Handle one step's record. Called on the agent's thread.
+
+        Args:
+            record: Timing record.
+        """
+
+    def close(self) -> None:
+        """Release any resources held by the sink."""
+
+
+class CallbackTimingSink(TimingSink):
+    """
+    Passes each record to a callback.
+
+    Args:
+        callback: Called with each record.
+    """
+
+    def __init__(self, callback: Callable[[dict[str, Any]], None]):
+        self.callback = callback
+
+    def emit(self, record: dict[str, Any]) -> None:
+        self.callback(record)
+
+
+class JsonlTimingSink(TimingSink):
+    """
+    Appends each record as one line of JSON to a file.
+
+    Safe to share between agents on different threads.
+
+    Args:
+        path: File to append to (created if missing).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def emit(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+# Global timing sink, shared by agents that do not set their own
+_timing_sink: TimingSink | None = None
+
+
+def set_timing_sink(sink: TimingSink | None) -> None:
+    """
+    Set the timing sink used by agents that do not configure one.
+
+    Args:
+        sink: Timing sink, or None to go back to the default.
+    """
+    global _timing_sink
+    _timing_sink = sink
+
+
+def get_timing_sink() -> TimingSink:
+    """
+    Get the global timing sink.
+
+    On first use, PHONE_AGENT_TIMING_LOG selects a JSONL file to append
+    records to; otherwise records are dropped.
+
+    Returns:
+        The timing sink.
+    """
+    global _timing_sink
+    if _timing_sink is None:
+        path = os.getenv("PHONE_AGENT_TIMING_LOG")
+        _timing_sink = JsonlTimingSink(path) if path else TimingSink()
+    return _timing_sink
+
+
+def build_step_record(
+    device_id: str | None,
+    step: int,
+    action: dict[str, Any] | None,
+    success: bool,
+    finished: bool,
+    timings: dict[str, float],
+) -> dict[str, Any]:
+    """
+    Build the timing record for one step.
+
+    Args:
+        device_id: Device the step ran on.
+        step: Step number within the task, starting at 1.
+        action: Parsed action, or None if the model request failed.
+        success: Whether the step succeeded.
+        finished: Whether the task finished on this step.
+        timings: Measured phases in seconds.
+
+    Returns:
+        Timing record.
+    """
+    if action is None:
+        action_name = None
+    elif action.get("_metadata") == "finish":
+        action_name = "finish"
+    else:
+        action_name = action.get("action")
+    return {
+        "time": time.time(),
+        "device_id": device_id,
+        "step": step,
+        "action": action_name,
+        "success": success,
+        "finished": finished,
+        "timings": {name: round(value, 6) for name, value in timings.items()},
+    }
+
+
+def observation_timings(observation: Any) -> dict[str, float]:
+    """
+    Get the observation phases of a step.
+
+    Args:
+        observation: Observation captured at the start of the step.
+
+    Returns:
+        screenshot, screenshot_encode (if the backend measured it),
+        current_app and observe timings in seconds.
+    """
+    timings = {
+        "screenshot": observation.timings["screenshot"],
+        "current_app": observation.timings["current_app"],
+        "observe": observation.timings["total"],
+    }
+    encode_time = getattr(observation.screenshot, "timings", {}).get("encode")
+    if encode_time is not None:
+        timings["screenshot_encode"] = encode_time
+    return timings
+
+
+def model_timings(response: Any) -> dict[str, float]:
+    """
+    Get the model phases of a step.
+
+    Args:
+        response: ModelResponse of the step.
+
+    Returns:
+        queue_wait, model_ttft and model_total timings that were measured.
+    """
+    values = {
+        "queue_wait": response.queue_wait,
+        "model_ttft": response.time_to_first_token,
+        "model_total": response.total_time,
+    }
+    return {name: value for name, value in values.items() if value is not None}
@@ -0,0 +1,38 @@
+"""Fleet orchestration for running task queues across many devices."""
+
+from phone_agent.fleet.devices import (
+    FleetDevice,
+    check_wda_urls,
+    discover_devices,
+    parse_wda_urls,
+)
+from phone_agent.fleet.orchestrator import FleetConfig, FleetOrchestrator
+from phone_agent.fleet.queue import FleetTask, TaskQueue, load_tasks
+from phone_agent.fleet.stats import (
+    DeviceSummary,
+    FleetStats,
+    FleetSummary,
+    TaskResult,
+)
+from phone_agent.fleet.worker import DeviceWorker
+
+__all__ = [
+    # Devices
+    "FleetDevice",
+    "discover_devices",
+    "parse_wda_urls",
+    "check_wda_urls",
+    # Tasks
+    "FleetTask",
+    "TaskQueue",
+    "load_tasks",
+    # Orchestration
+    "FleetConfig",
+    "FleetOrchestrator",
+    "DeviceWorker",
+    # Results
+    "TaskResult",
+    "FleetStats",
+    "FleetSummary",
+    "DeviceSummary",
+]
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Run a JSONL task file across all connected devices.
+
+Usage:
+    python -m phone_agent.fleet tasks.jsonl [OPTIONS]
+
+Each line of the task file is a JSON object such as
+    {"id": "t1", "task": "打开设置", "device_id": "emulator-5554", "max_steps": 20}
+where only "task" is required, or a JSON string with just the task text.
+
+Environment Variables:
+    PHONE_AGENT_BASE_URL: Model API base URL (default: http://localhost:8000/v1)
+    PHONE_AGENT_MODEL: Model name (default: autoglm-phone-9b)
+    PHONE_AGENT_API_KEY: API key for model authentication (default: EMPTY)
+    PHONE_AGENT_MAX_STEPS: Maximum steps per task (default: 100)
+    PHONE_AGENT_WDA_URLS: WebDriverAgent URL per iOS device, as comma-separated
+        UDID=URL entries (required for more than one iOS device)
+    PHONE_AGENT_TIMING_LOG: Append per-step timing records to this JSONL file
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from dataclasses import asdict
+
+from phone_agent.device_factory import DeviceType
+from phone_agent.events import JsonlTimingSink, get_timing_sink, set_timing_sink
+from phone_agent.fleet.devices import check_wda_urls, discover_devices, parse_wda_urls
+from phone_agent.fleet.orchestrator import FleetConfig, FleetOrchestrator
+from phone_agent.fleet.queue import load_tasks
+from phone_agent.fleet.stats import TaskResult
+from phone_agent.model import ModelConfig, get_model_scheduler
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m phone_agent.fleet",
+        description="Run a queue of phone tasks in parallel across devices",
+    )
+    parser.add_argument("tasks", type=str, help="Path to a JSONL task file")
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=os.getenv("PHONE_AGENT_BASE_URL", "http://localhost:8000/v1"),
+        help="Model API base URL",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=os.getenv("PHONE_AGENT_MODEL", "autoglm-phone-9b"),
+        help="Model name",
+    )
+    parser.add_argument(
+        "--apikey",
+        type=str,
+        default=os.getenv("PHONE_AGENT_API_KEY", "EMPTY"),
+        help="API key for model authentication",
+    )
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=int(os.getenv("PHONE_AGENT_MAX_STEPS", "100")),
+        help="Maximum steps per task",
+    )
+    parser.add_argument(
+        "--lang",
+        type=str,
+        choices=["cn", "en"],
+        default=os.getenv("PHONE_AGENT_LANG", "cn"),
+        help="Language for system prompt (cn or en, default: cn)",
+    )
+    parser.add_argument(
+        "--device-type",
+        type=str,
+        action="append",
+        choices=["adb", "hdc", "ios"],
+        help="Backend to discover devices on (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--device-id",
+        "-d",
+        type=str,
+        action="append",
+        help="Only use this device (repeatable, default: all discovered devices)",
+    )
+    parser.add_argument(
+        "--wda-url",
+        type=str,
+        action="append",
+        metavar="UDID=URL",
+        help="WebDriverAgent URL of an iOS device (repeatable, adds to "
+        "PHONE_AGENT_WDA_URLS; required for more than one iOS device)",
+    )
+    parser.add_argument(
+        "--results",
+        type=str,
+        metavar="PATH",
+        help="Append one JSON line per finished task to this file",
+    )
+    parser.add_argument(
+        "--timing-log",
+        type=str,
+        metavar="PATH",
+        help="Append one JSON line of phase timings per agent step to this file",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    # Device failures and quarantines are logged by the workers
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    device_types = (
+        [DeviceType(value) for value in args.device_type] if args.device_type else None
+    )
+    try:
+        wda_urls = parse_wda_urls(os.getenv("PHONE_AGENT_WDA_URLS", ""))
+        wda_urls.update(parse_wda_urls(",".join(args.wda_url or [])))
+    except ValueError as e:
+        print(f"❌ Invalid WebDriverAgent URL mapping: {e}")
+        sys.exit(1)
+
+    devices = discover_devices(device_types, wda_urls)
+    if args.device_id:
+        devices = [d for d in devices if d.device_id in args.device_id]
+    if not devices:
+        print("❌ No devices found")
+        sys.exit(1)
+    try:
+        check_wda_urls(devices)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    tasks = load_tasks(args.tasks)
+    print(f"Running {len(tasks)} tasks on {len(devices)} devices:")
+    for device in devices:
+        print(
+            f"  {device.key}"
+            + (f" ({device.model})" if device.model else "")
+            + (f" via {device.wda_url}" if device.wda_url else "")
+        )
+
+    if args.timing_log:
+        set_timing_sink(JsonlTimingSink(args.timing_log))
+
+    results_lock = threading.Lock()
+
+    def on_result(result: TaskResult) -> None:
+        status = "✅" if result.success else "❌"
+        print(
+            f"{status} [{result.device_id}] {result.task_id} "
+            f"({result.steps} steps, {result.duration:.1f}s): {result.message}"
+        )
+        if args.results:
+            with results_lock, open(args.results, "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+
+    fleet = FleetOrchestrator(
+        ModelConfig(
+            base_url=args.base_url,
+            model_name=args.model,
+            api_key=args.apikey,
+            lang=args.lang,
+        ),
+        devices=devices,
+        config=FleetConfig(max_steps=args.max_steps, lang=args.lang),
+        on_result=on_result,
+    )
+
+    try:
+        summary = fleet.run(tasks)
+    except KeyboardInterrupt:
+        print("\nStopping fleet...")
+        fleet.stop()
+        summary = fleet.wait()
+    get_timing_sink().close()
+
+    print("\n" + "=" * 50)
+    print(summary.format())
+    scheduler_stats = get_model_scheduler().stats()
+    print(
+        f"Model requests: {scheduler_stats.completed}, "
+        f"queue wait mean {scheduler_stats.mean_queue_wait:.2f}s "
+        f"(p95 {scheduler_stats.p95_queue_wait:.2f}s), "
+        f"inference mean {scheduler_stats.mean_inference_time:.2f}s "
+        f"(p95 {scheduler_stats.p95_inference_time:.2f}s)"
+    )
+    pending = fleet.queue.pending()
+    if pending:
+        print(f"{len(pending)} tasks were not run: {[t.task_id for t in pending]}")
+
+
+if __name__ == "__main__":
+    main()
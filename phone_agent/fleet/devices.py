@@ -0,0 +1,146 @@
+"""Device discovery across the Android, HarmonyOS and iOS backends."""
+
+import os
+import shutil
+from dataclasses import dataclass
+
+from phone_agent.device_factory import DeviceType
+
+# Backend tools that must be installed for discovery to try a device type
+_DISCOVERY_TOOLS = {
+    DeviceType.HDC: "hdc",
+    DeviceType.IOS: "idevice_id",
+}
+
+# Listing status that means the device is ready to take commands
+_READY_STATUSES = {"device", "connected"}
+
+# WebDriverAgent URL of iOS devices without their own; only one can use it
+DEFAULT_WDA_URL = "http://localhost:8100"
+
+
+@dataclass(frozen=True)
+class FleetDevice:
+    """A device the fleet can run tasks on."""
+
+    device_id: str
+    device_type: DeviceType
+    model: str | None = None
+    wda_url: str | None = None  # iOS only; WebDriverAgent URL for this device
+
+    @property
+    def key(self) -> str:
+        """Identifier unique across backends, e.g. "adb:emulator-5554"."""
+        return f"{self.device_type.value}:{self.device_id}"
+
+
+def parse_wda_urls(spec: str) -> dict[str, str]:
+    """
+    Parse a mapping of iOS device UDIDs to WebDriverAgent URLs.
+
+    Args:
+        spec: Comma-separated UDID=URL entries, e.g.
+            "00008030-001A=http://localhost:8100,00008101-002B=http://localhost:8101".
+
+    Returns:
+        Dict mapping UDID to URL.
+
+    Raises:
+        ValueError: If an entry is not of the form UDID=URL.
+    """
+    wda_urls = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        udid, sep, url = entry.partition("=")
+        if not sep or not udid.strip() or not url.strip():
+            raise ValueError(f"Expected UDID=URL, got {entry!r}")
+        wda_urls[udid.strip()] = url.strip()
+    return wda_urls
+
+
+def check_wda_urls(devices: list[FleetDevice]) -> None:
+    """
+    Check that every iOS device has a WebDriverAgent URL of its own.
+
+    A device without one uses DEFAULT_WDA_URL, which is only right for a
+    single device.
+
+    Args:
+        devices: Devices of the fleet.
+
+    Raises:
+        ValueError: If iOS devices would share a WebDriverAgent URL.
+    """
+    owners: dict[str, str] = {}
+    for device in devices:
+        if device.device_type != DeviceType.IOS:
+            continue
+        url = device.wda_url or DEFAULT_WDA_URL
+        if url in owners:
+            raise ValueError(
+                f"iOS devices {owners[url]} and {device.device_id} would share "
+                f"WebDriverAgent at {url}; map each UDID to its own URL with "
+                "--wda-url UDID=URL or PHONE_AGENT_WDA_URLS"
+            )
+        owners[url] = device.device_id
+
+
+def discover_devices(
+    device_types: list[DeviceType] | None = None,
+    wda_urls: dict[str, str] | None = None,
+) -> list[FleetDevice]:
+    """
+    List ready devices on the given backends.
+
+    Backends whose command-line tool is not installed are skipped.
+
+    Args:
+        device_types: Backends to query. If None, queries all of them.
+        wda_urls: WebDriverAgent URL per iOS device UDID. If None, read from
+            PHONE_AGENT_WDA_URLS (see parse_wda_urls).
+
+    Returns:
+        List of FleetDevice objects.
+    """
+    device_types = device_types or list(DeviceType)
+    if wda_urls is None:
+        wda_urls = parse_wda_urls(os.getenv("PHONE_AGENT_WDA_URLS", ""))
+    devices = []
+
+    for device_type in device_types:
+        tool = _DISCOVERY_TOOLS.get(device_type)
+        if tool and shutil.which(tool) is None:
+            continue
+
+        for info in _list_devices(device_type):
+            # hdc reports "[Empty]" when nothing is attached
+            if info.status not in _READY_STATUSES or info.device_id.startswith("["):
+                continue
+            devices.append(
+                FleetDevice(
+                    device_id=info.device_id,
+                    device_type=device_type,
+                    model=info.model,
+                    wda_url=(
+                        wda_urls.get(info.device_id)
+                        if device_type == DeviceType.IOS
+                        else None
+                    ),
+                )
+            )
+
+    return devices
+
+
+def _list_devices(device_type: DeviceType) -> list:
+    """List devices with the backend's connection helper."""
+    if device_type == DeviceType.ADB:
+        from phone_agent.adb import list_devices
+    elif device_type == DeviceType.HDC:
+        from phone_agent.hdc import list_devices
+    else:
+        from phone_agent.xctest import list_devices
+
+    return list_devices()
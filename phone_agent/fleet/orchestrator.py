@@ -0,0 +1,226 @@
+"""Fleet orchestrator that runs a task queue across many devices."""
+
+import os
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Iterable
+
+from phone_agent.agent import AgentConfig, PhoneAgent
+from phone_agent.agent_ios import IOSAgentConfig, IOSPhoneAgent
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.fleet.devices import (
+    DEFAULT_WDA_URL,
+    FleetDevice,
+    check_wda_urls,
+    discover_devices,
+)
+from phone_agent.fleet.queue import FleetTask, TaskQueue
+from phone_agent.fleet.stats import FleetStats, FleetSummary, TaskResult
+from phone_agent.fleet.worker import DeviceWorker
+from phone_agent.model import ModelConfig, Priority
+
+
+@dataclass
+class FleetConfig:
+    """Configuration for a fleet run."""
+
+    max_steps: int = 100  # Default step limit per task
+    lang: str = "cn"
+    max_attempts: int = 2  # Runs per task before giving up on device failures
+    max_consecutive_failures: int = 3  # Device failures in a row before quarantine
+    quarantine_seconds: float = 60.0  # First quarantine period
+    max_quarantine_seconds: float = 1800.0  # Cap for the doubling quarantine period
+
+    def __post_init__(self):
+        """Load values from environment variables if present."""
+        self.max_steps = int(os.getenv("PHONE_AGENT_MAX_STEPS", self.max_steps))
+        self.max_attempts = int(
+            os.getenv("PHONE_AGENT_FLEET_MAX_ATTEMPTS", self.max_attempts)
+        )
+        self.max_consecutive_failures = int(
+            os.getenv(
+                "PHONE_AGENT_FLEET_MAX_CONSECUTIVE_FAILURES",
+                self.max_consecutive_failures,
+            )
+        )
+        self.quarantine_seconds = float(
+            os.getenv("PHONE_AGENT_FLEET_QUARANTINE_SECONDS", self.quarantine_seconds)
+        )
+        self.max_quarantine_seconds = float(
+            os.getenv(
+                "PHONE_AGENT_FLEET_MAX_QUARANTINE_SECONDS",
+                self.max_quarantine_seconds,
+            )
+        )
+
+
+class FleetOrchestrator:
+    """
+    Runs tasks from a shared queue on a pool of per-device agents.
+
+    Every device gets its own worker thread and agent. Workers pull the next
+    task they are eligible for, so a slow device never holds up the others.
+    Sensitive-action confirmations are declined and takeover requests are
+    skipped, since nobody is watching individual devices. Model requests are
+    scheduled as batch work, behind interactive agents in the same process.
+
+    Args:
+        model_config: Configuration for the AI model.
+        devices: Devices to use. If None, discovers ready devices on all backends.
+        config: Fleet configuration.
+        agent_factory: Optional callable creating the agent for a device. The
+            agent must provide reset() and step() like PhoneAgent.
+        on_result: Optional callback invoked with each TaskResult.
+
+    Raises:
+        ValueError: If the default agents would drive several iOS devices
+            through the same WebDriverAgent URL.
+
+    Example:
+        >>> fleet = FleetOrchestrator(ModelConfig(base_url="http://localhost:8000/v1"))
+        >>> summary = fleet.run([FleetTask("打开设置"), FleetTask("打开微信")])
+        >>> print(summary.format())
+    """
+
+    def __init__(
+        self,
+        model_config: ModelConfig | None = None,
+        devices: list[FleetDevice] | None = None,
+        config: FleetConfig | None = None,
+        agent_factory: Callable[[FleetDevice], Any] | None = None,
+        on_result: Callable[[TaskResult], None] | None = None,
+    ):
+        self.model_config = replace(
+            model_config or ModelConfig(), priority=Priority.BATCH
+        )
+        self.config = config or FleetConfig()
+        self.devices = discover_devices() if devices is None else devices
+        if agent_factory is None:
+            check_wda_urls(self.devices)
+        self.agent_factory = agent_factory or self._create_agent
+        self.on_result = on_result
+
+        self.queue = TaskQueue()
+        self.stats = FleetStats()
+        self._stop_event = threading.Event()
+        self._workers: list[DeviceWorker] = []
+
+    def start(self) -> None:
+        """Start one worker per device."""
+        if self._workers:
+            return
+        if not self.devices:
+            raise RuntimeError("No devices available for the fleet")
+
+        self.stats.reset_clock()
+        for device in self.devices:
+            worker = DeviceWorker(
+                device,
+                self.queue,
+                self.stats,
+                self.agent_factory,
+                max_steps=self.config.max_steps,
+                max_attempts=self.config.max_attempts,
+                max_consecutive_failures=self.config.max_consecutive_failures,
+                quarantine_seconds=self.config.quarantine_seconds,
+                max_quarantine_seconds=self.config.max_quarantine_seconds,
+                stop_event=self._stop_event,
+                on_result=self.on_result,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, task: FleetTask | str) -> FleetTask:
+        """
+        Queue a task.
+
+        Args:
+            task: FleetTask, or task text to run on any device.
+
+        Returns:
+            The queued FleetTask.
+        """
+        if isinstance(task, str):
+            task = FleetTask(task)
+        self.queue.put(task)
+        return task
+
+    def close(self) -> None:
+        """Signal that no more tasks will be submitted."""
+        self.queue.close()
+
+    def wait(self, timeout: float | None = None) -> FleetSummary:
+        """
+        Wait for the workers to drain the queue.
+
+        Call close() first, otherwise workers keep waiting for new tasks.
+
+        Args:
+            timeout: Maximum seconds to wait for each worker.
+
+        Returns:
+            FleetSummary of the run so far.
+        """
+        for worker in self._workers:
+            worker.join(timeout)
+        return self.stats.summary()
+
+    def stop(self) -> None:
+        """Stop workers after their current step, leaving queued tasks."""
+        self._stop_event.set()
+        self.queue.close()
+
+    def run(self, tasks: Iterable[FleetTask | str]) -> FleetSummary:
+        """
+        Run a batch of tasks to completion.
+
+        Args:
+            tasks: Tasks to run.
+
+        Returns:
+            FleetSummary with throughput and latency figures.
+        """
+        for task in tasks:
+            self.submit(task)
+        self.close()
+        self.start()
+        return self.wait()
+
+    @property
+    def results(self) -> list[TaskResult]:
+        """Results recorded so far, in completion order."""
+        return self.stats.results
+
+    @property
+    def quarantined_devices(self) -> list[FleetDevice]:
+        """Devices currently sitting out after repeated failures."""
+        return [worker.device for worker in self._workers if worker.quarantined]
+
+    def _create_agent(self, device: FleetDevice):
+        """Create an agent bound to one device."""
+        if device.device_type == DeviceType.IOS:
+            return IOSPhoneAgent(
+                model_config=self.model_config,
+                agent_config=IOSAgentConfig(
+                    max_steps=self.config.max_steps,
+                    wda_url=device.wda_url or DEFAULT_WDA_URL,
+                    device_id=device.device_id,
+                    lang=self.config.lang,
+                    verbose=False,
+                ),
+                confirmation_callback=lambda message: False,
+                takeover_callback=lambda message: None,
+            )
+
+        return PhoneAgent(
+            model_config=self.model_config,
+            agent_config=AgentConfig(
+                max_steps=self.config.max_steps,
+                device_id=device.device_id,
+                lang=self.config.lang,
+                verbose=False,
+            ),
+            confirmation_callback=lambda message: False,
+            takeover_callback=lambda message: None,
+            device_factory=DeviceFactory(device.device_type),
+        )
@@ -0,0 +1,165 @@
+"""Task queue shared by the fleet workers."""
+
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class FleetTask:
+    """A task to run on one device."""
+
+    task: str  # Natural language task for the agent
+    task_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    device_id: str | None = None  # Pin to a device; None runs anywhere
+    max_steps: int | None = None  # Override the fleet's step limit
+    attempts: int = 0  # Runs so far, including ones lost to device failures
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FleetTask":
+        """
+        Create a task from a JSON object.
+
+        Args:
+            data: Object with a "task" key and optional "id", "device_id",
+                "max_steps" and "metadata".
+
+        Returns:
+            FleetTask.
+        """
+        if "task" not in data:
+            raise ValueError(f"Task entry has no 'task' field: {data}")
+        task = cls(
+            task=data["task"],
+            device_id=data.get("device_id"),
+            max_steps=data.get("max_steps"),
+            metadata=data.get("metadata", {}),
+        )
+        if data.get("id"):
+            task.task_id = str(data["id"])
+        return task
+
+
+def load_tasks(path: str) -> list[FleetTask]:
+    """
+    Load tasks from a JSONL file.
+
+    Each non-empty line is either a JSON object (see FleetTask.from_dict) or
+    a JSON string holding just the task text.
+
+    Args:
+        path: Path to the JSONL file.
+
+    Returns:
+        List of FleetTask objects in file order.
+    """
+    tasks = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if isinstance(data, str):
+                data = {"task": data}
+            tasks.append(FleetTask.from_dict(data))
+    return tasks
+
+
+class TaskQueue:
+    """
+    Thread-safe FIFO of fleet tasks with per-device eligibility.
+
+    Workers only take tasks that are unpinned or pinned to their device.
+    Once closed, a worker's get returns None when nothing it could take is
+    queued or still running elsewhere (a running task may be requeued).
+    """
+
+    def __init__(self):
+        self._tasks: deque[FleetTask] = deque()
+        self._in_flight = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def put(self, task: FleetTask) -> None:
+        """Add a task to the end of the queue."""
+        with self._condition:
+            self._tasks.append(task)
+            self._condition.notify_all()
+
+    def get(self, device_id: str, timeout: float | None = None) -> FleetTask | None:
+        """
+        Take the oldest task the device may run.
+
+        Args:
+            device_id: ID of the device asking for work.
+            timeout: Maximum seconds to wait. None waits until a task arrives
+                or the queue is drained.
+
+        Returns:
+            The task, or None on timeout or when the queue is drained.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                task = self._find(device_id)
+                if task is not None:
+                    self._tasks.remove(task)
+                    self._in_flight += 1
+                    return task
+
+                if self._closed and self._in_flight == 0:
+                    return None
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    def task_done(self, task: FleetTask, requeue: bool = False) -> None:
+        """
+        Mark a task taken with get as finished.
+
+        Args:
+            task: The task.
+            requeue: Put the task back for another attempt instead.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if requeue:
+                self._tasks.append(task)
+            self._condition.notify_all()
+
+    def is_drained(self, device_id: str) -> bool:
+        """Whether the queue is closed with no more work this device could take."""
+        with self._condition:
+            return (
+                self._closed and self._in_flight == 0 and self._find(device_id) is None
+            )
+
+    def close(self) -> None:
+        """Mark the task list complete; workers exit once it is drained."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def pending(self) -> list[FleetTask]:
+        """Tasks still queued, e.g. ones pinned to a device that never came up."""
+        with self._condition:
+            return list(self._tasks)
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._tasks)
+
+    def _find(self, device_id: str) -> FleetTask | None:
+        """Oldest queued task the device may run. Caller holds the lock."""
+        for task in self._tasks:
+            if task.device_id is None or task.device_id == device_id:
+                return task
+        return None
@@ -0,0 +1,140 @@
+"""Per-task results and aggregate throughput for a fleet run."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one fleet task."""
+
+    task_id: str
+    task: str
+    device_id: str | None
+    success: bool
+    message: str
+    steps: int = 0
+    attempts: int = 1
+    started_at: float = 0.0  # Wall-clock start of the final attempt
+    duration: float = 0.0  # Seconds spent on the final attempt
+    error: str | None = None  # Set when the task was given up after device failures
+
+
+@dataclass
+class DeviceSummary:
+    """Aggregate numbers for one device."""
+
+    completed: int = 0
+    succeeded: int = 0
+    failures: int = 0  # Attempts lost to device errors
+    quarantines: int = 0
+    busy_seconds: float = 0.0
+
+
+@dataclass
+class FleetSummary:
+    """Aggregate numbers for a fleet run."""
+
+    completed: int
+    succeeded: int
+    failed: int
+    elapsed: float
+    tasks_per_hour: float
+    p50_latency: float
+    p95_latency: float
+    per_device: dict[str, DeviceSummary] = field(default_factory=dict)
+
+    def format(self) -> str:
+        """Render the summary as a human-readable report."""
+        lines = [
+            f"Tasks: {self.completed} completed, {self.succeeded} succeeded, "
+            f"{self.failed} failed",
+            f"Elapsed: {self.elapsed:.1f}s, throughput: {self.tasks_per_hour:.1f} tasks/hour",
+            f"Task latency: p50 {self.p50_latency:.2f}s, p95 {self.p95_latency:.2f}s",
+        ]
+        for device_id, device in sorted(self.per_device.items()):
+            lines.append(
+                f"  {device_id}: {device.completed} completed, "
+                f"{device.succeeded} succeeded, {device.failures} device failures, "
+                f"{device.quarantines} quarantines, busy {device.busy_seconds:.1f}s"
+            )
+        return "\n".join(lines)
+
+
+class FleetStats:
+    """Thread-safe collector for task results across workers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: list[TaskResult] = []
+        self._devices: dict[str, DeviceSummary] = {}
+        self._started = time.monotonic()
+
+    def record(self, result: TaskResult) -> None:
+        """Record a finished task."""
+        with self._lock:
+            self._results.append(result)
+            device = self._device(result.device_id)
+            device.completed += 1
+            device.succeeded += int(result.success)
+            device.busy_seconds += result.duration
+
+    def record_failure(self, device_id: str, quarantined: bool = False) -> None:
+        """Record an attempt lost to a device error."""
+        with self._lock:
+            device = self._device(device_id)
+            device.failures += 1
+            device.quarantines += int(quarantined)
+
+    def reset_clock(self) -> None:
+        """Start measuring throughput from now."""
+        with self._lock:
+            self._started = time.monotonic()
+
+    @property
+    def results(self) -> list[TaskResult]:
+        """Results recorded so far, in completion order."""
+        with self._lock:
+            return list(self._results)
+
+    def summary(self) -> FleetSummary:
+        """Compute throughput and latency over the results so far."""
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            latencies = sorted(r.duration for r in self._results)
+            succeeded = sum(1 for r in self._results if r.success)
+            completed = len(self._results)
+            per_device = {
+                key: DeviceSummary(**vars(device))
+                for key, device in self._devices.items()
+            }
+
+        return FleetSummary(
+            completed=completed,
+            succeeded=succeeded,
+            failed=completed - succeeded,
+            elapsed=elapsed,
+            tasks_per_hour=completed * 3600 / elapsed if elapsed > 0 else 0.0,
+            p50_latency=_percentile(latencies, 50),
+            p95_latency=_percentile(latencies, 95),
+            per_device=per_device,
+        )
+
+    def _device(self, device_id: str | None) -> DeviceSummary:
+        key = device_id or "default"
+        if key not in self._devices:
+            self._devices[key] = DeviceSummary()
+        return self._devices[key]
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Percentile of sorted values with linear interpolation."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * percent / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (
+        rank - low
+    )
@@ -0,0 +1,212 @@
+"""Per-device worker thread that runs fleet tasks one at a time."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from phone_agent.fleet.devices import FleetDevice
+from phone_agent.fleet.queue import FleetTask, TaskQueue
+from phone_agent.fleet.stats import FleetStats, TaskResult
+
+logger = logging.getLogger(__name__)
+
+# How long an idle worker waits on the queue before re-checking for stop
+_POLL_INTERVAL = 0.5
+
+
+class DeviceWorker(threading.Thread):
+    """
+    Runs queued tasks on one device with its own agent.
+
+    Each device gets a dedicated agent, so conversation context and the
+    device ID are never shared between devices. An exception raised while
+    stepping counts as a device failure: the task is requeued (up to
+    max_attempts runs) and, after max_consecutive_failures in a row, the
+    device is quarantined with exponential backoff before taking work again.
+    Model errors and tasks that end unsuccessfully are ordinary results.
+
+    Args:
+        device: Device this worker drives.
+        queue: Shared task queue.
+        stats: Shared stats collector.
+        agent_factory: Creates the agent for this device.
+        max_steps: Default step limit per task.
+        max_attempts: Runs per task before giving up on device failures.
+        max_consecutive_failures: Failures in a row that trigger quarantine.
+        quarantine_seconds: First quarantine period.
+        max_quarantine_seconds: Upper bound on the quarantine period.
+        stop_event: Set to stop the worker after its current step.
+        on_result: Optional callback invoked with each TaskResult.
+    """
+
+    def __init__(
+        self,
+        device: FleetDevice,
+        queue: TaskQueue,
+        stats: FleetStats,
+        agent_factory: Callable[[FleetDevice], Any],
+        max_steps: int = 100,
+        max_attempts: int = 2,
+        max_consecutive_failures: int = 3,
+        quarantine_seconds: float = 60.0,
+        max_quarantine_seconds: float = 1800.0,
+        stop_event: threading.Event | None = None,
+        on_result: Callable[[TaskResult], None] | None = None,
+    ):
+        super().__init__(name=f"fleet-{device.key}", daemon=True)
+        self.device = device
+        self.queue = queue
+        self.stats = stats
+        self.agent_factory = agent_factory
+        self.max_steps = max_steps
+        self.max_attempts = max_attempts
+        self.max_consecutive_failures = max_consecutive_failures
+        self.quarantine_seconds = quarantine_seconds
+        self.max_quarantine_seconds = max_quarantine_seconds
+        self.stop_event = stop_event or threading.Event()
+        self.on_result = on_result
+
+        self.consecutive_failures = 0
+        self.quarantine_count = 0
+        self.quarantined_until = 0.0
+        self._agent = None
+
+    @property
+    def quarantined(self) -> bool:
+        """Whether the device is currently sitting out."""
+        return time.monotonic() < self.quarantined_until
+
+    def run(self) -> None:
+        """Take and run tasks until the queue is drained or stop is set."""
+        while not self.stop_event.is_set():
+            if self.quarantined:
+                if self.queue.is_drained(self.device.device_id):
+                    return
+                self.stop_event.wait(
+                    min(_POLL_INTERVAL, self.quarantined_until - time.monotonic())
+                )
+                continue
+
+            task = self.queue.get(self.device.device_id, timeout=_POLL_INTERVAL)
+            if task is None:
+                if self.queue.is_drained(self.device.device_id):
+                    return
+                continue
+
+            self._run_task(task)
+
+    def _run_task(self, task: FleetTask) -> None:
+        """Run one task and record the outcome."""
+        task.attempts += 1
+        started_at = time.time()
+        start = time.perf_counter()
+        steps = 0
+
+        try:
+            agent = self._get_agent()
+            agent.reset()
+            max_steps = task.max_steps or self.max_steps
+            result = None
+            while steps < max_steps and not self.stop_event.is_set():
+                steps += 1
+                result = agent.step(task.task) if steps == 1 else agent.step()
+                if result.finished:
+                    break
+        except Exception as e:
+            logger.exception(
+                "Task %s failed on device %s", task.task_id, self.device.key
+            )
+            self._handle_failure(
+                task, e, started_at, time.perf_counter() - start, steps
+            )
+            return
+
+        self.consecutive_failures = 0
+        if result is not None and result.finished:
+            success = result.success
+            message = result.message or "Task completed"
+        elif self.stop_event.is_set():
+            success, message = False, "Stopped"
+        else:
+            success, message = False, "Max steps reached"
+
+        self._finish(
+            task,
+            TaskResult(
+                task_id=task.task_id,
+                task=task.task,
+                device_id=self.device.device_id,
+                success=success,
+                message=message,
+                steps=steps,
+                attempts=task.attempts,
+                started_at=started_at,
+                duration=time.perf_counter() - start,
+            ),
+        )
+
+    def _handle_failure(
+        self,
+        task: FleetTask,
+        error: Exception,
+        started_at: float,
+        duration: float,
+        steps: int,
+    ) -> None:
+        """Requeue or give up on a task after a device error; maybe quarantine."""
+        self.consecutive_failures += 1
+        quarantine = self.consecutive_failures >= self.max_consecutive_failures
+        if quarantine:
+            period = min(
+                self.quarantine_seconds * 2**self.quarantine_count,
+                self.max_quarantine_seconds,
+            )
+            self.quarantine_count += 1
+            self.consecutive_failures = 0
+            self.quarantined_until = time.monotonic() + period
+            # Start from a fresh agent (and connection state) after quarantine
+            self._agent = None
+            logger.warning(
+                "Device %s quarantined for %gs after repeated failures: %s",
+                self.device.key,
+                period,
+                error,
+            )
+        self.stats.record_failure(self.device.device_id, quarantined=quarantine)
+
+        if task.attempts < self.max_attempts:
+            self.queue.task_done(task, requeue=True)
+            return
+
+        self._finish(
+            task,
+            TaskResult(
+                task_id=task.task_id,
+                task=task.task,
+                device_id=self.device.device_id,
+                success=False,
+                message=f"Device error: {error}",
+                steps=steps,
+                attempts=task.attempts,
+                started_at=started_at,
+                duration=duration,
+                error=repr(error),
+            ),
+        )
+
+    def _finish(self, task: FleetTask, result: TaskResult) -> None:
+        """Record a final result and release the task."""
+        self.stats.record(result)
+        self.queue.task_done(task)
+        if self.on_result:
+            try:
+                self.on_result(result)
+            except Exception:
+                logger.exception("Result callback failed for task %s", task.task_id)
+
+    def _get_agent(self):
+        """Get this device's agent, creating it on first use."""
+        if self._agent is None:
+            self._agent = self.agent_factory(self.device)
+        return self._agent
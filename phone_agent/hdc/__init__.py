@@ -24,11 +24,12 @@ from phone_agent.hdc.input import (
     restore_keyboard,
     type_text,
 )
-from phone_agent.hdc.screenshot import get_screenshot
+from phone_agent.hdc.screenshot import get_frame_signature, get_screenshot
 
 __all__ = [
     # Screenshot
     "get_screenshot",
+    "get_frame_signature",
     # Input
     "type_text",
     "clear_text",
@@ -5,7 +5,7 @@ import subprocess
 import time
 from typing import List, Optional, Tuple
 
-from phone_agent.config.apps_harmonyos import APP_ABILITIES, APP_PACKAGES
+from phone_agent.config.apps_harmonyos import APP_ABILITIES, HARMONYOS_APPS
 from phone_agent.config.timing import TIMING_CONFIG
 from phone_agent.hdc.connection import _run_hdc_command
 import re
@@ -67,13 +67,11 @@ def get_current_app(device_id: str | None = None) -> str:
 
     # Match against known apps
     if foreground_bundle:
-        for app_name, package in APP_PACKAGES.items():
-            if package == foreground_bundle:
-                return app_name
+        app_name = HARMONYOS_APPS.get_app_name(foreground_bundle)
+        if app_name:
+            return app_name
         # If bundle is found but not in our known apps, return the bundle name
-        print(f'Bundle is found but not in our known apps: {foreground_bundle}')
         return foreground_bundle
-    print(f'No bundle is found')
     return "System Home"
 
 
@@ -269,13 +267,13 @@ def launch_app(
     if delay is None:
         delay = TIMING_CONFIG.device.default_launch_delay
 
-    if app_name not in APP_PACKAGES:
+    bundle = HARMONYOS_APPS.get_package(app_name)
+    if bundle is None:
         print(f"[HDC] App '{app_name}' not found in HarmonyOS app list")
-        print(f"[HDC] Available apps: {', '.join(sorted(APP_PACKAGES.keys())[:10])}...")
+        print(f"[HDC] Available apps: {', '.join(sorted(HARMONYOS_APPS.list_apps())[:10])}...")
         return False
 
     hdc_prefix = _get_hdc_prefix(device_id)
-    bundle = APP_PACKAGES[app_name]
 
     # Get the ability name for this bundle
     # Default to "EntryAbility" if not specified in APP_ABILITIES
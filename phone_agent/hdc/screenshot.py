@@ -1,16 +1,18 @@
 """Screenshot utilities for capturing HarmonyOS device screen."""
 
-import base64
 import os
 import subprocess
 import tempfile
 import uuid
 from dataclasses import dataclass
-from io import BytesIO
 from typing import Tuple
 
-from PIL import Image
 from phone_agent.hdc.connection import _run_hdc_command
+from phone_agent.imaging import (
+    ScreenshotEncodingConfig,
+    create_blank_image,
+    prepare_image,
+)
 
 
 @dataclass
@@ -21,15 +23,22 @@ class Screenshot:
     width: int
     height: int
     is_sensitive: bool = False
+    mime_type: str = "image/png"
 
 
-def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screenshot:
+def get_screenshot(
+    device_id: str | None = None,
+    timeout: int = 10,
+    encoding: ScreenshotEncodingConfig | None = None,
+) -> Screenshot:
     """
     Capture a screenshot from the connected HarmonyOS device.
 
     Args:
         device_id: Optional HDC device ID for multi-device setups.
         timeout: Timeout in seconds for screenshot operations.
+        encoding: Encoding of the image sent to the model. If None, the
+            captured JPEG is passed through as-is.
 
     Returns:
         Screenshot object containing base64 data and dimensions.
@@ -80,20 +89,19 @@ def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screensho
         if not os.path.exists(temp_path):
             return _create_fallback_screenshot(is_sensitive=False)
 
-        # Read JPEG image and convert to PNG for model inference
-        # PIL automatically detects the image format from file content
-        img = Image.open(temp_path)
-        width, height = img.size
-
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
+        # Send the JPEG as-is unless another encoding is requested
+        with open(temp_path, "rb") as f:
+            image = prepare_image(f.read(), encoding)
 
         # Cleanup
         os.remove(temp_path)
 
         return Screenshot(
-            base64_data=base64_data, width=width, height=height, is_sensitive=False
+            base64_data=image.base64_data,
+            width=image.width,
+            height=image.height,
+            is_sensitive=False,
+            mime_type=image.mime_type,
         )
 
     except Exception as e:
@@ -101,6 +109,36 @@ def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screensho
         return _create_fallback_screenshot(is_sensitive=False)
 
 
+def get_frame_signature(device_id: str | None = None, timeout: int = 5) -> str | None:
+    """
+    Get a cheap signature of the current frame for change detection.
+
+    The snapshot is hashed on the device, so only the digest is transferred.
+
+    Args:
+        device_id: Optional HDC device ID.
+        timeout: Timeout in seconds.
+
+    Returns:
+        Hex digest of the frame, or None if it could not be computed.
+    """
+    remote_path = "/data/local/tmp/settle_snapshot.jpeg"
+    result = _run_hdc_command(
+        _get_hdc_prefix(device_id)
+        + [
+            "shell",
+            f"snapshot_display -f {remote_path} > /dev/null && md5sum {remote_path}",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    output = result.stdout.split()
+    if output and len(output[0]) == 32:
+        return output[0]
+    return None
+
+
 def _get_hdc_prefix(device_id: str | None) -> list:
     """Get HDC command prefix with optional device specifier."""
     if device_id:
@@ -110,16 +148,12 @@ def _get_hdc_prefix(device_id: str | None) -> list:
 
 def _create_fallback_screenshot(is_sensitive: bool) -> Screenshot:
     """Create a black fallback image when screenshot fails."""
-    default_width, default_height = 1080, 2400
-
-    black_img = Image.new("RGB", (default_width, default_height), color="black")
-    buffered = BytesIO()
-    black_img.save(buffered, format="PNG")
-    base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
+    image = create_blank_image(1080, 2400)
 
     return Screenshot(
-        base64_data=base64_data,
-        width=default_width,
-        height=default_height,
+        base64_data=image.base64_data,
+        width=image.width,
+        height=image.height,
         is_sensitive=is_sensitive,
+        mime_type=image.mime_type,
     )
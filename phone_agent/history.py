@@ -0,0 +1,154 @@
+"""Conversation history policies that bound the prompt sent each step."""
+
+import os
+import re
+from typing import Any
+
+# Rough prompt cost of one screenshot; identical with or without compaction
+_IMAGE_TOKENS = 1000
+
+_THINK_PATTERN = re.compile(r"<think>.*?</think>", re.DOTALL)
+_CJK_PATTERN = re.compile(r"[\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+
+
+def estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """
+    Estimate the prompt tokens of a message list without a tokenizer.
+
+    CJK characters count as one token each and other text as one token per
+    four characters, which is close enough to compare prompts.
+
+    Args:
+        messages: Messages in OpenAI format.
+
+    Returns:
+        Estimated token count.
+    """
+    total = 0
+    for message in messages:
+        total += 4  # Role and message framing
+        content = message.get("content")
+        if isinstance(content, str):
+            total += _estimate_text(content)
+            continue
+        for item in content or []:
+            if item.get("type") == "text":
+                total += _estimate_text(item["text"])
+            else:
+                total += _IMAGE_TOKENS
+    return total
+
+
+def _estimate_text(text: str) -> int:
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+class HistoryPolicy:
+    """
+    Decides which part of the conversation is sent to the model each step.
+
+    The agent keeps the full conversation and passes it to compact() before
+    every request. The default keeps everything.
+    """
+
+    def compact(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Build the messages to send for this step.
+
+        Args:
+            messages: Full conversation: system message, then alternating
+                user and assistant messages, ending with the current user turn.
+
+        Returns:
+            Messages to send. Must not modify the input.
+        """
+        return messages
+
+
+class RollingHistoryPolicy(HistoryPolicy):
+    """
+    Keeps recent turns verbatim and collapses older ones into an action log.
+
+    The system message, the task message and the last keep_turns assistant
+    turns are sent unchanged. Older assistant turns lose their <think> block,
+    leaving just the action taken, next to the small screen-info messages
+    between them. If max_tokens is set, the oldest collapsed turns are then
+    dropped until the estimate fits; recent turns are never dropped.
+
+    Args:
+        keep_turns: Number of recent assistant turns sent verbatim.
+        max_tokens: Optional cap on the estimated prompt tokens.
+    """
+
+    def __init__(self, keep_turns: int = 4, max_tokens: int | None = None):
+        self.keep_turns = keep_turns
+        self.max_tokens = max_tokens
+
+    def compact(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # Head is the system and task messages; the rest alternates
+        # assistant, user, ..., user
+        head, turns = messages[:2], messages[2:]
+        assistant_count = len(turns) // 2
+        collapse = max(0, assistant_count - self.keep_turns)
+        if collapse == 0:
+            return messages
+
+        collapsed = []
+        for index, message in enumerate(turns[: collapse * 2]):
+            if index % 2 == 0 and message.get("role") == "assistant":
+                message = {**message, "content": _strip_thinking(message["content"])}
+            collapsed.append(message)
+        recent = turns[collapse * 2 :]
+
+        if self.max_tokens is not None:
+            budget = self.max_tokens - estimate_tokens(head) - estimate_tokens(recent)
+            # Drop assistant/user pairs from the front to keep roles alternating
+            while collapsed and estimate_tokens(collapsed) > budget:
+                collapsed = collapsed[2:]
+
+        return head + collapsed + recent
+
+
+def _strip_thinking(content: Any) -> Any:
+    if not isinstance(content, str):
+        return content
+    return _THINK_PATTERN.sub("", content).strip()
+
+
+def compact_history(
+    policy: HistoryPolicy, messages: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Apply a history policy and measure what it saved.
+
+    Args:
+        policy: History policy.
+        messages: Full conversation.
+
+    Returns:
+        Tuple of (messages to send, estimated prompt tokens saved).
+    """
+    compacted = policy.compact(messages)
+    if compacted is messages:
+        return messages, 0
+    return compacted, estimate_tokens(messages) - estimate_tokens(compacted)
+
+
+def get_default_history_policy() -> HistoryPolicy:
+    """
+    Build the history policy from environment variables.
+
+    PHONE_AGENT_HISTORY_KEEP_TURNS enables RollingHistoryPolicy with that many
+    verbatim turns (default 0: send the full history), and
+    PHONE_AGENT_HISTORY_MAX_TOKENS caps the estimated prompt size (keeping
+    4 verbatim turns unless set otherwise).
+    """
+    keep_turns = int(os.getenv("PHONE_AGENT_HISTORY_KEEP_TURNS", "0"))
+    max_tokens = os.getenv("PHONE_AGENT_HISTORY_MAX_TOKENS")
+    if keep_turns <= 0 and not max_tokens:
+        return HistoryPolicy()
+    return RollingHistoryPolicy(
+        keep_turns=keep_turns if keep_turns > 0 else 4,
+        max_tokens=int(max_tokens) if max_tokens else None,
+    )
@@ -0,0 +1,311 @@
+"""Image encoding helpers shared by the screenshot backends."""
+
+import base64
+import os
+import struct
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from io import BytesIO
+
+from PIL import Image
+
+_RESAMPLE_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "box": Image.Resampling.BOX,
+    "bilinear": Image.Resampling.BILINEAR,
+    "hamming": Image.Resampling.HAMMING,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+
+_MIME_TYPES = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8"
+
+# JPEG start-of-frame markers carry the dimensions (DHT, JPG and DAC excluded)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+@dataclass
+class ScreenshotEncodingConfig:
+    """Configuration for how screenshots are encoded before being sent out."""
+
+    image_format: str = "PNG"  # PNG, JPEG or WEBP
+    quality: int = 85  # Quality for lossy formats (1-100)
+    max_long_edge: int | None = None  # Downscale to fit, None keeps full size
+    resample: str = "bilinear"  # Resampling filter used when downscaling
+    png_compress_level: int = 6  # zlib level for PNG (0-9), lower is faster
+
+    def __post_init__(self):
+        """Load values from environment variables if present, then validate."""
+        self.image_format = os.getenv(
+            "PHONE_AGENT_SCREENSHOT_FORMAT", self.image_format
+        ).upper()
+        self.quality = int(os.getenv("PHONE_AGENT_SCREENSHOT_QUALITY", self.quality))
+        max_long_edge = os.getenv("PHONE_AGENT_SCREENSHOT_MAX_EDGE")
+        if max_long_edge:
+            self.max_long_edge = int(max_long_edge)
+        self.resample = os.getenv(
+            "PHONE_AGENT_SCREENSHOT_RESAMPLE", self.resample
+        ).lower()
+
+        if self.image_format == "JPG":
+            self.image_format = "JPEG"
+        if self.image_format not in _MIME_TYPES:
+            raise ValueError(f"Unsupported screenshot format: {self.image_format}")
+        if self.resample not in _RESAMPLE_FILTERS:
+            raise ValueError(f"Unknown resampling filter: {self.resample}")
+
+    @property
+    def mime_type(self) -> str:
+        """MIME type of the encoded image."""
+        return _MIME_TYPES[self.image_format]
+
+
+def get_target_size(
+    width: int, height: int, max_long_edge: int | None
+) -> tuple[int, int]:
+    """
+    Compute the size that fits within max_long_edge, preserving aspect ratio.
+
+    Args:
+        width: Source width in pixels.
+        height: Source height in pixels.
+        max_long_edge: Maximum length of the longer side, None for no limit.
+
+    Returns:
+        Tuple of (width, height). Images are never upscaled.
+    """
+    long_edge = max(width, height)
+    if not max_long_edge or long_edge <= max_long_edge:
+        return width, height
+
+    scale = max_long_edge / long_edge
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def encode_image(img: Image.Image, config: ScreenshotEncodingConfig) -> bytes:
+    """
+    Downscale and encode an image according to the encoding config.
+
+    Args:
+        img: Source image. Any mode; alpha is dropped.
+        config: Encoding configuration.
+
+    Returns:
+        Encoded image bytes.
+    """
+    target_size = get_target_size(img.width, img.height, config.max_long_edge)
+    if target_size != img.size:
+        img = img.resize(target_size, _RESAMPLE_FILTERS[config.resample])
+
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    buffered = BytesIO()
+    if config.image_format == "PNG":
+        img.save(buffered, format="PNG", compress_level=config.png_compress_level)
+    else:
+        img.save(buffered, format=config.image_format, quality=config.quality)
+    return buffered.getvalue()
+
+
+@dataclass
+class EncodedImage:
+    """An encoded image ready to be sent to the model."""
+
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+
+    @cached_property
+    def base64_data(self) -> str:
+        """Base64 representation of the encoded bytes."""
+        return base64.b64encode(self.data).decode("utf-8")
+
+
+def get_mime_type(image_format: str) -> str | None:
+    """
+    Get the MIME type for an image format the model accepts.
+
+    Args:
+        image_format: PIL format name (e.g. "PNG", "JPEG").
+
+    Returns:
+        MIME type, or None if the format has to be converted first.
+    """
+    return _MIME_TYPES.get(image_format.upper())
+
+
+def probe_image(data: bytes) -> tuple[str, int, int] | None:
+    """
+    Read the format and dimensions from an image header.
+
+    PNG and JPEG headers are parsed directly; other formats fall back to
+    PIL, which also only reads the header until pixel data is requested.
+
+    Args:
+        data: Encoded image bytes. A prefix is enough for PNG.
+
+    Returns:
+        Tuple of (format, width, height), or None if the header is incomplete
+        or not a recognized image.
+    """
+    if data.startswith(PNG_SIGNATURE):
+        if len(data) < 24:
+            return None
+        width, height = struct.unpack_from(">II", data, 16)
+        return "PNG", width, height
+
+    if data.startswith(JPEG_SIGNATURE):
+        return _probe_jpeg(data)
+
+    try:
+        with Image.open(BytesIO(data)) as img:
+            return img.format, img.width, img.height
+    except Exception:
+        return None
+
+
+def _probe_jpeg(data: bytes) -> tuple[str, int, int] | None:
+    """Walk JPEG segments until the start-of-frame marker."""
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # Fill byte
+            pos += 1
+            continue
+        if marker in (0x01, *range(0xD0, 0xD9)):  # Standalone markers
+            pos += 2
+            continue
+
+        (length,) = struct.unpack_from(">H", data, pos + 2)
+        if marker in _JPEG_SOF_MARKERS:
+            if pos + 9 > len(data):
+                return None
+            height, width = struct.unpack_from(">HH", data, pos + 5)
+            return "JPEG", width, height
+        pos += 2 + length
+
+    return None
+
+
+def probe_base64_image(base64_data: str) -> tuple[str, int, int] | None:
+    """
+    Read the format and dimensions of a base64-encoded image.
+
+    Only a short prefix is decoded when the header is found there, which is
+    always the case for PNG.
+
+    Args:
+        base64_data: Base64-encoded image.
+
+    Returns:
+        Tuple of (format, width, height), or None if not a recognized image.
+    """
+    prefix = base64_data[:4096]
+    info = probe_image(base64.b64decode(prefix[: len(prefix) // 4 * 4]))
+    if info is None and len(base64_data) > len(prefix):
+        info = probe_image(base64.b64decode(base64_data))
+    return info
+
+
+def needs_transcode(
+    image_format: str,
+    width: int,
+    height: int,
+    config: ScreenshotEncodingConfig | None = None,
+) -> bool:
+    """
+    Check whether a captured image has to be decoded and encoded again.
+
+    Args:
+        image_format: PIL format name of the captured image.
+        width: Captured width in pixels.
+        height: Captured height in pixels.
+        config: Target encoding. If None, any format the model accepts is kept.
+
+    Returns:
+        True if the image must be transcoded, False if it can pass through.
+    """
+    if config is None:
+        return get_mime_type(image_format) is None
+    if image_format != config.image_format:
+        return True
+    return get_target_size(width, height, config.max_long_edge) != (width, height)
+
+
+def prepare_image(
+    data: bytes, config: ScreenshotEncodingConfig | None = None
+) -> EncodedImage:
+    """
+    Turn captured image bytes into a model-ready image.
+
+    Bytes that already match the requested encoding are passed through
+    unchanged, with only the header read for dimensions. Anything else is
+    decoded once and encoded with the config (PNG if no config is given).
+
+    Args:
+        data: Captured image bytes.
+        config: Target encoding. If None, any format the model accepts is kept.
+
+    Returns:
+        EncodedImage. Its width and height are those of the captured image,
+        even when the encoded image was downscaled.
+
+    Raises:
+        ValueError: If the data is not a readable image.
+    """
+    info = probe_image(data)
+    if info is None:
+        raise ValueError("Unrecognized image data")
+
+    image_format, width, height = info
+    if not needs_transcode(image_format, width, height, config):
+        return EncodedImage(data, _MIME_TYPES[image_format], width, height)
+
+    with Image.open(BytesIO(data)) as img:
+        if config is None:
+            buffered = BytesIO()
+            img.convert("RGB").save(buffered, format="PNG")
+            return EncodedImage(buffered.getvalue(), _MIME_TYPES["PNG"], width, height)
+        return EncodedImage(encode_image(img, config), config.mime_type, width, height)
+
+
+def get_base64_size(base64_data: str) -> int:
+    """
+    Get the number of bytes encoded in a base64 string without decoding it.
+
+    Args:
+        base64_data: Base64-encoded data.
+
+    Returns:
+        Decoded size in bytes.
+    """
+    return len(base64_data) * 3 // 4 - base64_data[-2:].count("=")
+
+
+@lru_cache(maxsize=4)
+def create_blank_image(width: int, height: int) -> EncodedImage:
+    """
+    Create a black PNG placeholder, cached per size.
+
+    Args:
+        width: Image width in pixels.
+        height: Image height in pixels.
+
+    Returns:
+        EncodedImage of a black frame.
+    """
+    black_img = Image.new("RGB", (width, height), color="black")
+    buffered = BytesIO()
+    black_img.save(buffered, format="PNG")
+    return EncodedImage(buffered.getvalue(), _MIME_TYPES["PNG"], width, height)
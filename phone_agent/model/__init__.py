@@ -1,5 +1,23 @@
 """Model client module for AI inference."""
 
-from phone_agent.model.client import ModelClient, ModelConfig
+from phone_agent.imaging import ScreenshotEncodingConfig
+from phone_agent.model.client import AsyncModelClient, ModelClient, ModelConfig
+from phone_agent.model.scheduler import (
+    ModelScheduler,
+    Priority,
+    SchedulerStats,
+    get_model_scheduler,
+    set_model_scheduler,
+)
 
-__all__ = ["ModelClient", "ModelConfig"]
+__all__ = [
+    "ModelClient",
+    "AsyncModelClient",
+    "ModelConfig",
+    "ScreenshotEncodingConfig",
+    "ModelScheduler",
+    "Priority",
+    "SchedulerStats",
+    "get_model_scheduler",
+    "set_model_scheduler",
+]
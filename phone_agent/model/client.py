@@ -1,13 +1,19 @@
 """Model client for AI inference using OpenAI-compatible API."""
 
 import json
+import re
 import time
 from dataclasses import dataclass, field
 from typing import Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-from phone_agent.config.i18n import get_message
+from phone_agent.imaging import ScreenshotEncodingConfig
+from phone_agent.model.scheduler import ModelScheduler, Priority, get_model_scheduler
+from phone_agent.observer import AgentObserver
+
+# Used when a request has no observer
+_SILENT_OBSERVER = AgentObserver()
 
 
 @dataclass
@@ -23,6 +29,15 @@ class ModelConfig:
     frequency_penalty: float = 0.2
     extra_body: dict[str, Any] = field(default_factory=dict)
     lang: str = "cn"  # Language for UI messages: 'cn' or 'en'
+    # Image encoding sent to the model; None passes device captures through
+    screenshot_encoding: ScreenshotEncodingConfig | None = None
+    # Scheduling class for the shared model scheduler
+    priority: Priority = Priority.INTERACTIVE
+    # Stop reading the stream once a do(...) call closes, skipping trailing tokens
+    stop_at_action_end: bool = True
+    # Sent as prompt_cache_key so servers that route or cache by key can keep
+    # requests sharing the system prompt together
+    prompt_cache_key: str | None = None
 
 
 @dataclass
@@ -35,27 +50,48 @@ class ModelResponse:
     # Performance metrics
     time_to_first_token: float | None = None  # Time to first token (seconds)
     time_to_thinking_end: float | None = None  # Time to thinking end (seconds)
+    time_to_action_end: float | None = None  # Time to the action's closing paren
     total_time: float | None = None  # Total inference time (seconds)
+    # Whether the stream was closed at the action end; if not, the time after
+    # time_to_action_end was spent reading tokens the action did not need
+    stopped_early: bool = False
+    queue_wait: float | None = None  # Time waiting for a scheduler slot (seconds)
 
 
 class ModelClient:
     """
     Client for interacting with OpenAI-compatible vision-language models.
 
+    Requests wait for a slot on the model scheduler, so clients in the same
+    process share one bound on concurrent requests.
+
     Args:
         config: Model configuration.
+        scheduler: Optional scheduler. If None, uses the process-wide one.
     """
 
-    def __init__(self, config: ModelConfig | None = None):
+    def __init__(
+        self,
+        config: ModelConfig | None = None,
+        scheduler: ModelScheduler | None = None,
+    ):
         self.config = config or ModelConfig()
+        self.scheduler = scheduler
         self.client = OpenAI(base_url=self.config.base_url, api_key=self.config.api_key)
 
-    def request(self, messages: list[dict[str, Any]]) -> ModelResponse:
+    def request(
+        self,
+        messages: list[dict[str, Any]],
+        device_id: str | None = None,
+        observer: AgentObserver | None = None,
+    ) -> ModelResponse:
         """
         Send a request to the model.
 
         Args:
             messages: List of message dictionaries in OpenAI format.
+            device_id: Device the request is for, used for fair scheduling.
+            observer: Optional observer for the thinking stream and metrics.
 
         Returns:
             ModelResponse containing thinking and action.
@@ -63,157 +99,349 @@ class ModelClient:
         Raises:
             ValueError: If the response cannot be parsed.
         """
-        # Start timing
-        start_time = time.time()
-        time_to_first_token = None
-        time_to_thinking_end = None
-
-        stream = self.client.chat.completions.create(
-            messages=messages,
-            model=self.config.model_name,
-            max_tokens=self.config.max_tokens,
-            temperature=self.config.temperature,
-            top_p=self.config.top_p,
-            frequency_penalty=self.config.frequency_penalty,
-            extra_body=self.config.extra_body,
-            stream=True,
+        scheduler = self.scheduler or get_model_scheduler()
+        with scheduler.slot(device_id, self.config.priority) as ticket:
+            processor = _StreamProcessor(observer)
+
+            stream = self.client.chat.completions.create(
+                **_build_request_kwargs(self.config, messages)
+            )
+
+            for chunk in stream:
+                content = _get_delta_content(chunk)
+                if content is not None:
+                    processor.feed(content)
+                if processor.action_complete and self.config.stop_at_action_end:
+                    stream.close()
+                    processor.stopped_early = True
+                    break
+
+        response = processor.finish()
+        response.queue_wait = ticket.queue_wait
+        return response
+
+    def _parse_response(self, content: str) -> tuple[str, str]:
+        """Parse the model response into thinking and action parts."""
+        return _parse_response(content)
+
+
+class AsyncModelClient:
+    """
+    Asyncio client for OpenAI-compatible vision-language models.
+
+    Streams responses with the same parsing and timing semantics as
+    ModelClient, so many agents can share one event loop.
+
+    Args:
+        config: Model configuration.
+        scheduler: Optional scheduler. If None, uses the process-wide one.
+    """
+
+    def __init__(
+        self,
+        config: ModelConfig | None = None,
+        scheduler: ModelScheduler | None = None,
+    ):
+        self.config = config or ModelConfig()
+        self.scheduler = scheduler
+        self.client = AsyncOpenAI(
+            base_url=self.config.base_url, api_key=self.config.api_key
         )
 
-        raw_content = ""
-        buffer = ""  # Buffer to hold content that might be part of a marker
-        action_markers = ["finish(message=", "do(action="]
-        in_action_phase = False  # Track if we've entered the action phase
-        first_token_received = False
-
-        for chunk in stream:
-            if len(chunk.choices) == 0:
-                continue
-            if chunk.choices[0].delta.content is not None:
-                content = chunk.choices[0].delta.content
-                raw_content += content
-
-                # Record time to first token
-                if not first_token_received:
-                    time_to_first_token = time.time() - start_time
-                    first_token_received = True
-
-                if in_action_phase:
-                    # Already in action phase, just accumulate content without printing
-                    continue
-
-                buffer += content
-
-                # Check if any marker is fully present in buffer
-                marker_found = False
-                for marker in action_markers:
-                    if marker in buffer:
-                        # Marker found, print everything before it
-                        thinking_part = buffer.split(marker, 1)[0]
-                        print(thinking_part, end="", flush=True)
-                        print()  # Print newline after thinking is complete
-                        in_action_phase = True
-                        marker_found = True
-
-                        # Record time to thinking end
-                        if time_to_thinking_end is None:
-                            time_to_thinking_end = time.time() - start_time
-
-                        break
-
-                if marker_found:
-                    continue  # Continue to collect remaining content
-
-                # Check if buffer ends with a prefix of any marker
-                # If so, don't print yet (wait for more content)
-                is_potential_marker = False
-                for marker in action_markers:
-                    for i in range(1, len(marker)):
-                        if buffer.endswith(marker[:i]):
-                            is_potential_marker = True
-                            break
-                    if is_potential_marker:
-                        break
-
-                if not is_potential_marker:
-                    # Safe to print the buffer
-                    print(buffer, end="", flush=True)
-                    buffer = ""
-
-        # Calculate total time
-        total_time = time.time() - start_time
+    async def request(
+        self,
+        messages: list[dict[str, Any]],
+        device_id: str | None = None,
+        observer: AgentObserver | None = None,
+    ) -> ModelResponse:
+        """
+        Send a request to the model.
 
-        # Parse thinking and action from response
-        thinking, action = self._parse_response(raw_content)
-
-        # Print performance metrics
-        lang = self.config.lang
-        print()
-        print("=" * 50)
-        print(f"⏱️  {get_message('performance_metrics', lang)}:")
-        print("-" * 50)
-        if time_to_first_token is not None:
-            print(
-                f"{get_message('time_to_first_token', lang)}: {time_to_first_token:.3f}s"
-            )
-        if time_to_thinking_end is not None:
-            print(
-                f"{get_message('time_to_thinking_end', lang)}:        {time_to_thinking_end:.3f}s"
+        Args:
+            messages: List of message dictionaries in OpenAI format.
+            device_id: Device the request is for, used for fair scheduling.
+            observer: Optional observer for the thinking stream and metrics.
+
+        Returns:
+            ModelResponse containing thinking and action.
+        """
+        scheduler = self.scheduler or get_model_scheduler()
+        async with scheduler.slot_async(device_id, self.config.priority) as ticket:
+            processor = _StreamProcessor(observer)
+
+            stream = await self.client.chat.completions.create(
+                **_build_request_kwargs(self.config, messages)
             )
-        print(
-            f"{get_message('total_inference_time', lang)}:          {total_time:.3f}s"
-        )
-        print("=" * 50)
 
-        return ModelResponse(
+            async for chunk in stream:
+                content = _get_delta_content(chunk)
+                if content is not None:
+                    processor.feed(content)
+                if processor.action_complete and self.config.stop_at_action_end:
+                    await stream.close()
+                    processor.stopped_early = True
+                    break
+
+        response = processor.finish()
+        response.queue_wait = ticket.queue_wait
+        return response
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connections."""
+        await self.client.close()
+
+
+class _StreamProcessor:
+    """
+    Accumulates a streamed response and finds where the thinking ends.
+
+    Thinking text is passed to the observer as it arrives when the observer
+    streams it; otherwise only the tail that could hold a partial action
+    marker is kept between chunks. Once the action starts, an _ActionScanner
+    watches for the call to close so the caller can stop reading and execute
+    it right away.
+
+    Args:
+        observer: Observer for the thinking stream and the final response.
+            If None, nothing is reported.
+    """
+
+    ACTION_MARKERS = ["finish(message=", "do(action="]
+    # Longest tail that can be the start of a marker split across chunks
+    _MARKER_TAIL = max(len(marker) for marker in ACTION_MARKERS) - 1
+
+    def __init__(self, observer: AgentObserver | None = None):
+        self.observer = observer or _SILENT_OBSERVER
+        self.start_time = time.time()
+        self.time_to_first_token = None
+        self.time_to_thinking_end = None
+        self.time_to_action_end = None
+        self.stopped_early = False  # Set by the caller when it closes the stream
+        self._chunks: list[str] = []
+        self._buffer = ""  # Buffer to hold content that might be part of a marker
+        self._in_action_phase = False  # Track if we've entered the action phase
+        self._scanner: _ActionScanner | None = None
+
+    @property
+    def raw_content(self) -> str:
+        """Everything received so far."""
+        return "".join(self._chunks)
+
+    @property
+    def action_complete(self) -> bool:
+        """Whether a complete action call has been received."""
+        return self.time_to_action_end is not None
+
+    def feed(self, content: str) -> None:
+        """Process one streamed content delta."""
+        self._chunks.append(content)
+
+        # Record time to first token
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.time() - self.start_time
+
+        if self._in_action_phase:
+            # Already in action phase, just accumulate content
+            self._scan_action(content)
+            return
+
+        self._buffer += content
+
+        # Check if any marker is fully present in buffer
+        for marker in self.ACTION_MARKERS:
+            if marker in self._buffer:
+                thinking_part, rest = self._buffer.split(marker, 1)
+                if self.observer.streams_thinking:
+                    self.observer.on_thinking(thinking_part)
+                self._in_action_phase = True
+                self._buffer = ""
+
+                # Record time to thinking end
+                self.time_to_thinking_end = time.time() - self.start_time
+
+                self._scanner = _ActionScanner()
+                self._scan_action(marker + rest)
+                return
+
+        if not self.observer.streams_thinking:
+            self._buffer = self._buffer[-self._MARKER_TAIL :]
+            return
+
+        # Hold back a tail that could be the start of a marker
+        for marker in self.ACTION_MARKERS:
+            for i in range(1, len(marker)):
+                if self._buffer.endswith(marker[:i]):
+                    return
+
+        self.observer.on_thinking(self._buffer)
+        self._buffer = ""
+
+    def _scan_action(self, content: str) -> None:
+        """Feed action text to the scanner and note when the call closes."""
+        if self._scanner is None or self.action_complete:
+            return
+        if self._scanner.feed(content):
+            self.time_to_action_end = time.time() - self.start_time
+
+    def finish(self) -> ModelResponse:
+        """Parse the accumulated content and report timings."""
+        total_time = time.time() - self.start_time
+        raw_content = self.raw_content
+
+        # Parse thinking and action from response
+        thinking, action = _parse_response(raw_content)
+        if self._scanner is not None and self._scanner.complete:
+            # Drop anything after the call, e.g. a closing </answer> tag
+            action = self._scanner.text
+
+        response = ModelResponse(
             thinking=thinking,
             action=action,
             raw_content=raw_content,
-            time_to_first_token=time_to_first_token,
-            time_to_thinking_end=time_to_thinking_end,
+            time_to_first_token=self.time_to_first_token,
+            time_to_thinking_end=self.time_to_thinking_end,
+            time_to_action_end=self.time_to_action_end,
             total_time=total_time,
+            stopped_early=self.stopped_early,
         )
+        self.observer.on_model_response(response)
+        return response
 
-    def _parse_response(self, content: str) -> tuple[str, str]:
-        """
-        Parse the model response into thinking and action parts.
 
-        Parsing rules:
-        1. If content contains 'finish(message=', everything before is thinking,
-           everything from 'finish(message=' onwards is action.
-        2. If rule 1 doesn't apply but content contains 'do(action=',
-           everything before is thinking, everything from 'do(action=' onwards is action.
-        3. Fallback: If content contains '<answer>', use legacy parsing with XML tags.
-        4. Otherwise, return empty thinking and full content as action.
+class _ActionScanner:
+    """
+    Finds the end of a streamed action call.
+
+    Tracks string literals and bracket depth so parentheses inside arguments
+    do not end the call early. Type/Type_Name text and finish messages are
+    free text that the action parser reads leniently (up to the last `")`),
+    and may contain unescaped quotes, so bracket depth says nothing there.
+    Those calls end at a `")` followed by the closing </answer> tag; without
+    the tag the stream is read to the end.
+    """
+
+    _FREE_TEXT_PREFIXES = ('do(action="Type', "finish(")
+    _FREE_TEXT_END = re.compile(r'"\)\s*</answer>')
+
+    def __init__(self):
+        self.text = ""
+        self.complete = False
+        self._scanned = 0  # Characters of text seen by the bracket scan
+        self._depth = 0
+        self._quote: str | None = None
+        self._escaped = False
+
+    def feed(self, content: str) -> bool:
+        """
+        Scan more action text.
 
         Args:
-            content: Raw response content.
+            content: Next chunk of the action.
 
         Returns:
-            Tuple of (thinking, action).
+            True once the call has closed.
         """
-        # Rule 1: Check for finish(message=
-        if "finish(message=" in content:
-            parts = content.split("finish(message=", 1)
-            thinking = parts[0].strip()
-            action = "finish(message=" + parts[1]
-            return thinking, action
-
-        # Rule 2: Check for do(action=
-        if "do(action=" in content:
-            parts = content.split("do(action=", 1)
-            thinking = parts[0].strip()
-            action = "do(action=" + parts[1]
-            return thinking, action
-
-        # Rule 3: Fallback to legacy XML tag parsing
-        if "<answer>" in content:
-            parts = content.split("<answer>", 1)
-            thinking = parts[0].replace("<think>", "").replace("</think>", "").strip()
-            action = parts[1].replace("</answer>", "").strip()
-            return thinking, action
-
-        # Rule 4: No markers found, return content as action
-        return "", content
+        if self.complete:
+            return True
+
+        self.text += content
+        if self.text.startswith(self._FREE_TEXT_PREFIXES):
+            match = self._FREE_TEXT_END.search(self.text)
+            if match is not None:
+                self.text = self.text[: match.start() + 2]
+                self.complete = True
+            return self.complete
+
+        for index in range(self._scanned, len(self.text)):
+            char = self.text[index]
+            if self._quote is not None:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == self._quote:
+                    self._quote = None
+            elif char in "\"'":
+                self._quote = char
+            elif char in "([{":
+                self._depth += 1
+            elif char in ")]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.text = self.text[: index + 1]
+                    self.complete = True
+                    return True
+        self._scanned = len(self.text)
+        return False
+
+
+def _build_request_kwargs(
+    config: ModelConfig, messages: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Build the streaming chat completion arguments for a request."""
+    kwargs = {
+        "messages": messages,
+        "model": config.model_name,
+        "max_tokens": config.max_tokens,
+        "temperature": config.temperature,
+        "top_p": config.top_p,
+        "frequency_penalty": config.frequency_penalty,
+        "extra_body": config.extra_body,
+        "stream": True,
+    }
+    if config.prompt_cache_key:
+        kwargs["prompt_cache_key"] = config.prompt_cache_key
+    return kwargs
+
+
+def _get_delta_content(chunk: Any) -> str | None:
+    """Get the content delta of a streamed chunk, if any."""
+    if len(chunk.choices) == 0:
+        return None
+    return chunk.choices[0].delta.content
+
+
+def _parse_response(content: str) -> tuple[str, str]:
+    """
+    Parse the model response into thinking and action parts.
+
+    Parsing rules:
+    1. If content contains 'finish(message=', everything before is thinking,
+       everything from 'finish(message=' onwards is action.
+    2. If rule 1 doesn't apply but content contains 'do(action=',
+       everything before is thinking, everything from 'do(action=' onwards is action.
+    3. Fallback: If content contains '<answer>', use legacy parsing with XML tags.
+    4. Otherwise, return empty thinking and full content as action.
+
+    Args:
+        content: Raw response content.
+
+    Returns:
+        Tuple of (thinking, action).
+    """
+    # Rule 1: Check for finish(message=
+    if "finish(message=" in content:
+        parts = content.split("finish(message=", 1)
+        thinking = parts[0].strip()
+        action = "finish(message=" + parts[1]
+        return thinking, action
+
+    # Rule 2: Check for do(action=
+    if "do(action=" in content:
+        parts = content.split("do(action=", 1)
+        thinking = parts[0].strip()
+        action = "do(action=" + parts[1]
+        return thinking, action
+
+    # Rule 3: Fallback to legacy XML tag parsing
+    if "<answer>" in content:
+        parts = content.split("<answer>", 1)
+        thinking = parts[0].replace("<think>", "").replace("</think>", "").strip()
+        action = parts[1].replace("</answer>", "").strip()
+        return thinking, action
+
+    # Rule 4: No markers found, return content as action
+    return "", content
 
 
 class MessageBuilder:
@@ -226,7 +454,7 @@ class MessageBuilder:
 
     @staticmethod
     def create_user_message(
-        text: str, image_base64: str | None = None
+        text: str, image_base64: str | None = None, mime_type: str = "image/png"
     ) -> dict[str, Any]:
         """
         Create a user message with optional image.
@@ -234,6 +462,7 @@ class MessageBuilder:
         Args:
             text: Text content.
             image_base64: Optional base64-encoded image.
+            mime_type: MIME type of the encoded image.
 
         Returns:
             Message dictionary.
@@ -244,7 +473,7 @@ class MessageBuilder:
             content.append(
                 {
                     "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{image_base64}"},
+                    "image_url": {"url": f"data:{mime_type};base64,{image_base64}"},
                 }
             )
 
@@ -0,0 +1,298 @@
+"""Process-wide scheduler that bounds concurrent model requests."""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Callable, Iterator
+
+# Number of recent requests the latency metrics are computed over
+_METRICS_WINDOW = 1000
+
+
+class Priority(IntEnum):
+    """Scheduling class of a model request; lower values are served first."""
+
+    INTERACTIVE = 0  # A user is waiting on this agent
+    BATCH = 1  # Queued work such as fleet runs
+
+
+@dataclass
+class SchedulerTicket:
+    """A granted request slot."""
+
+    device_id: str | None
+    priority: Priority
+    queue_wait: float = 0.0  # Seconds spent waiting for the slot
+    granted_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class SchedulerStats:
+    """Snapshot of scheduler load and recent latencies (seconds)."""
+
+    max_in_flight: int
+    in_flight: int
+    queued: dict[str, int]  # Waiting requests per priority class
+    completed: int
+    mean_queue_wait: float
+    p95_queue_wait: float
+    mean_inference_time: float
+    p95_inference_time: float
+
+
+class _Waiter:
+    """A request waiting for a slot."""
+
+    __slots__ = ("ticket", "enqueued_at", "wake", "granted")
+
+    def __init__(self, ticket: SchedulerTicket, wake: Callable[[], None]):
+        self.ticket = ticket
+        self.enqueued_at = time.perf_counter()
+        self.wake = wake
+        self.granted = False
+
+
+class ModelScheduler:
+    """
+    Admission control for model requests shared by every client in the process.
+
+    At most max_in_flight requests run at once. Waiting requests are served
+    strictly by priority class; within a class, devices take turns so one
+    busy agent cannot starve the others.
+
+    Args:
+        max_in_flight: Maximum concurrent requests. 0 or less means unbounded,
+            which still collects metrics.
+
+    Example:
+        >>> scheduler = ModelScheduler(max_in_flight=4)
+        >>> with scheduler.slot(device_id="emulator-5554") as ticket:
+        ...     response = send_request()
+        >>> print(ticket.queue_wait)
+    """
+
+    def __init__(self, max_in_flight: int = 8):
+        self.max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # priority -> device -> waiters, devices in round-robin order
+        self._queues: dict[Priority, OrderedDict[str | None, deque[_Waiter]]] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._completed = 0
+        self._queue_waits: deque[float] = deque(maxlen=_METRICS_WINDOW)
+        self._inference_times: deque[float] = deque(maxlen=_METRICS_WINDOW)
+
+    @contextmanager
+    def slot(
+        self,
+        device_id: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Iterator[SchedulerTicket]:
+        """
+        Hold a request slot for the duration of the block, blocking until granted.
+
+        Args:
+            device_id: Device the request is for, used for fair queuing.
+            priority: Scheduling class.
+
+        Yields:
+            SchedulerTicket with the time spent queued.
+        """
+        ticket = SchedulerTicket(device_id, Priority(priority))
+        event = threading.Event()
+        waiter = self._enqueue(ticket, event.set)
+        if waiter is not None:
+            try:
+                event.wait()
+            except BaseException:
+                self._cancel(waiter)
+                raise
+        try:
+            yield ticket
+        finally:
+            self._release(ticket)
+
+    @asynccontextmanager
+    async def slot_async(
+        self,
+        device_id: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[SchedulerTicket]:
+        """
+        Async counterpart of slot(); waits without blocking the event loop.
+
+        Args:
+            device_id: Device the request is for, used for fair queuing.
+            priority: Scheduling class.
+
+        Yields:
+            SchedulerTicket with the time spent queued.
+        """
+        ticket = SchedulerTicket(device_id, Priority(priority))
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake() -> None:
+            # Slots may be released from other threads or event loops
+            loop.call_soon_threadsafe(_resolve, future)
+
+        waiter = self._enqueue(ticket, wake)
+        if waiter is not None:
+            try:
+                await future
+            except asyncio.CancelledError:
+                self._cancel(waiter)
+                raise
+        try:
+            yield ticket
+        finally:
+            self._release(ticket)
+
+    def stats(self) -> SchedulerStats:
+        """Get current load and latency figures over recent requests."""
+        with self._lock:
+            queue_waits = sorted(self._queue_waits)
+            inference_times = sorted(self._inference_times)
+            return SchedulerStats(
+                max_in_flight=self.max_in_flight,
+                in_flight=self._in_flight,
+                queued={
+                    priority.name.lower(): sum(len(w) for w in queue.values())
+                    for priority, queue in self._queues.items()
+                },
+                completed=self._completed,
+                mean_queue_wait=_mean(queue_waits),
+                p95_queue_wait=_p95(queue_waits),
+                mean_inference_time=_mean(inference_times),
+                p95_inference_time=_p95(inference_times),
+            )
+
+    def _enqueue(
+        self, ticket: SchedulerTicket, wake: Callable[[], None]
+    ) -> _Waiter | None:
+        """Take a slot now, or queue a waiter. Returns None if granted at once."""
+        with self._lock:
+            if not self._has_waiters() and self._has_capacity():
+                self._grant(ticket, 0.0)
+                return None
+
+            waiter = _Waiter(ticket, wake)
+            self._queues[ticket.priority].setdefault(ticket.device_id, deque()).append(
+                waiter
+            )
+            return waiter
+
+    def _release(self, ticket: SchedulerTicket) -> None:
+        """Free a slot and hand it to the next waiter."""
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._inference_times.append(time.perf_counter() - ticket.granted_at)
+            self._dispatch()
+
+    def _cancel(self, waiter: _Waiter) -> None:
+        """Withdraw a waiter whose caller gave up, returning its slot if granted."""
+        with self._lock:
+            if waiter.granted:
+                self._in_flight -= 1
+                self._dispatch()
+                return
+            device_queues = self._queues[waiter.ticket.priority]
+            waiters = device_queues.get(waiter.ticket.device_id)
+            if waiters is not None:
+                waiters.remove(waiter)
+                if not waiters:
+                    del device_queues[waiter.ticket.device_id]
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiters. Caller holds the lock."""
+        while self._has_capacity():
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            waiter.granted = True
+            self._grant(waiter.ticket, time.perf_counter() - waiter.enqueued_at)
+            waiter.wake()
+
+    def _next_waiter(self) -> _Waiter | None:
+        """Pop the next waiter: highest priority, then round-robin by device."""
+        for priority in Priority:
+            device_queues = self._queues[priority]
+            if not device_queues:
+                continue
+            device_id, waiters = next(iter(device_queues.items()))
+            waiter = waiters.popleft()
+            # Move the device to the back so others get the next turn
+            del device_queues[device_id]
+            if waiters:
+                device_queues[device_id] = waiters
+            return waiter
+        return None
+
+    def _grant(self, ticket: SchedulerTicket, queue_wait: float) -> None:
+        """Record a granted slot. Caller holds the lock."""
+        self._in_flight += 1
+        ticket.queue_wait = queue_wait
+        ticket.granted_at = time.perf_counter()
+        self._queue_waits.append(queue_wait)
+
+    def _has_capacity(self) -> bool:
+        return self.max_in_flight <= 0 or self._in_flight < self.max_in_flight
+
+    def _has_waiters(self) -> bool:
+        return any(self._queues.values())
+
+
+def _resolve(future: asyncio.Future) -> None:
+    """Wake an async waiter unless it was cancelled meanwhile."""
+    if not future.done():
+        future.set_result(None)
+
+
+def _mean(values: list[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def _p95(sorted_values: list[float]) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * 0.95))]
+
+
+# Global scheduler shared by all model clients
+_scheduler: ModelScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_model_scheduler() -> ModelScheduler:
+    """
+    Get the process-wide model scheduler, creating it on first use.
+
+    The in-flight limit comes from PHONE_AGENT_MODEL_MAX_IN_FLIGHT
+    (default 8; 0 disables the limit).
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ModelScheduler(
+                max_in_flight=int(os.getenv("PHONE_AGENT_MODEL_MAX_IN_FLIGHT", "8"))
+            )
+        return _scheduler
+
+
+def set_model_scheduler(scheduler: ModelScheduler) -> None:
+    """
+    Replace the process-wide model scheduler.
+
+    Args:
+        scheduler: Scheduler used by clients created without their own.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
@@ -0,0 +1,120 @@
+"""Concurrent capture of the device state the agent observes each step."""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+# Shared by all agents in the process; each observation uses one worker
+_MAX_WORKERS = int(os.getenv("PHONE_AGENT_OBSERVATION_WORKERS", "32"))
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class Observation:
+    """The device state captured at the start of a step."""
+
+    screenshot: Any  # Screenshot from the device backend
+    current_app: str
+    timings: dict[str, float] = field(default_factory=dict)  # Per-call, seconds
+
+
+def observe(
+    capture_screenshot: Callable[[], Any],
+    get_current_app: Callable[[], str],
+) -> Observation:
+    """
+    Capture the screenshot and the current app concurrently.
+
+    The current app is queried on a worker thread while the screenshot is
+    captured on the calling thread, so the step waits for the slower of the
+    two round trips instead of their sum.
+
+    Args:
+        capture_screenshot: Callable returning the screenshot.
+        get_current_app: Callable returning the current app name.
+
+    Returns:
+        Observation with both results and how long each took.
+
+    Raises:
+        Exception: Whatever either callable raised.
+    """
+    start = time.perf_counter()
+    app_future = _get_executor().submit(_timed, get_current_app)
+
+    screenshot = capture_screenshot()
+    screenshot_time = time.perf_counter() - start
+
+    current_app, app_time = app_future.result()
+
+    return Observation(
+        screenshot=screenshot,
+        current_app=current_app,
+        timings={
+            "screenshot": screenshot_time,
+            "current_app": app_time,
+            "total": time.perf_counter() - start,
+        },
+    )
+
+
+async def observe_async(
+    capture_screenshot: Callable[[], Any],
+    get_current_app: Callable[[], str],
+    executor: Executor | None = None,
+) -> Observation:
+    """
+    Capture the screenshot and the current app concurrently from asyncio.
+
+    Both blocking calls run on worker threads so the event loop stays free.
+
+    Args:
+        capture_screenshot: Callable returning the screenshot.
+        get_current_app: Callable returning the current app name.
+        executor: Executor for the blocking calls. If None, uses the shared
+            observation pool.
+
+    Returns:
+        Observation with both results and how long each took.
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or _get_executor()
+
+    start = time.perf_counter()
+    (screenshot, screenshot_time), (current_app, app_time) = await asyncio.gather(
+        loop.run_in_executor(executor, _timed, capture_screenshot),
+        loop.run_in_executor(executor, _timed, get_current_app),
+    )
+
+    return Observation(
+        screenshot=screenshot,
+        current_app=current_app,
+        timings={
+            "screenshot": screenshot_time,
+            "current_app": app_time,
+            "total": time.perf_counter() - start,
+        },
+    )
+
+
+def _timed(func: Callable[[], Any]) -> tuple[Any, float]:
+    """Call func and return its result with the elapsed time."""
+    start = time.perf_counter()
+    return func(), time.perf_counter() - start
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared observation thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_MAX_WORKERS, thread_name_prefix="observation"
+            )
+        return _executor
@@ -0,0 +1,111 @@
+"""Observers that display agent progress.
+
+The agent loop and the model client report what they are doing to an
+AgentObserver instead of printing. The base observer ignores everything,
+which keeps library and fleet use free of console output; ConsoleObserver
+renders the familiar interactive display, including the streamed thinking.
+"""
+
+import json
+import sys
+import traceback
+from typing import Any
+
+from phone_agent.config.i18n import get_messages
+
+
+class AgentObserver:
+    """
+    Receives progress events from an agent. Every method is a no-op.
+
+    Subclass and override the events you need. Methods are called on the
+    thread running the agent step, so they should return quickly.
+    """
+
+    # Whether on_thinking should be called with the stream as it arrives.
+    # The model client skips the per-token display work when this is False.
+    streams_thinking = False
+
+    def on_step_start(self, step: int) -> None:
+        """Called before the model request of a step."""
+
+    def on_thinking(self, text: str) -> None:
+        """Called with each new piece of streamed thinking text."""
+
+    def on_model_response(self, response: Any) -> None:
+        """Called with the ModelResponse once the stream has been read."""
+
+    def on_action(self, action: dict[str, Any]) -> None:
+        """Called with the parsed action before it is executed."""
+
+    def on_task_finished(self, message: str | None) -> None:
+        """Called when the task finishes."""
+
+    def on_notice(self, message: str) -> None:
+        """Called with a one-off status message, e.g. a created WDA session."""
+
+    def on_error(self, error: BaseException) -> None:
+        """Called when a step recovers from an exception."""
+
+
+class ConsoleObserver(AgentObserver):
+    """
+    Prints agent progress to stdout, streaming the model's thinking.
+
+    Args:
+        lang: Language for the labels: 'cn' or 'en'.
+    """
+
+    streams_thinking = True
+
+    def __init__(self, lang: str = "cn"):
+        self.lang = lang
+        self.msgs = get_messages(lang)
+
+    def on_step_start(self, step: int) -> None:
+        print("\n" + "=" * 50)
+        print(f"💭 {self.msgs['thinking']}:")
+        print("-" * 50)
+
+    def on_thinking(self, text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def on_model_response(self, response: Any) -> None:
+        msgs = self.msgs
+        print("\n")
+        print("=" * 50)
+        print(f"⏱️  {msgs['performance_metrics']}:")
+        print("-" * 50)
+        if response.time_to_first_token is not None:
+            print(f"{msgs['time_to_first_token']}: {response.time_to_first_token:.3f}s")
+        if response.time_to_thinking_end is not None:
+            print(
+                f"{msgs['time_to_thinking_end']}:        {response.time_to_thinking_end:.3f}s"
+            )
+        if response.time_to_action_end is not None:
+            print(
+                f"{msgs['time_to_action_end']}:        {response.time_to_action_end:.3f}s"
+            )
+            tail = response.total_time - response.time_to_action_end
+            note = f" ({msgs['stopped_early']})" if response.stopped_early else ""
+            print(f"{msgs['after_action_end']}:     {tail:.3f}s{note}")
+        print(f"{msgs['total_inference_time']}:          {response.total_time:.3f}s")
+        print("=" * 50)
+
+    def on_action(self, action: dict[str, Any]) -> None:
+        print("-" * 50)
+        print(f"🎯 {self.msgs['action']}:")
+        print(json.dumps(action, ensure_ascii=False, indent=2))
+        print("=" * 50 + "\n")
+
+    def on_task_finished(self, message: str | None) -> None:
+        print("\n" + "🎉 " + "=" * 48)
+        print(f"✅ {self.msgs['task_completed']}: {message or self.msgs['done']}")
+        print("=" * 50 + "\n")
+
+    def on_notice(self, message: str) -> None:
+        print(message)
+
+    def on_error(self, error: BaseException) -> None:
+        traceback.print_exception(error)
@@ -0,0 +1,385 @@
+"""Trajectory recording: what the agent saw and did, step by step.
+
+Recordings are written as segments. Each segment is a pair of files:
+
+    <name>.seg  Append-only log of records. Each record is a header
+                (kind: u8, length: u32, little-endian) and a payload.
+    <name>.idx  Fixed-size entries (kind: u8, offset: u64, length: u32,
+                digest: 32 bytes) pointing at the records in the log.
+
+There are two record kinds:
+
+    BLOB  Payload is a 32-byte SHA-256 digest followed by screenshot bytes.
+          Each distinct screenshot is stored once per segment.
+    STEP  Payload is a UTF-8 JSON object with the step's metadata. Its
+          "screenshot" field holds the hex digest of the blob.
+
+Recording never blocks the agent loop. Steps are queued for a background
+thread that decodes, hashes and writes them. If the writer falls behind
+and the queue fills up, new steps are dropped and counted.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import traceback
+import uuid
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+KIND_BLOB = 1
+KIND_STEP = 2
+
+_RECORD_HEADER = struct.Struct("<BI")
+_INDEX_ENTRY = struct.Struct("<BQI32s")
+_DIGEST_SIZE = 32
+_NO_DIGEST = b"\0" * _DIGEST_SIZE
+
+# Queued items that tell the writer thread to flush or stop
+_FLUSH = object()
+_STOP = object()
+
+
+class TrajectoryRecorder:
+    """
+    Records agent steps to segment files in a directory.
+
+    Args:
+        directory: Directory for the segment files (created if missing).
+        max_segment_bytes: Start a new segment once the log reaches this size.
+        max_queue: Steps that may wait for the writer before new ones are dropped.
+
+    Example:
+        >>> recorder = TrajectoryRecorder("recordings")
+        >>> agent = PhoneAgent(model_config, recorder=recorder)
+        >>> agent.run("打开设置")
+        >>> recorder.close()
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = 256 * 1024 * 1024,
+        max_queue: int = 256,
+    ):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.dropped = 0  # Steps dropped because the queue was full
+        self.segments: list[str] = []  # Paths of segment logs written so far
+
+        os.makedirs(directory, exist_ok=True)
+        # Unique per recorder, so recorders sharing a directory never share
+        # a segment
+        self._prefix = (
+            time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._log = None
+        self._index = None
+        # Index entries wait here until the log records they point at are
+        # flushed, so the index never gets ahead of the log
+        self._pending_index = bytearray()
+        self._offset = 0
+        self._digests: set[bytes] = set()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="trajectory-writer", daemon=True
+        )
+        self._thread.start()
+
+    def record_step(
+        self,
+        step: dict[str, Any],
+        screenshot_base64: str | None = None,
+    ) -> bool:
+        """
+        Queue a step for writing.
+
+        Args:
+            step: JSON-serializable step metadata.
+            screenshot_base64: Base64 screenshot seen at this step. Decoding
+                and hashing happen on the writer thread.
+
+        Returns:
+            True if queued, False if dropped because the writer is behind.
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((step, screenshot_base64))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def record_agent_step(
+        self,
+        episode: str,
+        step: int,
+        device_id: str | None,
+        task: str | None,
+        screenshot: Any,
+        current_app: str,
+        response: Any = None,
+        action: dict[str, Any] | None = None,
+        result: Any = None,
+        timings: dict[str, float] | None = None,
+    ) -> bool:
+        """
+        Queue one agent step.
+
+        Args:
+            episode: ID shared by the steps of one task run.
+            step: Step number within the episode, starting at 1.
+            device_id: Device the step ran on.
+            task: Task text (first step only).
+            screenshot: Screenshot the model saw.
+            current_app: Current app the model was told about.
+            response: ModelResponse, or None if the model request failed.
+            action: Parsed action.
+            result: StepResult of the step.
+            timings: Step timings in seconds.
+
+        Returns:
+            True if queued, False if dropped.
+        """
+        record = {
+            "episode": episode,
+            "step": step,
+            "time": time.time(),
+            "device_id": device_id,
+            "task": task,
+            "current_app": current_app,
+            "screenshot_mime": screenshot.mime_type,
+            "screenshot_size": [screenshot.width, screenshot.height],
+            "action": action,
+            "timings": timings or {},
+        }
+        if response is not None:
+            record.update(
+                raw_output=response.raw_content,
+                thinking=response.thinking,
+                time_to_first_token=response.time_to_first_token,
+                time_to_action_end=response.time_to_action_end,
+                stopped_early=response.stopped_early,
+                model_time=response.total_time,
+                queue_wait=response.queue_wait,
+            )
+        if result is not None:
+            record.update(
+                success=result.success,
+                finished=result.finished,
+                message=result.message,
+            )
+        return self.record_step(record, screenshot.base64_data)
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Wait until everything queued so far is on disk."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Write out queued steps and close the segment files."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_STOP, None))
+        self._thread.join()
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Writer thread: drain the queue, flushing whenever it is empty."""
+        try:
+            while True:
+                item, extra = self._queue.get()
+                if item is _STOP:
+                    break
+                if item is _FLUSH:
+                    self._flush_files()
+                    extra.set()
+                    continue
+
+                try:
+                    self._write_step(item, extra)
+                except Exception:
+                    traceback.print_exc()
+
+                if self._queue.empty():
+                    self._flush_files()
+        finally:
+            self._close_files()
+
+    def _write_step(self, step: dict[str, Any], screenshot_base64: str | None) -> None:
+        if self._log is None or self._offset >= self.max_segment_bytes:
+            self._open_segment()
+
+        if screenshot_base64:
+            image = base64.b64decode(screenshot_base64)
+            digest = hashlib.sha256(image).digest()
+            if digest not in self._digests:
+                self._append(KIND_BLOB, digest + image, digest)
+                self._digests.add(digest)
+            step = {**step, "screenshot": digest.hex()}
+
+        payload = json.dumps(step, ensure_ascii=False, default=str).encode("utf-8")
+        self._append(KIND_STEP, payload, _NO_DIGEST)
+
+    def _append(self, kind: int, payload: bytes, digest: bytes) -> None:
+        self._log.write(_RECORD_HEADER.pack(kind, len(payload)))
+        self._log.write(payload)
+        self._pending_index += _INDEX_ENTRY.pack(
+            kind, self._offset, len(payload), digest
+        )
+        self._offset += _RECORD_HEADER.size + len(payload)
+
+    def _open_segment(self) -> None:
+        self._close_files()
+        name = f"{self._prefix}-{len(self.segments):04d}"
+        path = os.path.join(self.directory, name + ".seg")
+        # Exclusive creation: offsets start at 0, so never append to a
+        # segment that already exists
+        self._log = open(path, "xb", buffering=1024 * 1024)
+        self._index = open(os.path.join(self.directory, name + ".idx"), "xb")
+        self._offset = 0
+        self._digests = set()
+        self.segments.append(path)
+
+    def _flush_files(self) -> None:
+        if self._log is not None:
+            self._log.flush()
+            self._index.write(self._pending_index)
+            self._index.flush()
+            self._pending_index.clear()
+
+    def _close_files(self) -> None:
+        if self._log is not None:
+            self._flush_files()
+            self._log.close()
+            self._index.close()
+            self._log = None
+            self._index = None
+
+
+@dataclass
+class RecordedStep:
+    """A step read back from a segment."""
+
+    data: dict[str, Any]
+    screenshot: bytes | None
+
+
+class TrajectoryReader:
+    """
+    Reads steps and screenshots back from one segment.
+
+    Uses the index when present and otherwise scans the log, so segments
+    from a crashed process are still readable. Index entries past the end
+    of the log are ignored, and records after the last indexed one are
+    found by scanning.
+
+    Args:
+        path: Path to a .seg file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries = self._load_index()
+        self._blobs = {
+            digest: (offset, length)
+            for kind, offset, length, digest in self._entries
+            if kind == KIND_BLOB
+        }
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._entries if entry[0] == KIND_STEP)
+
+    def __iter__(self) -> Iterator[RecordedStep]:
+        with open(self.path, "rb") as log:
+            for kind, offset, length, _ in self._entries:
+                if kind != KIND_STEP:
+                    continue
+                data = json.loads(_read_payload(log, offset, length))
+                digest = data.get("screenshot")
+                screenshot = self._read_blob(log, digest) if digest else None
+                yield RecordedStep(data=data, screenshot=screenshot)
+
+    def get_screenshot(self, digest: str) -> bytes | None:
+        """Get a stored screenshot by its hex digest."""
+        with open(self.path, "rb") as log:
+            return self._read_blob(log, digest)
+
+    def _read_blob(self, log, digest: str) -> bytes | None:
+        location = self._blobs.get(bytes.fromhex(digest))
+        if location is None:
+            return None
+        offset, length = location
+        return _read_payload(log, offset, length)[_DIGEST_SIZE:]
+
+    def _load_index(self) -> list[tuple[int, int, int, bytes]]:
+        index_path = os.path.splitext(self.path)[0] + ".idx"
+        if not os.path.exists(index_path):
+            return self._scan_log()
+
+        with open(index_path, "rb") as f:
+            data = f.read()
+        usable = len(data) - len(data) % _INDEX_ENTRY.size
+        size = os.path.getsize(self.path)
+        entries = []
+        end = 0
+        for entry in _INDEX_ENTRY.iter_unpack(data[:usable]):
+            _, offset, length, _ = entry
+            if offset + _RECORD_HEADER.size + length > size:
+                break  # Points past a log that was cut short
+            entries.append(entry)
+            end = offset + _RECORD_HEADER.size + length
+        return entries + self._scan_log(end)
+
+    def _scan_log(self, offset: int = 0) -> list[tuple[int, int, int, bytes]]:
+        entries = []
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as log:
+            log.seek(offset)
+            while offset + _RECORD_HEADER.size <= size:
+                kind, length = _RECORD_HEADER.unpack(log.read(_RECORD_HEADER.size))
+                if offset + _RECORD_HEADER.size + length > size:
+                    break  # Truncated final record
+                digest = log.read(_DIGEST_SIZE) if kind == KIND_BLOB else _NO_DIGEST
+                entries.append((kind, offset, length, digest))
+                offset += _RECORD_HEADER.size + length
+                log.seek(offset)
+        return entries
+
+
+def _read_payload(log, offset: int, length: int) -> bytes:
+    log.seek(offset + _RECORD_HEADER.size)
+    return log.read(length)
+
+
+def list_segments(directory: str) -> list[str]:
+    """
+    List the segment logs in a recording directory, oldest first.
+
+    Args:
+        directory: Recording directory.
+
+    Returns:
+        Paths of .seg files.
+    """
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(".seg")
+    )
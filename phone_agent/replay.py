@@ -0,0 +1,373 @@
+"""Offline replay of recorded trajectories through the real agent loop.
+
+A replay drives PhoneAgent with a fake device that serves the recorded
+screenshots and a fake model client that returns the recorded completions.
+Everything between them (screenshot preparation, context building, history
+compaction, stream parsing, action parsing and dispatch) is the code that
+runs against a real phone, so replays measure agent-loop overhead on a
+CPU-only machine and catch regressions in it.
+
+Replays are deterministic: the replayed actions are compared with the
+recorded ones, so a parser change that alters behavior shows up as a
+mismatch.
+
+Example:
+    >>> from phone_agent.replay import load_episodes, replay_episode
+    >>> for episode in load_episodes("recordings"):
+    ...     result = replay_episode(episode)
+    ...     print(result.episode_id, result.mismatches, result.total_time)
+"""
+
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from phone_agent.adb.screenshot import Screenshot
+from phone_agent.agent import AgentConfig, PhoneAgent
+from phone_agent.config.timing import TIMING_CONFIG, TimingConfig
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.imaging import ScreenshotEncodingConfig, prepare_image
+from phone_agent.model import ModelConfig
+from phone_agent.model.client import ModelResponse, _StreamProcessor
+from phone_agent.observer import AgentObserver
+from phone_agent.recorder import RecordedStep, TrajectoryReader, list_segments
+
+# Characters per simulated stream chunk, roughly one token
+_CHUNK_SIZE = 4
+
+
+@dataclass
+class ReplayEpisode:
+    """The recorded steps of one task run."""
+
+    episode_id: str
+    task: str
+    steps: list[RecordedStep]
+
+
+def load_episodes(directory: str) -> list[ReplayEpisode]:
+    """
+    Load every recorded episode from a recording directory.
+
+    Args:
+        directory: Directory written by TrajectoryRecorder.
+
+    Returns:
+        Episodes in recording order, each with its steps in step order.
+    """
+    grouped: dict[str, list[RecordedStep]] = {}
+    for path in list_segments(directory):
+        for step in TrajectoryReader(path):
+            grouped.setdefault(step.data["episode"], []).append(step)
+
+    episodes = []
+    for episode_id, steps in grouped.items():
+        steps.sort(key=lambda step: step.data["step"])
+        task = steps[0].data.get("task") or ""
+        episodes.append(ReplayEpisode(episode_id, task, steps))
+    return episodes
+
+
+class ReplaySession:
+    """
+    Position in an episode, shared by the fake device and the fake model.
+
+    The device shows the screenshot of the current step; each model request
+    returns the current step's completion and moves on to the next step.
+
+    Args:
+        episode: Episode to replay.
+    """
+
+    def __init__(self, episode: ReplayEpisode):
+        self.episode = episode
+        self.cursor = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every recorded completion has been returned."""
+        return self.cursor >= len(self.episode.steps)
+
+    @property
+    def current(self) -> RecordedStep:
+        """The step whose screen the device is showing."""
+        return self.episode.steps[min(self.cursor, len(self.episode.steps) - 1)]
+
+    def advance(self) -> RecordedStep:
+        """Return the current step and move to the next one."""
+        if self.exhausted:
+            raise RuntimeError("No more recorded steps to replay")
+        step = self.episode.steps[self.cursor]
+        self.cursor += 1
+        return step
+
+
+class ReplayDevice:
+    """
+    Device module that serves recorded screens and ignores input.
+
+    Implements the functions DeviceFactory dispatches to, so it can stand in
+    for the adb or hdc module.
+
+    Args:
+        session: Replay session to read screens from.
+    """
+
+    def __init__(self, session: ReplaySession):
+        self.session = session
+        self.calls: dict[str, int] = {}  # Input calls received, by name
+        self.screenshot_times: list[float] = []  # Per capture, seconds
+
+    def get_screenshot(
+        self,
+        device_id: str | None = None,
+        timeout: int = 10,
+        encoding: ScreenshotEncodingConfig | None = None,
+    ) -> Screenshot:
+        step = self.session.current
+        start = time.perf_counter()
+        image = prepare_image(step.screenshot, encoding)
+        elapsed = time.perf_counter() - start
+        self.screenshot_times.append(elapsed)
+        return Screenshot(
+            base64_data=image.base64_data,
+            width=image.width,
+            height=image.height,
+            timings={"capture": 0.0, "encode": elapsed},
+            mime_type=image.mime_type,
+        )
+
+    def get_frame_signature(self, device_id: str | None = None) -> str | None:
+        return self.session.current.data.get("screenshot")
+
+    def get_current_app(self, device_id: str | None = None) -> str:
+        return self.session.current.data.get("current_app", "System Home")
+
+    def launch_app(self, app_name: str, device_id=None, delay=None) -> bool:
+        self._count("launch_app")
+        return True
+
+    def detect_and_set_adb_keyboard(self, device_id: str | None = None) -> str:
+        self._count("detect_and_set_adb_keyboard")
+        return ""
+
+    def list_devices(self) -> list:
+        return []
+
+    def __getattr__(self, name: str):
+        # tap, swipe, back, home, type_text, ...: record the call, do nothing
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def _input(*args, **kwargs):
+            self._count(name)
+
+        return _input
+
+    def _count(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+
+class ReplayDeviceFactory(DeviceFactory):
+    """
+    DeviceFactory backed by a ReplayDevice.
+
+    Args:
+        session: Replay session to read screens from.
+    """
+
+    def __init__(self, session: ReplaySession):
+        super().__init__(DeviceType.ADB)
+        self._module = ReplayDevice(session)
+
+
+class ReplayModelClient:
+    """
+    Model client that returns recorded completions.
+
+    Completions are fed through the same stream processor as live responses,
+    in token-sized chunks, so thinking/action splitting and the action-end
+    scan are part of the replay.
+
+    Args:
+        session: Replay session to read completions from.
+        config: Model configuration (stop_at_action_end is used).
+        latency_scale: Multiplier on the recorded model latency, e.g. 1.0 to
+            wait as long as the recorded request took, or 0 for no waiting.
+    """
+
+    def __init__(
+        self,
+        session: ReplaySession,
+        config: ModelConfig | None = None,
+        latency_scale: float = 0.0,
+    ):
+        self.session = session
+        self.config = config or ModelConfig()
+        self.latency_scale = latency_scale
+        self.requests: list[list[dict[str, Any]]] = []  # Messages of each request
+        self.request_times: list[float] = []  # Per request, seconds
+
+    def request(
+        self,
+        messages: list[dict[str, Any]],
+        device_id: str | None = None,
+        observer: AgentObserver | None = None,
+    ) -> ModelResponse:
+        """
+        Return the next recorded completion.
+
+        Args:
+            messages: Messages the agent built for this step.
+            device_id: Ignored.
+            observer: Optional observer for the thinking stream and metrics.
+
+        Returns:
+            ModelResponse parsed from the recorded output.
+
+        Raises:
+            RuntimeError: If the recorded model request failed or the
+                recording has no more steps.
+        """
+        self.requests.append(list(messages))
+        start = time.perf_counter()
+        step = self.session.advance()
+        raw_output = step.data.get("raw_output")
+        if raw_output is None:
+            raise RuntimeError(f"Recorded step failed: {step.data.get('message')}")
+
+        chunks = [
+            raw_output[i : i + _CHUNK_SIZE]
+            for i in range(0, len(raw_output), _CHUNK_SIZE)
+        ]
+        first_delay, chunk_delay = self._delays(step, len(chunks))
+
+        processor = _StreamProcessor(observer)
+        time.sleep(first_delay)
+        for chunk in chunks:
+            processor.feed(chunk)
+            if processor.action_complete and self.config.stop_at_action_end:
+                break
+            time.sleep(chunk_delay)
+
+        response = processor.finish()
+        response.queue_wait = 0.0
+        self.request_times.append(time.perf_counter() - start)
+        return response
+
+    def _delays(self, step: RecordedStep, chunk_count: int) -> tuple[float, float]:
+        """Split the scaled recorded latency into first-token and per-chunk waits."""
+        if self.latency_scale <= 0:
+            return 0.0, 0.0
+        first = (step.data.get("time_to_first_token") or 0.0) * self.latency_scale
+        total = (step.data.get("model_time") or 0.0) * self.latency_scale
+        return first, max(0.0, total - first) / max(1, chunk_count)
+
+
+def replay_timing_config() -> TimingConfig:
+    """
+    Get timing for a replay: the global settings with the fixed post-action
+    delays zeroed.
+
+    Returns:
+        A new TimingConfig; the global TIMING_CONFIG is not changed.
+    """
+    timing = TimingConfig()
+    for config in (timing.action, timing.device):
+        for item in fields(config):
+            setattr(config, item.name, 0.0)
+    timing.connection = TIMING_CONFIG.connection
+    timing.settle = TIMING_CONFIG.settle
+    return timing
+
+
+@dataclass
+class ReplayResult:
+    """Outcome and timings of one replayed episode."""
+
+    episode_id: str
+    steps: int
+    mismatches: list[tuple[int, Any, Any]]  # (step, recorded, replayed) actions
+    step_times: list[float]  # Wall time of each agent step (seconds)
+    model_times: list[float]  # Time in the fake model client, incl. latency
+    screenshot_times: list[float]  # Time preparing screenshots
+    prompt_messages: list[int]  # Messages sent with each request
+    device_calls: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_time(self) -> float:
+        """Wall time of all steps (seconds)."""
+        return sum(self.step_times)
+
+    @property
+    def overhead_time(self) -> float:
+        """Wall time not spent waiting on the simulated model (seconds)."""
+        return self.total_time - sum(self.model_times)
+
+
+def replay_episode(
+    episode: ReplayEpisode,
+    model_config: ModelConfig | None = None,
+    agent_config: AgentConfig | None = None,
+    latency_scale: float = 0.0,
+) -> ReplayResult:
+    """
+    Replay one episode through PhoneAgent.
+
+    The agent's handler runs with replay_timing_config(), so fixed
+    post-action delays are zeroed without touching the global timing.
+    Wait actions still sleep for their recorded duration.
+
+    Args:
+        episode: Episode to replay.
+        model_config: Model configuration, e.g. to replay with a different
+            screenshot encoding. Nothing is sent to base_url.
+        agent_config: Agent configuration. Defaults to a quiet agent with a
+            step limit of the episode length.
+        latency_scale: Multiplier on the recorded model latency.
+
+    Returns:
+        ReplayResult with per-step timings and any action mismatches.
+    """
+    model_config = model_config or ModelConfig()
+    agent_config = agent_config or AgentConfig(
+        max_steps=len(episode.steps), verbose=False
+    )
+    session = ReplaySession(episode)
+    device_factory = ReplayDeviceFactory(session)
+    model_client = ReplayModelClient(session, model_config, latency_scale)
+    agent = PhoneAgent(
+        model_config=model_config,
+        agent_config=agent_config,
+        confirmation_callback=lambda message: True,
+        takeover_callback=lambda message: None,
+        device_factory=device_factory,
+        model_client=model_client,
+    )
+    agent.action_handler.timing = replay_timing_config()
+
+    mismatches = []
+    step_times = []
+    while not session.exhausted:
+        recorded = session.current
+        start = time.perf_counter()
+        result = agent.step(episode.task if session.cursor == 0 else None)
+        step_times.append(time.perf_counter() - start)
+
+        if result.action != recorded.data.get("action"):
+            mismatches.append(
+                (recorded.data["step"], recorded.data.get("action"), result.action)
+            )
+        if result.finished:
+            break
+
+    return ReplayResult(
+        episode_id=episode.episode_id,
+        steps=len(step_times),
+        mismatches=mismatches,
+        step_times=step_times,
+        model_times=model_client.request_times,
+        screenshot_times=device_factory.module.screenshot_times,
+        prompt_messages=[len(messages) for messages in model_client.requests],
+        device_calls=dict(device_factory.module.calls),
+    )
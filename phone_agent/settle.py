@@ -0,0 +1,104 @@
+"""Adaptive waiting until the screen stops changing after an action."""
+
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from phone_agent.config.timing import SettleTimingConfig
+
+# Actions followed by a settle wait; their frame is sampled before they run
+SETTLED_ACTIONS = frozenset(
+    {
+        "Launch",
+        "Tap",
+        "Type",
+        "Type_Name",
+        "Swipe",
+        "Back",
+        "Home",
+        "Double Tap",
+        "Long Press",
+    }
+)
+
+
+@dataclass
+class SettleStats:
+    """Accumulated settle metrics, compared against the fixed delays."""
+
+    count: int = 0  # Number of settle waits
+    stable_count: int = 0  # Waits that ended on stable frames, not the budget
+    waited: float = 0.0  # Total wall time spent waiting (seconds)
+    fixed_delay: float = 0.0  # Total the fixed delays would have slept (seconds)
+
+    @property
+    def saved(self) -> float:
+        """Wall time saved compared to the fixed delays (negative if slower)."""
+        return self.fixed_delay - self.waited
+
+    def record(self, waited: float, fixed_delay: float, stable: bool) -> None:
+        """Add one settle wait."""
+        self.count += 1
+        self.stable_count += int(stable)
+        self.waited += waited
+        self.fixed_delay += fixed_delay
+
+
+def wait_for_settle(
+    get_signature: Callable[[], str | None],
+    budget: float,
+    fallback_delay: float,
+    config: SettleTimingConfig,
+    before: str | None = None,
+) -> tuple[float, bool, str | None]:
+    """
+    Poll frame signatures until the screen has reacted and stopped changing.
+
+    Consecutive matching frames only count as settled once a frame differs
+    from the one taken before the action, or once the fixed delay has
+    passed; otherwise a screen that has not started reacting yet would look
+    settled.
+
+    Args:
+        get_signature: Callable returning a signature of the current frame,
+            or None if the backend cannot provide one.
+        budget: Maximum time to wait in seconds.
+        fallback_delay: Fixed delay to sleep instead when no signature is
+            available.
+        config: Settle configuration.
+        before: Signature of the frame taken before the action, or None if
+            it could not be sampled.
+
+    Returns:
+        Tuple of (seconds waited, whether the screen settled, signature of
+        the last frame sampled or None).
+    """
+    start = time.perf_counter()
+    time.sleep(min(config.initial_delay, budget))
+
+    previous = None
+    matches = 0
+    changed = False
+    while True:
+        try:
+            signature = get_signature()
+        except Exception:
+            signature = None
+
+        if signature is None:
+            # Backend can't sample frames; keep the old fixed behavior
+            elapsed = time.perf_counter() - start
+            time.sleep(max(fallback_delay - elapsed, 0))
+            return time.perf_counter() - start, False, None
+
+        changed = changed or (before is not None and signature != before)
+        matches = matches + 1 if signature == previous else 1
+        previous = signature
+
+        elapsed = time.perf_counter() - start
+        if matches >= config.stable_frames and (changed or elapsed >= fallback_delay):
+            return elapsed, True, signature
+
+        if elapsed + config.poll_interval > budget:
+            return elapsed, False, signature
+        time.sleep(config.poll_interval)
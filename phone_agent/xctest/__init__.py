@@ -1,5 +1,12 @@
 """XCTest utilities for iOS device interaction via WebDriverAgent/XCUITest."""
 
+from phone_agent.xctest.client import (
+    WDAClient,
+    WDAClientConfig,
+    close_wda_clients,
+    get_wda_client,
+    set_wda_client,
+)
 from phone_agent.xctest.connection import (
     ConnectionType,
     DeviceInfo,
@@ -17,15 +24,25 @@ from phone_agent.xctest.device import (
     swipe,
     tap,
 )
+from phone_agent.xctest.gestures import ActionChain
 from phone_agent.xctest.input import (
     clear_text,
     type_text,
 )
-from phone_agent.xctest.screenshot import get_screenshot
+from phone_agent.xctest.mjpeg import (
+    MjpegConfig,
+    MjpegFrame,
+    MjpegFrameGrabber,
+    default_mjpeg_url,
+    get_frame_grabber,
+    stop_frame_grabbers,
+)
+from phone_agent.xctest.screenshot import get_frame_signature, get_screenshot
 
 __all__ = [
     # Screenshot
     "get_screenshot",
+    "get_frame_signature",
     # Input
     "type_text",
     "clear_text",
@@ -38,10 +55,24 @@ __all__ = [
     "double_tap",
     "long_press",
     "launch_app",
+    "ActionChain",
     # Connection management
     "XCTestConnection",
     "DeviceInfo",
     "ConnectionType",
     "quick_connect",
     "list_devices",
+    # WebDriverAgent HTTP client
+    "WDAClient",
+    "WDAClientConfig",
+    "get_wda_client",
+    "set_wda_client",
+    "close_wda_clients",
+    # MJPEG screen stream
+    "MjpegConfig",
+    "MjpegFrame",
+    "MjpegFrameGrabber",
+    "default_mjpeg_url",
+    "get_frame_grabber",
+    "stop_frame_grabbers",
 ]
@@ -0,0 +1,223 @@
+"""Pooled HTTP client for WebDriverAgent."""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from requests.exceptions import ReadTimeout
+    from urllib3.exceptions import ReadTimeoutError
+    from urllib3.util.retry import Retry
+except ImportError:  # Reported when a client is first requested
+    requests = None
+    ReadTimeout = TimeoutError  # Never raised without requests
+
+
+@dataclass
+class WDAClientConfig:
+    """Configuration for WebDriverAgent HTTP clients."""
+
+    connect_timeout: float = 3.0  # Seconds to establish a connection
+    read_timeout: float = 10.0  # Seconds to wait for a reply, unless a call sets it
+    retries: int = 2  # Retries on refused or reset connections
+    backoff_factor: float = 0.1  # Retry sleeps: 0, 2x, 4x ... this many seconds
+    pool_size: int = 4  # Keep-alive connections kept per WDA URL
+
+    def __post_init__(self):
+        """Load values from environment variables if present."""
+        self.connect_timeout = float(
+            os.getenv("PHONE_AGENT_WDA_CONNECT_TIMEOUT", self.connect_timeout)
+        )
+        self.read_timeout = float(
+            os.getenv("PHONE_AGENT_WDA_TIMEOUT", self.read_timeout)
+        )
+        self.retries = int(os.getenv("PHONE_AGENT_WDA_RETRIES", self.retries))
+        self.backoff_factor = float(
+            os.getenv("PHONE_AGENT_WDA_BACKOFF", self.backoff_factor)
+        )
+        self.pool_size = int(os.getenv("PHONE_AGENT_WDA_POOL_SIZE", self.pool_size))
+
+
+if requests is not None:
+
+    class _ResetRetry(Retry):
+        """
+        Retry policy for WDA requests.
+
+        Connection failures and resets are retried for every method, since
+        WDA drops idle keep-alive connections. Read timeouts are not: the
+        request reached WDA and the gesture may already have run.
+        """
+
+        def increment(self, method=None, url=None, response=None, error=None, **kwargs):
+            if isinstance(error, ReadTimeoutError):
+                raise error
+            return super().increment(method, url, response, error, **kwargs)
+
+
+class WDAClient:
+    """
+    HTTP client for one WebDriverAgent server.
+
+    Requests share a keep-alive connection pool, so consecutive calls skip
+    the TCP handshake. Safe to share between threads.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+        config: Timeouts, retries and pool size. Defaults to WDAClientConfig().
+
+    Raises:
+        ImportError: If the requests library is not installed.
+    """
+
+    def __init__(self, wda_url: str, config: WDAClientConfig | None = None):
+        if requests is None:
+            raise ImportError(
+                "requests library required. Install: pip install requests"
+            )
+
+        self.wda_url = wda_url.rstrip("/")
+        self.config = config or WDAClientConfig()
+
+        retry = _ResetRetry(
+            total=self.config.retries,
+            connect=self.config.retries,
+            read=self.config.retries,
+            status=0,
+            allowed_methods=None,
+            backoff_factor=self.config.backoff_factor,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.config.pool_size,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, endpoint: str, session_id: str | None = None) -> str:
+        """
+        Get the full URL of an endpoint.
+
+        Args:
+            endpoint: Endpoint path, e.g. "wda/keys".
+            session_id: Optional WDA session ID. Without one, the endpoint
+                is addressed without a session.
+
+        Returns:
+            Full URL for the endpoint.
+        """
+        endpoint = endpoint.lstrip("/")
+        if session_id:
+            return f"{self.wda_url}/session/{session_id}/{endpoint}"
+        return f"{self.wda_url}/{endpoint}"
+
+    def get(
+        self,
+        endpoint: str,
+        session_id: str | None = None,
+        timeout: float | None = None,
+    ) -> "requests.Response":
+        """
+        Send a GET request.
+
+        Args:
+            endpoint: Endpoint path.
+            session_id: Optional WDA session ID.
+            timeout: Read timeout in seconds. Defaults to config.read_timeout.
+
+        Returns:
+            The response.
+        """
+        return self.session.get(
+            self.url(endpoint, session_id), timeout=self._timeout(timeout)
+        )
+
+    def post(
+        self,
+        endpoint: str,
+        json: Any = None,
+        session_id: str | None = None,
+        timeout: float | None = None,
+    ) -> "requests.Response":
+        """
+        Send a POST request.
+
+        Args:
+            endpoint: Endpoint path.
+            json: Optional JSON body.
+            session_id: Optional WDA session ID.
+            timeout: Read timeout in seconds. Defaults to config.read_timeout.
+
+        Returns:
+            The response.
+        """
+        return self.session.post(
+            self.url(endpoint, session_id), json=json, timeout=self._timeout(timeout)
+        )
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    def _timeout(self, timeout: float | None) -> tuple[float, float]:
+        read_timeout = self.config.read_timeout if timeout is None else timeout
+        return self.config.connect_timeout, read_timeout
+
+
+# Clients by WDA URL, shared by all xctest functions
+_clients: dict[str, WDAClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_wda_client(wda_url: str = "http://localhost:8100") -> WDAClient:
+    """
+    Get the shared client for a WebDriverAgent URL, creating it on first use.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+
+    Returns:
+        The client for that URL.
+
+    Raises:
+        ImportError: If the requests library is not installed.
+    """
+    key = wda_url.rstrip("/")
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = WDAClient(key)
+                _clients[key] = client
+    return client
+
+
+def set_wda_client(client: WDAClient) -> None:
+    """
+    Use a custom client for its WDA URL, e.g. one with a different config.
+
+    Args:
+        client: Client to share.
+    """
+    with _clients_lock:
+        previous = _clients.get(client.wda_url)
+        _clients[client.wda_url] = client
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+def close_wda_clients() -> None:
+    """Close and forget every shared client."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
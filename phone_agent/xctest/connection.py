@@ -5,6 +5,8 @@ import time
 from dataclasses import dataclass
 from enum import Enum
 
+from phone_agent.xctest.client import get_wda_client
+
 
 class ConnectionType(Enum):
     """Type of iOS connection."""
@@ -204,11 +206,7 @@ class XCTestConnection:
             True if WDA is ready, False otherwise.
         """
         try:
-            import requests
-
-            response = requests.get(
-                f"{self.wda_url}/status", timeout=timeout, verify=False
-            )
+            response = get_wda_client(self.wda_url).get("status", timeout=timeout)
             return response.status_code == 200
         except ImportError:
             print(
@@ -226,13 +224,8 @@ class XCTestConnection:
             Tuple of (success, session_id or error_message).
         """
         try:
-            import requests
-
-            response = requests.post(
-                f"{self.wda_url}/session",
-                json={"capabilities": {}},
-                timeout=30,
-                verify=False,
+            response = get_wda_client(self.wda_url).post(
+                "session", json={"capabilities": {}}, timeout=30
             )
 
             if response.status_code in (200, 201):
@@ -260,9 +253,7 @@ class XCTestConnection:
             Status dictionary or None if not available.
         """
         try:
-            import requests
-
-            response = requests.get(f"{self.wda_url}/status", timeout=5, verify=False)
+            response = get_wda_client(self.wda_url).get("status", timeout=5)
 
             if response.status_code == 200:
                 return response.json()
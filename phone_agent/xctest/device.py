@@ -4,30 +4,12 @@ import subprocess
 import time
 from typing import Optional
 
-from phone_agent.config.apps_ios import APP_PACKAGES_IOS as APP_PACKAGES
+from phone_agent.config.apps_ios import IOS_APPS
+from phone_agent.xctest.client import get_wda_client
+from phone_agent.xctest.gestures import ActionChain
 
 SCALE_FACTOR = 3 # 3 for most modern iPhone 
 
-def _get_wda_session_url(wda_url: str, session_id: str | None, endpoint: str) -> str:
-    """
-    Get the correct WDA URL for a session endpoint.
-
-    Args:
-        wda_url: Base WDA URL.
-        session_id: Optional session ID.
-        endpoint: The endpoint path.
-
-    Returns:
-        Full URL for the endpoint.
-    """
-    base = wda_url.rstrip("/")
-    if session_id:
-        return f"{base}/session/{session_id}/{endpoint}"
-    else:
-        # Try to use WDA endpoints without session when possible
-        return f"{base}/{endpoint}"
-
-
 def get_current_app(
     wda_url: str = "http://localhost:8100", session_id: str | None = None
 ) -> str:
@@ -42,12 +24,8 @@ def get_current_app(
         The app name if recognized, otherwise "System Home".
     """
     try:
-        import requests
-
         # Get active app info from WDA using activeAppInfo endpoint
-        response = requests.get(
-            f"{wda_url.rstrip('/')}/wda/activeAppInfo", timeout=5, verify=False
-        )
+        response = get_wda_client(wda_url).get("wda/activeAppInfo", timeout=5)
 
         if response.status_code == 200:
             data = response.json()
@@ -58,9 +36,9 @@ def get_current_app(
 
             if bundle_id:
                 # Try to find app name from bundle ID
-                for app_name, package in APP_PACKAGES.items():
-                    if package == bundle_id:
-                        return app_name
+                app_name = IOS_APPS.get_app_name(bundle_id)
+                if app_name:
+                    return app_name
 
             return "System Home"
 
@@ -90,28 +68,8 @@ def tap(
         delay: Delay in seconds after tap.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "actions")
-
         # W3C WebDriver Actions API for tap/click
-        actions = {
-            "actions": [
-                {
-                    "type": "pointer",
-                    "id": "finger1",
-                    "parameters": {"pointerType": "touch"},
-                    "actions": [
-                        {"type": "pointerMove", "duration": 0, "x": x / SCALE_FACTOR, "y": y / SCALE_FACTOR},
-                        {"type": "pointerDown", "button": 0},
-                        {"type": "pause", "duration": 0.1},
-                        {"type": "pointerUp", "button": 0},
-                    ],
-                }
-            ]
-        }
-
-        requests.post(url, json=actions, timeout=15, verify=False)
+        ActionChain(scale=SCALE_FACTOR).tap(x, y).perform(wda_url, session_id)
 
         time.sleep(delay)
 
@@ -139,32 +97,8 @@ def double_tap(
         delay: Delay in seconds after double tap.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "actions")
-
         # W3C WebDriver Actions API for double tap
-        actions = {
-            "actions": [
-                {
-                    "type": "pointer",
-                    "id": "finger1",
-                    "parameters": {"pointerType": "touch"},
-                    "actions": [
-                        {"type": "pointerMove", "duration": 0, "x": x / SCALE_FACTOR, "y": y / SCALE_FACTOR},
-                        {"type": "pointerDown", "button": 0},
-                        {"type": "pause", "duration": 100},
-                        {"type": "pointerUp", "button": 0},
-                        {"type": "pause", "duration": 100},
-                        {"type": "pointerDown", "button": 0},
-                        {"type": "pause", "duration": 100},
-                        {"type": "pointerUp", "button": 0},
-                    ],
-                }
-            ]
-        }
-
-        requests.post(url, json=actions, timeout=10, verify=False)
+        ActionChain(scale=SCALE_FACTOR).double_tap(x, y).perform(wda_url, session_id)
 
         time.sleep(delay)
 
@@ -194,31 +128,12 @@ def long_press(
         delay: Delay in seconds after long press.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "actions")
-
         # W3C WebDriver Actions API for long press
         # Convert duration to milliseconds
         duration_ms = int(duration * 1000)
 
-        actions = {
-            "actions": [
-                {
-                    "type": "pointer",
-                    "id": "finger1",
-                    "parameters": {"pointerType": "touch"},
-                    "actions": [
-                        {"type": "pointerMove", "duration": 0, "x": x / SCALE_FACTOR, "y": y / SCALE_FACTOR},
-                        {"type": "pointerDown", "button": 0},
-                        {"type": "pause", "duration": duration_ms},
-                        {"type": "pointerUp", "button": 0},
-                    ],
-                }
-            ]
-        }
-
-        requests.post(url, json=actions, timeout=int(duration + 10), verify=False)
+        chain = ActionChain(scale=SCALE_FACTOR).long_press(x, y, duration_ms)
+        chain.perform(wda_url, session_id)
 
         time.sleep(delay)
 
@@ -252,7 +167,7 @@ def swipe(
         delay: Delay in seconds after swipe.
     """
     try:
-        import requests
+        client = get_wda_client(wda_url)
 
         if duration is None:
             # Calculate duration based on distance
@@ -260,8 +175,6 @@ def swipe(
             duration = dist_sq / 1000000  # Convert to seconds
             duration = max(0.3, min(duration, 2.0))  # Clamp between 0.3-2 seconds
 
-        url = _get_wda_session_url(wda_url, session_id, "wda/dragfromtoforduration")
-
         # WDA dragfromtoforduration API payload
         payload = {
             "fromX": start_x / SCALE_FACTOR,
@@ -271,7 +184,12 @@ def swipe(
             "duration": duration,
         }
 
-        requests.post(url, json=payload, timeout=int(duration + 10), verify=False)
+        client.post(
+            "wda/dragfromtoforduration",
+            json=payload,
+            session_id=session_id,
+            timeout=int(duration + 10),
+        )
 
         time.sleep(delay)
 
@@ -299,9 +217,7 @@ def back(
         by swiping from the left edge of the screen.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "wda/dragfromtoforduration")
+        client = get_wda_client(wda_url)
 
         # Swipe from left edge to simulate back gesture
         payload = {
@@ -312,7 +228,9 @@ def back(
             "duration": 0.3,
         }
 
-        requests.post(url, json=payload, timeout=10, verify=False)
+        client.post(
+            "wda/dragfromtoforduration", json=payload, session_id=session_id, timeout=10
+        )
 
         time.sleep(delay)
 
@@ -336,11 +254,7 @@ def home(
         delay: Delay in seconds after pressing home.
     """
     try:
-        import requests
-
-        url = f"{wda_url.rstrip('/')}/wda/homescreen"
-
-        requests.post(url, timeout=10, verify=False)
+        get_wda_client(wda_url).post("wda/homescreen", timeout=10)
 
         time.sleep(delay)
 
@@ -368,17 +282,16 @@ def launch_app(
     Returns:
         True if app was launched, False if app not found.
     """
-    if app_name not in APP_PACKAGES:
+    bundle_id = IOS_APPS.get_package(app_name)
+    if bundle_id is None:
         return False
 
     try:
-        import requests
-
-        bundle_id = APP_PACKAGES[app_name]
-        url = _get_wda_session_url(wda_url, session_id, "wda/apps/launch")
-
-        response = requests.post(
-            url, json={"bundleId": bundle_id}, timeout=10, verify=False
+        response = get_wda_client(wda_url).post(
+            "wda/apps/launch",
+            json={"bundleId": bundle_id},
+            session_id=session_id,
+            timeout=10,
         )
 
         time.sleep(delay)
@@ -406,11 +319,9 @@ def get_screen_size(
         Tuple of (width, height). Returns (375, 812) as default if unable to fetch.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "window/size")
-
-        response = requests.get(url, timeout=5, verify=False)
+        response = get_wda_client(wda_url).get(
+            "window/size", session_id=session_id, timeout=5
+        )
 
         if response.status_code == 200:
             data = response.json()
@@ -444,11 +355,9 @@ def press_button(
         delay: Delay in seconds after pressing.
     """
     try:
-        import requests
-
-        url = f"{wda_url.rstrip('/')}/wda/pressButton"
-
-        requests.post(url, json={"name": button_name}, timeout=10, verify=False)
+        get_wda_client(wda_url).post(
+            "wda/pressButton", json={"name": button_name}, timeout=10
+        )
 
         time.sleep(delay)
 
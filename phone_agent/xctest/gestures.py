@@ -0,0 +1,188 @@
+"""Builder for W3C action chains sent to WebDriverAgent in one request."""
+
+from typing import Any
+
+from phone_agent.xctest.client import get_wda_client
+
+_BACKSPACE = "\ue003"  # W3C WebDriver key code for Backspace
+# Keys per second assumed when sizing the request timeout. WDA types at
+# about 60 keys/s by default; half that leaves room for slow devices.
+_TYPING_RATE = 30
+
+
+class ActionChain:
+    """
+    Composes pointer and key actions into a single W3C actions payload.
+
+    Actions run in the order they are added. WDA executes the whole chain,
+    including pauses, on the device, so a multi-step gesture costs one round
+    trip and no client-side sleeps.
+
+    Args:
+        scale: Divisor applied to coordinates, e.g. SCALE_FACTOR to turn
+            screenshot pixels into WDA points.
+
+    Example:
+        >>> chain = ActionChain(scale=3)
+        >>> chain.tap(540, 1200).pause(300).type_text("hello")
+        >>> chain.perform("http://localhost:8100")
+    """
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+        self._pointer: list[dict[str, Any]] = []
+        self._keys: list[dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._pointer)
+
+    @property
+    def duration_ms(self) -> int:
+        """Total pause and movement time of the chain in milliseconds."""
+        return sum(
+            max(pointer.get("duration", 0), key.get("duration", 0))
+            for pointer, key in zip(self._pointer, self._keys)
+        )
+
+    @property
+    def typing_ms(self) -> int:
+        """Estimated time WDA needs to type the chain's keys in milliseconds."""
+        presses = sum(1 for key in self._keys if key["type"] == "keyDown")
+        return presses * 1000 // _TYPING_RATE
+
+    def move(self, x: float, y: float, duration_ms: int = 0) -> "ActionChain":
+        """Move the finger to (x, y) over duration_ms."""
+        return self._add_pointer(
+            {
+                "type": "pointerMove",
+                "duration": duration_ms,
+                "x": x / self.scale,
+                "y": y / self.scale,
+            }
+        )
+
+    def down(self) -> "ActionChain":
+        """Put the finger down."""
+        return self._add_pointer({"type": "pointerDown", "button": 0})
+
+    def up(self) -> "ActionChain":
+        """Lift the finger."""
+        return self._add_pointer({"type": "pointerUp", "button": 0})
+
+    def pause(self, duration_ms: int) -> "ActionChain":
+        """Wait on the device before the next action."""
+        pause = {"type": "pause", "duration": int(duration_ms)}
+        self._pointer.append(pause)
+        self._keys.append(dict(pause))
+        return self
+
+    def tap(self, x: float, y: float, hold_ms: int = 100) -> "ActionChain":
+        """Tap at (x, y)."""
+        return self.move(x, y).down().pause(hold_ms).up()
+
+    def double_tap(
+        self, x: float, y: float, hold_ms: int = 100, gap_ms: int = 100
+    ) -> "ActionChain":
+        """Tap twice at (x, y)."""
+        return self.tap(x, y, hold_ms).pause(gap_ms).down().pause(hold_ms).up()
+
+    def long_press(self, x: float, y: float, duration_ms: int = 3000) -> "ActionChain":
+        """Press at (x, y) for duration_ms."""
+        return self.tap(x, y, hold_ms=duration_ms)
+
+    def swipe(
+        self,
+        start_x: float,
+        start_y: float,
+        end_x: float,
+        end_y: float,
+        duration_ms: int = 300,
+    ) -> "ActionChain":
+        """Drag from start to end over duration_ms."""
+        self.move(start_x, start_y).down()
+        return self.move(end_x, end_y, duration_ms).up()
+
+    def press_key(self, key: str) -> "ActionChain":
+        """Press and release one key (a character or a W3C key code)."""
+        self._add_key({"type": "keyDown", "value": key})
+        return self._add_key({"type": "keyUp", "value": key})
+
+    def type_text(self, text: str) -> "ActionChain":
+        """Type text into the focused element, one key per character."""
+        for char in text:
+            self.press_key(char)
+        return self
+
+    def backspace(self, count: int) -> "ActionChain":
+        """Press Backspace count times."""
+        for _ in range(count):
+            self.press_key(_BACKSPACE)
+        return self
+
+    def to_payload(self) -> dict[str, Any]:
+        """
+        Build the body for the W3C actions endpoint.
+
+        Returns:
+            Payload with a touch pointer source and a key source, each
+            left out when it only pauses.
+        """
+        sources = []
+        uses_keys = _has_input(self._keys)
+        if _has_input(self._pointer) or not uses_keys:
+            sources.append(
+                {
+                    "type": "pointer",
+                    "id": "finger1",
+                    "parameters": {"pointerType": "touch"},
+                    "actions": list(self._pointer),
+                }
+            )
+        if uses_keys:
+            sources.append(
+                {"type": "key", "id": "keyboard", "actions": list(self._keys)}
+            )
+        return {"actions": sources}
+
+    def perform(
+        self,
+        wda_url: str = "http://localhost:8100",
+        session_id: str | None = None,
+    ) -> bool:
+        """
+        Send the chain to WDA as one request.
+
+        Args:
+            wda_url: WebDriverAgent URL.
+            session_id: Optional WDA session ID.
+
+        Returns:
+            True if WDA accepted and ran the chain, False otherwise.
+
+        Raises:
+            requests.ReadTimeout: If WDA did not reply in time. The chain
+                reached WDA and may have run, so it must not be resent.
+        """
+        response = get_wda_client(wda_url).post(
+            "actions",
+            json=self.to_payload(),
+            session_id=session_id,
+            timeout=(self.duration_ms + self.typing_ms) / 1000 + 10,
+        )
+        return response.status_code == 200
+
+    def _add_pointer(self, action: dict[str, Any]) -> "ActionChain":
+        # Sources advance together one tick at a time, so the key source
+        # idles while the pointer acts, and the other way round
+        self._pointer.append(action)
+        self._keys.append({"type": "pause", "duration": 0})
+        return self
+
+    def _add_key(self, action: dict[str, Any]) -> "ActionChain":
+        self._keys.append(action)
+        self._pointer.append({"type": "pause", "duration": 0})
+        return self
+
+
+def _has_input(actions: list[dict[str, Any]]) -> bool:
+    return any(action["type"] != "pause" for action in actions)
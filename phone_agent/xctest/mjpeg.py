@@ -0,0 +1,322 @@
+"""Background consumer for the WebDriverAgent MJPEG screen stream.
+
+WDA serves the screen as multipart JPEG frames on its MJPEG port (9100 by
+default; forward it like the WDA port when connected over USB). A
+MjpegFrameGrabber keeps one connection open and holds the latest frames in
+a small ring buffer, so a screenshot is a buffer read instead of a
+/screenshot round trip, and frame signatures for screen-settle detection
+cost nothing on the device.
+
+Frames are JPEGs at WDA's mjpegScalingFactor and mjpegServerScreenshotQuality
+settings. Keep the scaling factor at 100 so frame dimensions match the
+screen and tap coordinates stay correct.
+"""
+
+import hashlib
+import os
+import re
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import cached_property
+from urllib.parse import urlsplit
+
+_SOI = b"\xff\xd8"  # JPEG start of image
+_EOI = b"\xff\xd9"  # JPEG end of image
+_CONTENT_LENGTH = re.compile(rb"content-length:\s*(\d+)", re.IGNORECASE)
+_READ_SIZE = 256 * 1024
+
+
+@dataclass
+class MjpegConfig:
+    """Configuration for MJPEG frame grabbing."""
+
+    max_frame_age: float = 1.0  # Older frames are stale; fall back to /screenshot
+    buffer_size: int = 4  # Recent frames kept in the ring buffer
+    connect_timeout: float = 3.0  # Seconds to connect to the MJPEG server
+    read_timeout: float = 5.0  # Reconnect when no data arrives for this long
+    reconnect_delay: float = 1.0  # Wait before reconnecting after an error
+
+    def __post_init__(self):
+        """Load values from environment variables if present."""
+        self.max_frame_age = float(
+            os.getenv("PHONE_AGENT_MJPEG_MAX_FRAME_AGE", self.max_frame_age)
+        )
+        self.buffer_size = int(
+            os.getenv("PHONE_AGENT_MJPEG_BUFFER_SIZE", self.buffer_size)
+        )
+        self.connect_timeout = float(
+            os.getenv("PHONE_AGENT_MJPEG_CONNECT_TIMEOUT", self.connect_timeout)
+        )
+        self.read_timeout = float(
+            os.getenv("PHONE_AGENT_MJPEG_READ_TIMEOUT", self.read_timeout)
+        )
+        self.reconnect_delay = float(
+            os.getenv("PHONE_AGENT_MJPEG_RECONNECT_DELAY", self.reconnect_delay)
+        )
+
+
+@dataclass
+class MjpegFrame:
+    """One JPEG frame read from the stream."""
+
+    data: bytes
+    seq: int  # Position in the stream, starting at 1
+    received_at: float  # time.monotonic() when the frame was complete
+
+    @property
+    def age(self) -> float:
+        """Seconds since the frame was received."""
+        return time.monotonic() - self.received_at
+
+    @cached_property
+    def digest(self) -> str:
+        """Hex digest of the frame bytes, computed on first use."""
+        return hashlib.md5(self.data).hexdigest()
+
+
+class MjpegFrameGrabber:
+    """
+    Reads an MJPEG stream on a background thread into a ring buffer.
+
+    The thread reconnects after errors until stop() is called. Safe to
+    share between threads.
+
+    Args:
+        url: MJPEG server URL, e.g. "http://localhost:9100".
+        config: Buffer size and timeouts. Defaults to MjpegConfig().
+
+    Example:
+        >>> grabber = MjpegFrameGrabber("http://localhost:9100")
+        >>> grabber.start()
+        >>> frame = grabber.latest(max_age=1.0)
+    """
+
+    def __init__(self, url: str, config: MjpegConfig | None = None):
+        self.url = url
+        self.config = config or MjpegConfig()
+        self.frames_received = 0
+        self.reconnects = 0
+
+        self._frames: deque[MjpegFrame] = deque(maxlen=max(1, self.config.buffer_size))
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._socket: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the reader thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the reader thread if it is not running."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"mjpeg-{self.url}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the reader thread and close the connection."""
+        self._stop.set()
+        sock = self._socket
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._condition:
+            self._condition.notify_all()
+
+    def frames(self) -> list[MjpegFrame]:
+        """Get the buffered frames, oldest first."""
+        with self._condition:
+            return list(self._frames)
+
+    def latest(self, max_age: float | None = None) -> MjpegFrame | None:
+        """
+        Get the newest frame.
+
+        Args:
+            max_age: If set, frames older than this many seconds are stale.
+
+        Returns:
+            The newest frame, or None if there is none or it is stale.
+        """
+        with self._condition:
+            frame = self._frames[-1] if self._frames else None
+        if frame is None or (max_age is not None and frame.age > max_age):
+            return None
+        return frame
+
+    def wait_for_frame(
+        self, newer_than: float | None = None, timeout: float = 1.0
+    ) -> MjpegFrame | None:
+        """
+        Wait for a frame received after a point in time.
+
+        Args:
+            newer_than: time.monotonic() value the frame must be newer than.
+                Defaults to now, i.e. the next frame.
+            timeout: Maximum time to wait in seconds.
+
+        Returns:
+            The frame, or None if none arrived in time.
+        """
+        if newer_than is None:
+            newer_than = time.monotonic()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while not self._frames or self._frames[-1].received_at <= newer_than:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop.is_set():
+                    return None
+                self._condition.wait(remaining)
+            return self._frames[-1]
+
+    def __enter__(self) -> "MjpegFrameGrabber":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        """Reader thread: stream frames, reconnecting after errors."""
+        while not self._stop.is_set():
+            try:
+                self._stream()
+            except OSError:
+                pass
+            if self._stop.wait(self.config.reconnect_delay):
+                break
+            self.reconnects += 1
+
+    def _stream(self) -> None:
+        """Read frames from one connection until it closes or stop() is called."""
+        parts = urlsplit(self.url)
+        host = parts.hostname or "localhost"
+        port = parts.port or 9100
+
+        sock = socket.create_connection((host, port), self.config.connect_timeout)
+        self._socket = sock
+        try:
+            sock.settimeout(self.config.read_timeout)
+            path = parts.path or "/"
+            sock.sendall(
+                f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode("ascii")
+            )
+
+            buffer = bytearray()
+            while not self._stop.is_set():
+                chunk = sock.recv(_READ_SIZE)
+                if not chunk:
+                    return
+                buffer += chunk
+                for data in _split_frames(buffer):
+                    self._add_frame(data)
+        finally:
+            self._socket = None
+            sock.close()
+
+    def _add_frame(self, data: bytes) -> None:
+        with self._condition:
+            self.frames_received += 1
+            self._frames.append(
+                MjpegFrame(data, self.frames_received, time.monotonic())
+            )
+            self._condition.notify_all()
+
+
+def _split_frames(buffer: bytearray) -> list[bytes]:
+    """
+    Remove the complete JPEG frames from the front of a stream buffer.
+
+    Uses the part's Content-Length when present, which WDA always sends,
+    and otherwise scans for the end-of-image marker.
+
+    Args:
+        buffer: Bytes read so far. Consumed bytes are deleted in place.
+
+    Returns:
+        Complete frames in stream order.
+    """
+    frames = []
+    while True:
+        start = buffer.find(_SOI)
+        if start < 0:
+            if len(buffer) > _READ_SIZE:
+                # No frame in sight; drop junk but keep a possible 0xFF
+                del buffer[:-1]
+            return frames
+
+        lengths = _CONTENT_LENGTH.findall(buffer, 0, start)
+        if lengths:
+            end = start + int(lengths[-1])
+            if len(buffer) < end:
+                return frames
+        else:
+            eoi = buffer.find(_EOI, start + 2)
+            if eoi < 0:
+                return frames
+            end = eoi + 2
+
+        frames.append(bytes(buffer[start:end]))
+        del buffer[:end]
+
+
+def default_mjpeg_url(wda_url: str, port: int = 9100) -> str:
+    """
+    Get the MJPEG URL on the same host as a WDA URL.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+        port: MJPEG server port.
+
+    Returns:
+        MJPEG server URL.
+    """
+    parts = urlsplit(wda_url)
+    return f"{parts.scheme or 'http'}://{parts.hostname or 'localhost'}:{port}"
+
+
+# Grabbers by MJPEG URL, shared by all xctest functions
+_grabbers: dict[str, MjpegFrameGrabber] = {}
+_grabbers_lock = threading.Lock()
+
+
+def get_frame_grabber(mjpeg_url: str) -> MjpegFrameGrabber:
+    """
+    Get the shared, running grabber for an MJPEG URL, starting it on first use.
+
+    Args:
+        mjpeg_url: MJPEG server URL.
+
+    Returns:
+        The grabber for that URL.
+    """
+    key = mjpeg_url.rstrip("/")
+    with _grabbers_lock:
+        grabber = _grabbers.get(key)
+        if grabber is None:
+            grabber = MjpegFrameGrabber(key)
+            _grabbers[key] = grabber
+        grabber.start()
+    return grabber
+
+
+def stop_frame_grabbers() -> None:
+    """Stop and forget every shared grabber."""
+    with _grabbers_lock:
+        grabbers = list(_grabbers.values())
+        _grabbers.clear()
+    for grabber in grabbers:
+        grabber.stop()
@@ -10,6 +10,17 @@ from io import BytesIO
 
 from PIL import Image
 
+from phone_agent.imaging import (
+    ScreenshotEncodingConfig,
+    create_blank_image,
+    get_mime_type,
+    needs_transcode,
+    prepare_image,
+    probe_base64_image,
+)
+from phone_agent.xctest.client import get_wda_client
+from phone_agent.xctest.mjpeg import get_frame_grabber
+
 
 @dataclass
 class Screenshot:
@@ -19,6 +30,7 @@ class Screenshot:
     width: int
     height: int
     is_sensitive: bool = False
+    mime_type: str = "image/png"
 
 
 def get_screenshot(
@@ -26,6 +38,8 @@ def get_screenshot(
     session_id: str | None = None,
     device_id: str | None = None,
     timeout: int = 10,
+    encoding: ScreenshotEncodingConfig | None = None,
+    mjpeg_url: str | None = None,
 ) -> Screenshot:
     """
     Capture a screenshot from the connected iOS device.
@@ -35,21 +49,32 @@ def get_screenshot(
         session_id: Optional WDA session ID.
         device_id: Optional device UDID (for idevicescreenshot fallback).
         timeout: Timeout in seconds for screenshot operations.
+        encoding: Encoding of the image sent to the model. If None, the
+            captured image is passed through as-is.
+        mjpeg_url: Optional WDA MJPEG server URL. When set, the latest
+            streamed frame is returned if it is fresh.
 
     Returns:
         Screenshot object containing base64 data and dimensions.
 
     Note:
-        Tries WebDriverAgent first, falls back to idevicescreenshot if available.
-        If both fail, returns a black fallback image.
+        Tries the MJPEG stream first if configured, then WebDriverAgent,
+        then idevicescreenshot if available. If all fail, returns a black
+        fallback image.
     """
+    # Latest streamed frame, if any
+    if mjpeg_url:
+        screenshot = _get_screenshot_mjpeg(mjpeg_url, encoding)
+        if screenshot:
+            return screenshot
+
     # Try WebDriverAgent first (preferred method)
-    screenshot = _get_screenshot_wda(wda_url, session_id, timeout)
+    screenshot = _get_screenshot_wda(wda_url, session_id, timeout, encoding)
     if screenshot:
         return screenshot
 
     # Fallback to idevicescreenshot
-    screenshot = _get_screenshot_idevice(device_id, timeout)
+    screenshot = _get_screenshot_idevice(device_id, timeout, encoding)
     if screenshot:
         return screenshot
 
@@ -57,8 +82,63 @@ def get_screenshot(
     return _create_fallback_screenshot(is_sensitive=False)
 
 
+def _get_screenshot_mjpeg(
+    mjpeg_url: str, encoding: ScreenshotEncodingConfig | None = None
+) -> Screenshot | None:
+    """
+    Take the latest frame from the MJPEG stream.
+
+    Args:
+        mjpeg_url: WDA MJPEG server URL.
+        encoding: Optional target encoding.
+
+    Returns:
+        Screenshot object, or None if no fresh frame is available.
+    """
+    grabber = get_frame_grabber(mjpeg_url)
+    frame = grabber.latest(max_age=grabber.config.max_frame_age)
+    if frame is None:
+        return None
+
+    try:
+        image = prepare_image(frame.data, encoding)
+    except ValueError:
+        return None
+    return Screenshot(
+        base64_data=image.base64_data,
+        width=image.width,
+        height=image.height,
+        is_sensitive=False,
+        mime_type=image.mime_type,
+    )
+
+
+def get_frame_signature(mjpeg_url: str | None) -> str | None:
+    """
+    Get a signature of the current frame for change detection.
+
+    Waits for the next streamed frame, so consecutive calls compare frames
+    captured after each call. Nothing is requested from the device.
+
+    Args:
+        mjpeg_url: WDA MJPEG server URL.
+
+    Returns:
+        Hex digest of the frame, or None if there is no MJPEG stream or it
+        did not deliver a frame in time.
+    """
+    if not mjpeg_url:
+        return None
+    grabber = get_frame_grabber(mjpeg_url)
+    frame = grabber.wait_for_frame(timeout=grabber.config.max_frame_age)
+    return frame.digest if frame else None
+
+
 def _get_screenshot_wda(
-    wda_url: str, session_id: str | None, timeout: int
+    wda_url: str,
+    session_id: str | None,
+    timeout: int,
+    encoding: ScreenshotEncodingConfig | None = None,
 ) -> Screenshot | None:
     """
     Capture screenshot using WebDriverAgent.
@@ -67,32 +147,36 @@ def _get_screenshot_wda(
         wda_url: WebDriverAgent URL.
         session_id: Optional WDA session ID.
         timeout: Timeout in seconds.
+        encoding: Optional target encoding.
 
     Returns:
         Screenshot object or None if failed.
     """
     try:
-        import requests
-
-        url = f"{wda_url.rstrip('/')}/screenshot"
-
-        response = requests.get(url, timeout=timeout, verify=False)
+        response = get_wda_client(wda_url).get("screenshot", timeout=timeout)
 
         if response.status_code == 200:
             data = response.json()
             base64_data = data.get("value", "")
 
             if base64_data:
-                # Decode to get dimensions
-                img_data = base64.b64decode(base64_data)
-                img = Image.open(BytesIO(img_data))
-                width, height = img.size
+                # Read dimensions from the header; the payload is passed through
+                info = probe_base64_image(base64_data)
+
+                if info is None or needs_transcode(*info, encoding):
+                    image = prepare_image(base64.b64decode(base64_data), encoding)
+                    base64_data, mime_type = image.base64_data, image.mime_type
+                    width, height = image.width, image.height
+                else:
+                    image_format, width, height = info
+                    mime_type = get_mime_type(image_format)
 
                 return Screenshot(
                     base64_data=base64_data,
                     width=width,
                     height=height,
                     is_sensitive=False,
+                    mime_type=mime_type,
                 )
 
     except ImportError:
@@ -104,7 +188,9 @@ def _get_screenshot_wda(
 
 
 def _get_screenshot_idevice(
-    device_id: str | None, timeout: int
+    device_id: str | None,
+    timeout: int,
+    encoding: ScreenshotEncodingConfig | None = None,
 ) -> Screenshot | None:
     """
     Capture screenshot using idevicescreenshot (libimobiledevice).
@@ -112,6 +198,7 @@ def _get_screenshot_idevice(
     Args:
         device_id: Optional device UDID.
         timeout: Timeout in seconds.
+        encoding: Optional target encoding.
 
     Returns:
         Screenshot object or None if failed.
@@ -131,19 +218,20 @@ def _get_screenshot_idevice(
         )
 
         if result.returncode == 0 and os.path.exists(temp_path):
-            # Read and encode image
-            img = Image.open(temp_path)
-            width, height = img.size
-
-            buffered = BytesIO()
-            img.save(buffered, format="PNG")
-            base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
+            # PNG is passed through; older iOS versions produce TIFF, which
+            # is converted once
+            with open(temp_path, "rb") as f:
+                image = prepare_image(f.read(), encoding)
 
             # Cleanup
             os.remove(temp_path)
 
             return Screenshot(
-                base64_data=base64_data, width=width, height=height, is_sensitive=False
+                base64_data=image.base64_data,
+                width=image.width,
+                height=image.height,
+                is_sensitive=False,
+                mime_type=image.mime_type,
             )
 
     except FileNotFoundError:
@@ -167,18 +255,14 @@ def _create_fallback_screenshot(is_sensitive: bool) -> Screenshot:
         Screenshot object with black image.
     """
     # Default iPhone screen size (iPhone 14 Pro)
-    default_width, default_height = 1179, 2556
-
-    black_img = Image.new("RGB", (default_width, default_height), color="black")
-    buffered = BytesIO()
-    black_img.save(buffered, format="PNG")
-    base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
+    image = create_blank_image(1179, 2556)
 
     return Screenshot(
-        base64_data=base64_data,
-        width=default_width,
-        height=default_height,
+        base64_data=image.base64_data,
+        width=image.width,
+        height=image.height,
         is_sensitive=is_sensitive,
+        mime_type=image.mime_type,
     )
 
 
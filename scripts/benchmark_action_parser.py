@@ -0,0 +1,234 @@
+"""
+Compare the action parser with the previous ast-based implementation.
+
+Checks both parsers against a hand-written corpus (scripts/action_parser_corpus.json)
+and a seeded fuzz corpus of generated actions with random text, escapes and
+nested lists, then times both on the combined inputs.
+
+Usage examples:
+  python scripts/benchmark_action_parser.py
+  python scripts/benchmark_action_parser.py --fuzz 20000 --seed 7
+"""
+
+import argparse
+import ast
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phone_agent.actions.handler import parse_action  # noqa: E402
+
+_TEXT_ALPHABET = "abcxyz ABC 0123 你好微信设置 ,.;:!?()[]{}=+-_/\\'\"\n\t" + "é€😀"
+
+
+def legacy_parse_action(response: str) -> dict:
+    """The ast-based parse_action this parser replaced, minus its print."""
+    try:
+        response = response.strip()
+        if response.startswith('do(action="Type"') or response.startswith(
+            'do(action="Type_Name"'
+        ):
+            text = response.split("text=", 1)[1][1:-2]
+            return {"_metadata": "do", "action": "Type", "text": text}
+        elif response.startswith("do"):
+            try:
+                response = response.replace("\n", "\\n")
+                response = response.replace("\r", "\\r")
+                response = response.replace("\t", "\\t")
+
+                tree = ast.parse(response, mode="eval")
+                if not isinstance(tree.body, ast.Call):
+                    raise ValueError("Expected a function call")
+
+                action = {"_metadata": "do"}
+                for keyword in tree.body.keywords:
+                    action[keyword.arg] = ast.literal_eval(keyword.value)
+                return action
+            except (SyntaxError, ValueError) as e:
+                raise ValueError(f"Failed to parse do() action: {e}")
+        elif response.startswith("finish"):
+            return {
+                "_metadata": "finish",
+                "message": response.replace("finish(message=", "")[1:-2],
+            }
+        else:
+            raise ValueError(f"Failed to parse action: {response}")
+    except Exception as e:
+        raise ValueError(f"Failed to parse action: {e}")
+
+
+def render(value) -> str:
+    """Render a value the way the model writes literals."""
+    if isinstance(value, str):
+        escaped = (
+            value.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n")
+            .replace("\t", "\\t")
+        )
+        return f'"{escaped}"'
+    if isinstance(value, list):
+        return "[" + ", ".join(render(item) for item in value) + "]"
+    return repr(value)
+
+
+def random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(_TEXT_ALPHABET) for _ in range(rng.randint(0, 24)))
+
+
+def random_point(rng: random.Random) -> list:
+    return [rng.randint(0, 999), rng.randint(0, 999)]
+
+
+def generate_fuzz(count: int, seed: int) -> list[tuple[str, dict | None]]:
+    """Generate (input, expected) pairs with known ground truth."""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        choice = rng.randrange(8)
+        if choice == 0:
+            # Free text is kept as written, escapes and all
+            message = render(random_text(rng))
+            expected = {"_metadata": "finish", "message": message[1:-1]}
+            text = f"finish(message={message})"
+        elif choice == 1:
+            name = rng.choice(["Type", "Type_Name"])
+            typed = render(random_text(rng))
+            expected = {"_metadata": "do", "action": "Type", "text": typed[1:-1]}
+            text = f'do(action="{name}", text={typed})'
+        elif choice == 2:
+            expected = {
+                "_metadata": "do",
+                "action": "Swipe",
+                "start": random_point(rng),
+                "end": random_point(rng),
+            }
+            text = (
+                f'do(action="Swipe", start={render(expected["start"])}, '
+                f"end={render(expected['end'])})"
+            )
+        elif choice == 3:
+            expected = {"_metadata": "do", "action": "Launch", "app": random_text(rng)}
+            text = f'do(action="Launch", app={render(expected["app"])})'
+        elif choice == 4:
+            expected = {
+                "_metadata": "do",
+                "action": "Tap",
+                "element": random_point(rng),
+                "message": random_text(rng),
+            }
+            text = (
+                f'do(action="Tap", element={render(expected["element"])}, '
+                f"message={render(expected['message'])})"
+            )
+        elif choice == 5:
+            expected = {
+                "_metadata": "do",
+                "action": "Tap",
+                "element": [random_point(rng) for _ in range(rng.randint(0, 3))],
+            }
+            text = f'do(action="Tap", element={render(expected["element"])})'
+        elif choice == 6:
+            # Truncated output, e.g. a stream cut off by max_tokens
+            full = f'do(action="Tap", element={render(random_point(rng))})'
+            expected = None
+            text = full[: rng.randint(0, len(full) - 1)]
+        else:
+            expected = {"_metadata": "do", "action": rng.choice(["Back", "Home"])}
+            text = f'do(action="{expected["action"]}")'
+
+        if expected is not None and rng.random() < 0.2:
+            text = rng.choice(["  ", "\n"]) + text + rng.choice(["", "\n", "  "])
+        cases.append((text, expected))
+    return cases
+
+
+def evaluate(parser, cases) -> tuple[int, int, list]:
+    """Count correct outcomes and unexpected (non-ValueError) exceptions."""
+    correct = 0
+    crashes = 0
+    mismatches = []
+    for text, expected in cases:
+        try:
+            result = parser(text)
+        except ValueError:
+            result = None
+        except Exception:
+            crashes += 1
+            result = None
+        if result == expected:
+            correct += 1
+        else:
+            mismatches.append((text, expected, result))
+    return correct, crashes, mismatches
+
+
+def time_parser(parser, inputs: list[str], repeat: int) -> float:
+    """Best per-call time in microseconds."""
+
+    def run():
+        for text in inputs:
+            try:
+                parser(text)
+            except Exception:
+                pass
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(inputs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the action parser against the previous implementation"
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=os.path.join(os.path.dirname(__file__), "action_parser_corpus.json"),
+        help="Path to the hand-written corpus",
+    )
+    parser.add_argument(
+        "--fuzz", type=int, default=5000, help="Number of generated cases"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Fuzz seed")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timing repetitions (best is reported)"
+    )
+    parser.add_argument(
+        "--show", type=int, default=5, help="Mismatches to print per parser"
+    )
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [(case["input"], case["expected"]) for case in json.load(f)]
+    fuzz = generate_fuzz(args.fuzz, args.seed)
+
+    parsers = [("legacy", legacy_parse_action), ("parser", parse_action)]
+
+    for label, cases in [("corpus", corpus), ("fuzz", fuzz)]:
+        print(f"\n{label}: {len(cases)} cases")
+        for name, func in parsers:
+            correct, crashes, mismatches = evaluate(func, cases)
+            print(
+                f"  {name:<8} correct {correct}/{len(cases)} "
+                f"({correct / len(cases):.1%}), unexpected exceptions {crashes}"
+            )
+            for text, expected, result in mismatches[: args.show]:
+                print(
+                    f"      {text!r}\n        expected {expected}\n        got      {result}"
+                )
+
+    inputs = [text for text, _ in corpus + fuzz]
+    print(f"\ntiming: {len(inputs)} inputs, best of {args.repeat}")
+    timings = {name: time_parser(func, inputs, args.repeat) for name, func in parsers}
+    for name, micros in timings.items():
+        print(f"  {name:<8} {micros:.2f} us/action")
+    print(f"  speedup  {timings['legacy'] / timings['parser']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Benchmark the agent loop offline by replaying recorded trajectories.
+
+Replays each episode in a recording directory (written with main.py --record)
+through PhoneAgent with a fake device and a fake model, and reports the time
+the loop spends outside the model: screenshot preparation, context building,
+stream and action parsing, and dispatch. Without a recording, a synthetic
+episode with generated screens is used so the benchmark runs anywhere.
+
+Usage examples:
+  python scripts/benchmark_replay.py recordings/
+  python scripts/benchmark_replay.py --synthetic 30 --repeat 5
+  python scripts/benchmark_replay.py recordings/ --screenshot-format jpeg --screenshot-max-edge 1280
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phone_agent.agent import AgentConfig  # noqa: E402
+from phone_agent.history import RollingHistoryPolicy  # noqa: E402
+from phone_agent.imaging import ScreenshotEncodingConfig  # noqa: E402
+from phone_agent.model import ModelConfig  # noqa: E402
+from phone_agent.recorder import RecordedStep  # noqa: E402
+from phone_agent.replay import (  # noqa: E402
+    ReplayEpisode,
+    load_episodes,
+    replay_episode,
+)
+
+_SYNTHETIC_ACTIONS = [
+    (
+        'do(action="Tap", element=[500, 300])',
+        {"_metadata": "do", "action": "Tap", "element": [500, 300]},
+    ),
+    (
+        'do(action="Type", text="无线耳机")',
+        {"_metadata": "do", "action": "Type", "text": "无线耳机"},
+    ),
+    (
+        'do(action="Swipe", start=[500, 800], end=[500, 200])',
+        {"_metadata": "do", "action": "Swipe", "start": [500, 800], "end": [500, 200]},
+    ),
+    ('do(action="Back")', {"_metadata": "do", "action": "Back"}),
+]
+
+
+def synthetic_episode(steps: int, seed: int = 0) -> ReplayEpisode:
+    """Build an episode with generated 1080x2400 screens and simple actions."""
+    rng = random.Random(seed)
+    recorded = []
+    for index in range(steps):
+        img = Image.new("RGB", (1080, 2400), (245, 245, 245))
+        draw = ImageDraw.Draw(img)
+        for _ in range(40):
+            x, y = rng.randrange(1000), rng.randrange(2300)
+            color = tuple(rng.randrange(256) for _ in range(3))
+            draw.rectangle([x, y, x + rng.randrange(20, 400), y + 60], fill=color)
+        buffered = BytesIO()
+        img.save(buffered, format="PNG")
+
+        if index == steps - 1:
+            output, action = (
+                'finish(message="完成")',
+                {"_metadata": "finish", "message": "完成"},
+            )
+        else:
+            output, action = _SYNTHETIC_ACTIONS[index % len(_SYNTHETIC_ACTIONS)]
+        thinking = "当前页面显示搜索结果，我需要继续操作。" * rng.randint(2, 8)
+        data = {
+            "episode": "synthetic",
+            "step": index + 1,
+            "task": "打开淘宝，搜索无线耳机" if index == 0 else None,
+            "current_app": "淘宝",
+            "screenshot": f"{index:064x}",
+            "action": action,
+            "raw_output": f"<think>{thinking}</think><answer>{output}</answer>",
+            "time_to_first_token": 0.3,
+            "model_time": 1.5,
+        }
+        recorded.append(RecordedStep(data=data, screenshot=buffered.getvalue()))
+    return ReplayEpisode("synthetic", recorded[0].data["task"], recorded)
+
+
+def format_ms(values: list[float]) -> str:
+    if not values:
+        return "n/a"
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"median {statistics.median(ordered) * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay recorded trajectories and measure agent-loop overhead"
+    )
+    parser.add_argument(
+        "recording", nargs="?", help="Recording directory (default: synthetic episode)"
+    )
+    parser.add_argument(
+        "--synthetic", type=int, default=20, help="Steps in the synthetic episode"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Times to replay each episode"
+    )
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=0.0,
+        help="Multiplier on the recorded model latency (default: 0, no waiting)",
+    )
+    parser.add_argument(
+        "--screenshot-format",
+        type=str,
+        choices=["png", "jpeg", "webp"],
+        help="Re-encode screenshots in this format",
+    )
+    parser.add_argument(
+        "--screenshot-max-edge", type=int, help="Downscale screenshots to this edge"
+    )
+    parser.add_argument(
+        "--history-turns", type=int, help="Use a rolling history with N verbatim turns"
+    )
+    args = parser.parse_args()
+
+    if args.recording:
+        episodes = load_episodes(args.recording)
+    else:
+        episodes = [synthetic_episode(args.synthetic)]
+    if not episodes:
+        print(f"No episodes found in {args.recording}")
+        return
+
+    screenshot_encoding = None
+    if args.screenshot_format or args.screenshot_max_edge:
+        screenshot_encoding = ScreenshotEncodingConfig(
+            image_format=args.screenshot_format or "png",
+            max_long_edge=args.screenshot_max_edge,
+        )
+    model_config = ModelConfig(screenshot_encoding=screenshot_encoding)
+
+    step_overheads, screenshot_times, mismatches = [], [], 0
+    total_steps = 0
+    for episode in episodes:
+        for _ in range(args.repeat):
+            agent_config = AgentConfig(max_steps=len(episode.steps), verbose=False)
+            if args.history_turns is not None:
+                agent_config.history_policy = RollingHistoryPolicy(
+                    keep_turns=args.history_turns
+                )
+            result = replay_episode(
+                episode, model_config, agent_config, args.latency_scale
+            )
+            total_steps += result.steps
+            mismatches += len(result.mismatches)
+            step_overheads.extend(
+                step - model
+                for step, model in zip(result.step_times, result.model_times)
+            )
+            screenshot_times.extend(result.screenshot_times)
+            for step, recorded, replayed in result.mismatches:
+                print(
+                    f"  mismatch {result.episode_id} step {step}: {recorded} -> {replayed}"
+                )
+
+    print(f"Episodes: {len(episodes)} x {args.repeat}, steps replayed: {total_steps}")
+    print(f"Loop overhead per step: {format_ms(step_overheads)}")
+    print(f"Screenshot preparation: {format_ms(screenshot_times)}")
+    print(f"Action mismatches:      {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
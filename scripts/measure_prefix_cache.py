@@ -0,0 +1,126 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+from openai import OpenAI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phone_agent.config import get_system_prompt  # noqa: E402
+
+TASKS = [
+    "打开设置，查看电池用量",
+    "打开微信，给文件传输助手发送你好",
+    "打开美团，搜索附近的咖啡店",
+    "打开淘宝，搜索无线耳机",
+    "打开高德地图，搜索最近的地铁站",
+    "打开小红书，搜索周末去哪儿",
+    "打开抖音，搜索美食教程",
+    "打开京东，查看购物车",
+]
+
+
+def time_to_first_token(client: OpenAI, args, system_prompt: str, task: str) -> float:
+    """Stream one first-step request and return seconds until the first token."""
+    start = time.perf_counter()
+    kwargs = {}
+    if args.prompt_cache_key:
+        kwargs["prompt_cache_key"] = args.prompt_cache_key
+    stream = client.chat.completions.create(
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f'{task}\n\n{{"current_app": "System Home"}}'},
+        ],
+        model=args.model,
+        max_tokens=1,
+        temperature=0.0,
+        stream=True,
+        **kwargs,
+    )
+    ttft = None
+    for chunk in stream:
+        if ttft is None and chunk.choices and chunk.choices[0].delta.content:
+            ttft = time.perf_counter() - start
+    return ttft if ttft is not None else time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure how much the shared system prompt prefix speeds up the first step",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Sends the first step of several different tasks twice: once with the normal
+system prompt (static instructions first, so tasks share a cached prefix) and
+once with a unique marker in front of it, which defeats prefix caching. The
+TTFT gap is the prefill time the shared prefix saves per task.
+
+Usage examples:
+  python scripts/measure_prefix_cache.py --base-url http://localhost:8000/v1 --model autoglm-phone-9b
+  python scripts/measure_prefix_cache.py --base-url http://localhost:8000/v1 --model autoglm-phone-9b --lang en --rounds 3
+        """,
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        required=True,
+        help="Base URL of the API service, e.g.: http://localhost:8000/v1",
+    )
+    parser.add_argument(
+        "--apikey", type=str, default="EMPTY", help="API key (default: EMPTY)"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        required=True,
+        help="Name of the model to test, e.g.: autoglm-phone-9b",
+    )
+    parser.add_argument(
+        "--lang",
+        type=str,
+        choices=["cn", "en"],
+        default="cn",
+        help="System prompt language (default: cn)",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=2,
+        help="Times to go through the task list (default: 2)",
+    )
+    parser.add_argument(
+        "--prompt-cache-key",
+        type=str,
+        help="Cache key to send with the shared-prefix requests",
+    )
+    args = parser.parse_args()
+
+    client = OpenAI(base_url=args.base_url, api_key=args.apikey)
+    system_prompt = get_system_prompt(args.lang)
+
+    # Warm the shared prefix once so every measured request can hit it
+    time_to_first_token(client, args, system_prompt, TASKS[0])
+
+    shared, unique = [], []
+    for _ in range(args.rounds):
+        for task in TASKS:
+            shared.append(time_to_first_token(client, args, system_prompt, task))
+            marker = f"[{uuid.uuid4().hex}]\n"
+            unique.append(
+                time_to_first_token(client, args, marker + system_prompt, task)
+            )
+
+    print(f"Requests per layout: {len(shared)}")
+    print(
+        f"Shared prefix TTFT: median {statistics.median(shared):.3f}s, "
+        f"max {max(shared):.3f}s"
+    )
+    print(
+        f"Uncached TTFT:      median {statistics.median(unique):.3f}s, "
+        f"max {max(unique):.3f}s"
+    )
+    print(
+        f"Saved per task:     {statistics.median(unique) - statistics.median(shared):.3f}s"
+    )
@@ -0,0 +1,76 @@
+"""Tests for parsing model action calls."""
+
+import pytest
+
+from phone_agent.actions.handler import parse_action
+
+
+def test_do_call_with_coordinates():
+    assert parse_action('do(action="Tap", element=[500, 300])') == {
+        "_metadata": "do",
+        "action": "Tap",
+        "element": [500, 300],
+    }
+
+
+def test_escapes_are_decoded_outside_free_text():
+    action = parse_action(r'do(action="Launch", app="a\tb\u00e9\"c")')
+    assert action["app"] == 'a\tbé"c'
+
+
+@pytest.mark.parametrize(
+    "response, key, text",
+    [
+        (r'do(action="Type", text="C:\new\temp")', "text", r"C:\new\temp"),
+        (r'finish(message="line\nbreak")', "message", r"line\nbreak"),
+    ],
+)
+def test_free_text_is_kept_raw(response, key, text):
+    assert parse_action(response)[key] == text
+
+
+def test_nested_lists_and_tuples():
+    action = parse_action('do(action="Swipe", start=[1, [2, 3]], end=(4, 5))')
+    assert action["start"] == [1, [2, 3]]
+    assert action["end"] == (4, 5)
+
+
+def test_trailing_answer_tag_is_ignored():
+    assert parse_action('do(action="Back")</answer>') == {
+        "_metadata": "do",
+        "action": "Back",
+    }
+
+
+@pytest.mark.parametrize(
+    "response, key, text",
+    [
+        ('do(action="Type", text="say "hi" now")', "text", 'say "hi" now'),
+        ('finish(message="he said "ok"")</answer>', "message", 'he said "ok"'),
+    ],
+)
+def test_unescaped_quotes_in_free_text_are_recovered(response, key, text):
+    assert parse_action(response)[key] == text
+
+
+def test_type_name_maps_to_type():
+    assert parse_action('do(action="Type_Name", text="Bob")') == {
+        "_metadata": "do",
+        "action": "Type",
+        "text": "Bob",
+    }
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        "",
+        'do(action="Tap", element=[1, 2]',
+        "tap(1, 2)",
+        "do(action=Tap)",
+        'do(action="Tap", element=[1 2])',
+    ],
+)
+def test_malformed_input_raises_value_error(response):
+    with pytest.raises(ValueError):
+        parse_action(response)
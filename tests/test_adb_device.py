@@ -0,0 +1,53 @@
+"""Tests for the launcher lookup behind get_current_app."""
+
+import pytest
+
+from phone_agent.adb import device as device_module
+from phone_agent.adb.shell import ShellResult
+
+HOME = "priority=0 preferredOrder=0 match=0x108000 specificIndex=-1 isDefault=true\n"
+
+
+@pytest.fixture
+def shell(monkeypatch):
+    """Answer the launcher query with queued outputs and count the calls."""
+    outputs: list[str] = []
+    calls: list[str | None] = []
+
+    def run_shell(command, device_id=None, timeout=10.0):
+        calls.append(device_id)
+        return ShellResult(output=outputs.pop(0), exit_code=0)
+
+    monkeypatch.setattr(device_module, "run_shell", run_shell)
+    monkeypatch.setattr(device_module, "_home_packages", {})
+    return outputs, calls
+
+
+def test_resolved_launcher_is_cached_per_device(shell):
+    outputs, calls = shell
+    outputs += [HOME + "com.miui.home/.launcher.Launcher\n", "com.other/.Home\n"]
+
+    assert device_module._get_home_package("a") == "com.miui.home"
+    assert device_module._get_home_package("a") == "com.miui.home"
+    assert device_module._get_home_package("b") == "com.other"
+    assert calls == ["a", "b"]
+
+
+@pytest.mark.parametrize(
+    "failure", ["", "error: device offline", "No activity found\n"]
+)
+def test_failed_lookup_is_retried(shell, failure):
+    outputs, calls = shell
+    outputs += [failure, "com.android.launcher3/.Launcher\n"]
+
+    assert device_module._get_home_package("a") is None
+    assert device_module._get_home_package("a") == "com.android.launcher3"
+    assert len(calls) == 2
+
+
+def test_default_device_is_not_cached(shell):
+    outputs, calls = shell
+    outputs += ["com.first/.Home\n", "com.second/.Home\n"]
+
+    assert device_module._get_home_package(None) == "com.first"
+    assert device_module._get_home_package(None) == "com.second"
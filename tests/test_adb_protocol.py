@@ -0,0 +1,217 @@
+"""Tests for the adb server client and shell fallbacks against a fake adb."""
+
+import os
+import socket
+import stat
+import struct
+import subprocess
+import threading
+
+import pytest
+
+from phone_agent.adb import shell as shell_module
+from phone_agent.adb.protocol import ADBClient, ADBProtocolError
+from phone_agent.adb.shell import ADBShellSession, run_shell
+
+SERIAL = "emulator-5554"
+
+
+class FakeADBServer:
+    """
+    Minimal adb server: host:devices-l, host:transport, exec:, shell: and sync:.
+
+    Shell and exec commands run in the local /bin/sh. Sync reads and writes
+    an in-memory file table.
+    """
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self.requests: list[str] = []
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.port = self._server.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.close()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket) -> None:
+        with conn:
+            request = self._read_request(conn)
+            if request == "host:devices-l":
+                payload = f"{SERIAL}\tdevice product:sdk model:Pixel\n".encode()
+                conn.sendall(b"OKAY" + f"{len(payload):04x}".encode() + payload)
+                return
+            if request not in (f"host:transport:{SERIAL}", "host:transport-any"):
+                message = b"device not found"
+                conn.sendall(b"FAIL" + f"{len(message):04x}".encode() + message)
+                return
+            conn.sendall(b"OKAY")
+
+            service = self._read_request(conn)
+            conn.sendall(b"OKAY")
+            if service.startswith(("shell:", "exec:")):
+                command = service.split(":", 1)[1]
+                result = subprocess.run(
+                    ["sh", "-c", command], capture_output=True, timeout=10
+                )
+                conn.sendall(result.stdout + result.stderr)
+            elif service == "sync:":
+                self._sync(conn)
+
+    def _sync(self, conn: socket.socket) -> None:
+        while True:
+            tag, length = struct.unpack("<4sI", _recv_exact(conn, 8))
+            if tag == b"QUIT":
+                return
+            argument = _recv_exact(conn, length).decode()
+            if tag == b"RECV":
+                data = self.files.get(argument)
+                if data is None:
+                    message = b"No such file or directory"
+                    conn.sendall(b"FAIL" + struct.pack("<I", len(message)) + message)
+                    return
+                for offset in range(0, len(data), 1000):
+                    chunk = data[offset : offset + 1000]
+                    conn.sendall(b"DATA" + struct.pack("<I", len(chunk)) + chunk)
+                conn.sendall(b"DONE" + struct.pack("<I", 0))
+            elif tag == b"SEND":
+                path, mode = argument.rsplit(",", 1)
+                chunks = []
+                while True:
+                    tag, length = struct.unpack("<4sI", _recv_exact(conn, 8))
+                    if tag == b"DONE":
+                        break
+                    chunks.append(_recv_exact(conn, length))
+                self.files[path] = b"".join(chunks)
+                self.requests.append(f"mode {int(mode):o}")
+                conn.sendall(b"OKAY" + struct.pack("<I", 0))
+
+    def _read_request(self, conn: socket.socket) -> str:
+        length = int(_recv_exact(conn, 4), 16)
+        request = _recv_exact(conn, length).decode()
+        self.requests.append(request)
+        return request
+
+
+def _recv_exact(conn: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("closed")
+        data += chunk
+    return data
+
+
+@pytest.fixture
+def server():
+    fake = FakeADBServer()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def client(server):
+    return ADBClient(port=server.port, timeout=5)
+
+
+@pytest.fixture
+def fake_adb_binary(tmp_path, monkeypatch):
+    """An `adb` on PATH that runs shell commands in the local sh."""
+    script = tmp_path / "adb"
+    script.write_text(
+        "#!/bin/sh\n"
+        'if [ "$1" = "-s" ]; then shift 2; fi\n'
+        'if [ "$1" = "shell" ]; then shift; fi\n'
+        "if [ $# -eq 0 ]; then exec sh; fi\n"
+        'exec sh -c "$*"\n'
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    return script
+
+
+def test_devices_reads_length_prefixed_reply(client):
+    assert client.devices().startswith(f"{SERIAL}\tdevice")
+
+
+def test_transport_failure_raises(client):
+    with pytest.raises(ADBProtocolError, match="device not found"):
+        client.shell("true", serial="missing")
+
+
+def test_exec_out_returns_raw_bytes(client, server):
+    output = client.exec_out("printf 'a\\000b\\377'", serial=SERIAL)
+    assert output == b"a\x00b\xff"
+    assert server.requests[:2] == [
+        f"host:transport:{SERIAL}",
+        "exec:printf 'a\\000b\\377'",
+    ]
+
+
+def test_sync_push_then_pull_round_trips(client, server):
+    data = os.urandom(200 * 1024)  # Several DATA chunks each way
+    client.push(data, "/sdcard/blob.bin", mode=0o600, serial=SERIAL)
+    assert server.files["/sdcard/blob.bin"] == data
+    assert "mode 100600" in server.requests
+    assert client.pull("/sdcard/blob.bin", serial=SERIAL) == data
+
+
+def test_sync_pull_failure_raises(client):
+    with pytest.raises(ADBProtocolError, match="No such file"):
+        client.pull("/sdcard/missing", serial=SERIAL)
+
+
+@pytest.fixture
+def socket_shell(client, monkeypatch):
+    """Route run_shell through the fake server."""
+    monkeypatch.setattr(shell_module, "_PERSISTENT_SHELL", False)
+    monkeypatch.setattr(shell_module, "get_adb_client", lambda: client)
+
+
+def test_run_shell_reports_exit_code_over_socket(socket_shell):
+    result = run_shell("echo hello; exit 3", SERIAL)
+    assert result.output == "hello\n"
+    assert result.exit_code == 3
+
+
+def test_run_shell_success_over_socket(socket_shell):
+    result = run_shell(["echo", "it's quoted"], SERIAL)
+    assert result.output == "it's quoted\n"
+    assert result.exit_code == 0
+
+
+def test_run_shell_falls_back_to_adb_binary(fake_adb_binary, monkeypatch):
+    refused = ADBClient(port=_unused_port(), timeout=1)
+    monkeypatch.setattr(shell_module, "_PERSISTENT_SHELL", False)
+    monkeypatch.setattr(shell_module, "get_adb_client", lambda: refused)
+
+    result = run_shell("echo fallback; exit 2", SERIAL)
+    assert result.output == "fallback\n"
+    assert result.exit_code == 2
+
+
+def test_persistent_session_keeps_commands_apart(fake_adb_binary):
+    session = ADBShellSession(SERIAL)
+    try:
+        first = session.run("echo one; false")
+        second = session.run(["echo", "two"])
+    finally:
+        session.close()
+    assert (first.output, first.exit_code) == ("one\n", 1)
+    assert (second.output, second.exit_code) == ("two\n", 0)
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
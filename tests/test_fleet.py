@@ -0,0 +1,240 @@
+"""Tests for the fleet queue, workers and orchestrator with fake agents."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from phone_agent.device_factory import DeviceType
+from phone_agent.fleet import (
+    FleetConfig,
+    FleetDevice,
+    FleetOrchestrator,
+    FleetStats,
+    FleetTask,
+    TaskQueue,
+    check_wda_urls,
+    discover_devices,
+    parse_wda_urls,
+)
+from phone_agent.fleet import devices as devices_module
+from phone_agent.fleet.worker import DeviceWorker
+
+
+class FakeAgent:
+    """Finishes each task after `steps` steps; raises if the device is broken."""
+
+    def __init__(self, device: FleetDevice, steps: int = 2):
+        self.device = device
+        self.steps = steps
+        self.tasks: list[str] = []
+        self._step = 0
+
+    def reset(self) -> None:
+        self._step = 0
+
+    def step(self, task: str | None = None):
+        if task is not None:
+            self.tasks.append(task)
+        if self.device.device_id.startswith("broken"):
+            raise ConnectionError("device offline")
+        self._step += 1
+        return SimpleNamespace(
+            finished=self._step >= self.steps, success=True, message="ok"
+        )
+
+
+def _adb(device_id: str) -> FleetDevice:
+    return FleetDevice(device_id, DeviceType.ADB)
+
+
+def _config(**overrides) -> FleetConfig:
+    values = dict(
+        max_steps=10,
+        max_attempts=2,
+        max_consecutive_failures=2,
+        quarantine_seconds=60.0,
+        max_quarantine_seconds=60.0,
+    )
+    values.update(overrides)
+    return FleetConfig(**values)
+
+
+def test_queue_gives_pinned_tasks_only_to_their_device():
+    queue = TaskQueue()
+    pinned = FleetTask("pinned", device_id="b")
+    anywhere = FleetTask("anywhere")
+    queue.put(pinned)
+    queue.put(anywhere)
+
+    assert queue.get("a", timeout=0) is anywhere
+    assert queue.get("a", timeout=0) is None
+    assert queue.get("b", timeout=0) is pinned
+
+
+def test_queue_drains_only_after_in_flight_tasks_finish():
+    queue = TaskQueue()
+    queue.put(FleetTask("t"))
+    queue.close()
+    task = queue.get("a", timeout=0)
+    assert not queue.is_drained("b")
+
+    queue.task_done(task, requeue=True)
+    assert queue.get("b", timeout=0) is task
+    queue.task_done(task)
+    assert queue.is_drained("a") and queue.is_drained("b")
+    assert queue.get("a") is None
+
+
+def _run_worker(device: FleetDevice, tasks: list[FleetTask], **kwargs):
+    queue = TaskQueue()
+    for task in tasks:
+        queue.put(task)
+    queue.close()
+    stats = FleetStats()
+    agents = []
+
+    def factory(device):
+        agents.append(FakeAgent(device))
+        return agents[-1]
+
+    worker = DeviceWorker(device, queue, stats, factory, **kwargs)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive()
+    return worker, stats, agents
+
+
+def test_worker_runs_tasks_with_one_agent():
+    tasks = [FleetTask("one"), FleetTask("two", max_steps=1)]
+    worker, stats, agents = _run_worker(_adb("a"), tasks)
+
+    assert len(agents) == 1
+    assert agents[0].tasks == ["one", "two"]
+    results = {r.task_id: r for r in stats.results}
+    assert results[tasks[0].task_id].success
+    assert results[tasks[0].task_id].steps == 2
+    # Hit its own step limit before the agent finished
+    assert not results[tasks[1].task_id].success
+    assert results[tasks[1].task_id].message == "Max steps reached"
+
+
+def test_worker_requeues_then_gives_up_on_device_errors():
+    task = FleetTask("t")
+    worker, stats, agents = _run_worker(
+        _adb("broken"), [task], max_attempts=2, max_consecutive_failures=5
+    )
+
+    [result] = stats.results
+    assert not result.success
+    assert result.attempts == 2
+    assert "device offline" in result.error
+    assert stats.summary().per_device["broken"].failures == 2
+    assert not worker.quarantined
+
+
+def test_worker_quarantines_after_consecutive_failures(caplog):
+    queue = TaskQueue()
+    queue.put(FleetTask("t"))
+    stats = FleetStats()
+    stop = threading.Event()
+    worker = DeviceWorker(
+        _adb("broken"),
+        queue,
+        stats,
+        FakeAgent,
+        max_attempts=5,
+        max_consecutive_failures=2,
+        quarantine_seconds=60.0,
+        stop_event=stop,
+    )
+    task = queue.get("broken", timeout=0)
+    worker._run_task(task)
+    assert not worker.quarantined
+    task = queue.get("broken", timeout=0)
+    worker._run_task(task)
+
+    assert worker.quarantined
+    assert worker.quarantine_count == 1
+    assert worker._agent is None  # Fresh agent after the quarantine
+    assert stats.summary().per_device["broken"].quarantines == 1
+    assert "quarantined for 60s" in caplog.text
+    # The task went back on the queue for a healthy device
+    assert queue.get("other", timeout=0) is task
+
+
+def test_orchestrator_moves_work_off_a_broken_device():
+    devices = [_adb("a"), _adb("b"), _adb("broken")]
+    broken_failures = []
+    broken_quarantined = threading.Event()
+
+    class Agent(FakeAgent):
+        def step(self, task=None):
+            if self.device.device_id == "broken":
+                broken_failures.append(task)
+                if len(broken_failures) == 2:
+                    broken_quarantined.set()
+            else:
+                # Leave the first tasks to the broken device
+                assert broken_quarantined.wait(5)
+            return super().step(task)
+
+    fleet = FleetOrchestrator(
+        devices=devices, config=_config(max_attempts=3), agent_factory=Agent
+    )
+    tasks = [FleetTask(f"t{i}") for i in range(12)]
+    tasks.append(FleetTask("pinned", device_id="b"))
+
+    # Returns once the queue drains, without sitting out the quarantine
+    summary = fleet.run(tasks)
+
+    assert summary.completed == summary.succeeded == len(tasks)
+    assert {r.device_id for r in fleet.results} == {"a", "b"}
+    assert [r.device_id for r in fleet.results if r.task == "pinned"] == ["b"]
+    assert summary.per_device["broken"].failures == 2
+    assert summary.per_device["broken"].quarantines == 1
+    assert not fleet.queue.pending()
+
+
+def test_parse_wda_urls():
+    assert parse_wda_urls(" u1=http://h:8100 , u2=http://h:8101,") == {
+        "u1": "http://h:8100",
+        "u2": "http://h:8101",
+    }
+    assert parse_wda_urls("") == {}
+    with pytest.raises(ValueError):
+        parse_wda_urls("u1")
+
+
+def test_check_wda_urls_refuses_shared_default():
+    ios = DeviceType.IOS
+    check_wda_urls([FleetDevice("u1", ios), _adb("a"), _adb("b")])
+    check_wda_urls(
+        [FleetDevice("u1", ios), FleetDevice("u2", ios, wda_url="http://h:8101")]
+    )
+    with pytest.raises(ValueError, match="u1 and u2"):
+        check_wda_urls([FleetDevice("u1", ios), FleetDevice("u2", ios)])
+    with pytest.raises(ValueError):
+        FleetOrchestrator(devices=[FleetDevice("u1", ios), FleetDevice("u2", ios)])
+
+
+def test_discover_devices_maps_wda_urls(monkeypatch):
+    listed = {
+        DeviceType.ADB: [SimpleNamespace(device_id="a", status="device", model="P")],
+        DeviceType.IOS: [
+            SimpleNamespace(device_id="u1", status="connected", model=None),
+            SimpleNamespace(device_id="u2", status="connected", model=None),
+        ],
+    }
+    monkeypatch.setattr(devices_module.shutil, "which", lambda tool: tool)
+    monkeypatch.setattr(devices_module, "_list_devices", listed.get)
+    monkeypatch.setenv("PHONE_AGENT_WDA_URLS", "u1=http://h:8100,u2=http://h:8101")
+
+    found = discover_devices([DeviceType.ADB, DeviceType.IOS])
+
+    assert [(d.key, d.wda_url) for d in found] == [
+        ("adb:a", None),
+        ("ios:u1", "http://h:8100"),
+        ("ios:u2", "http://h:8101"),
+    ]
+    check_wda_urls(found)
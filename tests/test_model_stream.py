@@ -0,0 +1,112 @@
+"""Tests for streamed response handling and stopping at the action end."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from phone_agent.model.client import ModelClient, ModelConfig, _StreamProcessor
+from phone_agent.model.scheduler import ModelScheduler
+
+
+def _feed(*chunks: str) -> _StreamProcessor:
+    processor = _StreamProcessor()
+    for chunk in chunks:
+        processor.feed(chunk)
+    return processor
+
+
+def test_do_call_completes_at_closing_paren():
+    processor = _feed(
+        "<think>tap it</think><answer>do(action=",
+        '"Tap", element=[500, ',
+        "300])</answer>",
+    )
+    assert processor.action_complete
+    assert processor.finish().action == 'do(action="Tap", element=[500, 300])'
+
+
+def test_paren_inside_string_does_not_end_call():
+    processor = _feed('do(action="Launch", app="Foo (Beta)"', ")")
+    assert processor.action_complete
+    assert processor.finish().action == 'do(action="Launch", app="Foo (Beta)")'
+
+
+@pytest.mark.parametrize(
+    "chunks, action",
+    [
+        (
+            ['do(action="Type", text="say "a) b" ok")', "</answer>"],
+            'do(action="Type", text="say "a) b" ok")',
+        ),
+        (
+            ['do(action="Ty', 'pe_Name", text="x")', "\n</ans", "wer>"],
+            'do(action="Type_Name", text="x")',
+        ),
+        (
+            ['finish(message="Done :) "really"")</answer>'],
+            'finish(message="Done :) "really"")',
+        ),
+    ],
+)
+def test_free_text_completes_at_answer_tag(chunks, action):
+    processor = _feed(*chunks[:-1])
+    assert not processor.action_complete
+    processor.feed(chunks[-1])
+    assert processor.action_complete
+    assert processor.finish().action == action
+
+
+def test_free_text_without_answer_tag_reads_to_end():
+    processor = _feed('finish(message="a")', " trailing")
+    assert not processor.action_complete
+    assert processor.finish().action == 'finish(message="a") trailing'
+
+
+class _FakeStream:
+    def __init__(self, chunks: list[str]):
+        self._chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for content in self._chunks:
+            self.read += 1
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=content))]
+            )
+
+    def close(self):
+        self.closed = True
+
+
+def _client(stream: _FakeStream, stop_at_action_end: bool) -> ModelClient:
+    client = ModelClient(
+        ModelConfig(stop_at_action_end=stop_at_action_end),
+        scheduler=ModelScheduler(max_in_flight=1),
+    )
+    client.client = SimpleNamespace(
+        chat=SimpleNamespace(
+            completions=SimpleNamespace(create=lambda **kwargs: stream)
+        )
+    )
+    return client
+
+
+CHUNKS = ["<think>done</think><answer>", 'finish(message="ok")', "</answer>", " x"]
+
+
+def test_client_stops_at_action_end():
+    stream = _FakeStream(CHUNKS)
+    response = _client(stream, stop_at_action_end=True).request([])
+    assert stream.closed and stream.read == 3
+    assert response.stopped_early
+    assert response.action == 'finish(message="ok")'
+    assert response.time_to_action_end <= response.total_time
+
+
+def test_client_reads_whole_stream_when_disabled():
+    stream = _FakeStream(CHUNKS)
+    response = _client(stream, stop_at_action_end=False).request([])
+    assert stream.read == 4
+    assert not response.stopped_early
+    assert response.time_to_action_end is not None
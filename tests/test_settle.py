@@ -0,0 +1,88 @@
+"""Tests for adaptive settle waiting."""
+
+from phone_agent.actions.handler_ios import IOSActionHandler
+from phone_agent.config.timing import TIMING_CONFIG, SettleTimingConfig, TimingConfig
+from phone_agent.settle import wait_for_settle
+
+
+def _config() -> SettleTimingConfig:
+    return SettleTimingConfig(
+        enabled=True, initial_delay=0.0, poll_interval=0.01, stable_frames=2
+    )
+
+
+def _frames(*signatures: str):
+    """Return the signatures in turn, repeating the last one."""
+    remaining = list(signatures)
+
+    def get_signature() -> str:
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    return get_signature
+
+
+def test_settles_once_screen_changed_and_stopped():
+    waited, stable, last = wait_for_settle(
+        _frames("before", "moving", "after", "after"),
+        budget=1.0,
+        fallback_delay=0.5,
+        config=_config(),
+        before="before",
+    )
+    assert stable
+    assert last == "after"
+    assert waited < 0.5
+
+
+def test_unchanged_screen_waits_for_fallback_delay():
+    waited, stable, last = wait_for_settle(
+        _frames("before"),
+        budget=1.0,
+        fallback_delay=0.2,
+        config=_config(),
+        before="before",
+    )
+    assert stable
+    assert last == "before"
+    assert waited >= 0.2
+
+
+def test_missing_before_frame_waits_for_fallback_delay():
+    waited, stable, _ = wait_for_settle(
+        _frames("after"), budget=1.0, fallback_delay=0.2, config=_config()
+    )
+    assert stable
+    assert waited >= 0.2
+
+
+def test_budget_ends_wait_when_screen_keeps_changing():
+    counter = iter(range(10_000))
+    waited, stable, _ = wait_for_settle(
+        lambda: str(next(counter)),
+        budget=0.1,
+        fallback_delay=0.5,
+        config=_config(),
+        before="before",
+    )
+    assert not stable
+    assert waited <= 0.1
+
+
+def test_no_signature_sleeps_fallback_delay():
+    waited, stable, last = wait_for_settle(
+        lambda: None, budget=1.0, fallback_delay=0.1, config=_config()
+    )
+    assert (stable, last) == (False, None)
+    assert waited >= 0.1
+
+
+def test_ios_handler_uses_its_own_timing_config(monkeypatch):
+    monkeypatch.setattr(TIMING_CONFIG.settle, "enabled", False)
+    timing = TimingConfig()
+    timing.settle = _config()
+    handler = IOSActionHandler(timing=timing)
+
+    handler._wait_after("tap", 0.05)
+
+    assert handler.settle_stats.count == 1
+    assert handler.last_wait_time >= 0.05